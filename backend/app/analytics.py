@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.question_bank import QuestionBank
+from app.session_model import COMPLETED, SessionRecord
+from app.scoring import average_scores
+
+# Classical test theory cut-offs: share of the maximum score, and upper-minus-lower group difference
+TOO_EASY_P_VALUE = 0.9
+TOO_HARD_P_VALUE = 0.2
+POOR_DISCRIMINATION = 0.2
+# Upper and lower groups for the discrimination index (Kelley's 27%)
+GROUP_FRACTION = 0.27
+SCORE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _number(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+class CohortLog:
+    """Columnar record of every completed interview's scores.
+
+    One row per scored response (session, question, score) in growable
+    NumPy arrays, plus each session's overall score. Sessions are appended
+    once, when they complete, so statistics never re-read the session store.
+    """
+
+    def __init__(self, question_bank: QuestionBank, capacity: int = 4096):
+        self.question_ids = list(question_bank.ids())
+        self._question_code = {question_id: code for code, question_id in enumerate(self.question_ids)}
+        questions = [question_bank.get(question_id) for question_id in self.question_ids]
+        self.categories = sorted({question["category"] for question in questions})
+        category_code = {category: code for code, category in enumerate(self.categories)}
+        self.question_types = [question["question_type"] for question in questions]
+        self.question_category = np.array([category_code[q["category"]] for q in questions], dtype=np.int32)
+
+        self.response_count = 0
+        self.session_count = 0
+        self._session = np.empty(capacity, dtype=np.int32)
+        self._question = np.empty(capacity, dtype=np.int32)
+        self._score = np.empty(capacity, dtype=np.float64)
+        self._overall = np.empty(max(1, capacity // 10), dtype=np.float32)
+
+    @staticmethod
+    def _grown(array: np.ndarray, needed: int) -> np.ndarray:
+        if needed <= len(array):
+            return array
+        grown = np.empty(max(needed, 2 * len(array)), dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add_session(self, session: SessionRecord) -> None:
+        rows = [
+            (self._question_code[question_id], response.score)
+            for question_id, response in zip(session.question_ids, session.responses)
+            if response.status == COMPLETED and question_id in self._question_code
+        ]
+        start, end = self.response_count, self.response_count + len(rows)
+        self._session = self._grown(self._session, end)
+        self._question = self._grown(self._question, end)
+        self._score = self._grown(self._score, end)
+        self._overall = self._grown(self._overall, self.session_count + 1)
+
+        if rows:
+            codes, scores = zip(*rows)
+            self._session[start:end] = self.session_count
+            self._question[start:end] = codes
+            self._score[start:end] = scores
+        self._overall[self.session_count] = average_scores(session.aggregate)["overall_score"]
+        self.response_count = end
+        self.session_count += 1
+
+    @classmethod
+    def from_sessions(cls, question_bank: QuestionBank, sessions) -> "CohortLog":
+        log = cls(question_bank)
+        for session in sessions:
+            if session.end_time is not None:
+                log.add_session(session)
+        return log
+
+    def stats(self) -> Dict:
+        """Per-question difficulty (p-value) and discrimination, category means and score percentiles"""
+        n_questions = len(self.question_ids)
+        session = self._session[:self.response_count]
+        question = self._question[:self.response_count]
+        score = self._score[:self.response_count]
+        overall = self._overall[:self.session_count]
+
+        # Group 0 is the middle of the cohort, 1 the top 27% and 2 the bottom 27% by overall score,
+        # so one pair of bincounts over (group, question) gives every per-question statistic
+        group = np.zeros(self.session_count, dtype=np.int32)
+        if self.session_count >= 2:
+            lower_cut, upper_cut = np.quantile(overall, [GROUP_FRACTION, 1 - GROUP_FRACTION])
+            group[overall >= upper_cut] = 1
+            group[overall <= lower_cut] = 2
+        key = group[session] * n_questions + question
+        counts = np.bincount(key, minlength=3 * n_questions).reshape(3, n_questions)
+        sums = np.bincount(key, weights=score, minlength=3 * n_questions).reshape(3, n_questions)
+
+        answered = counts.sum(axis=0)
+        total = sums.sum(axis=0)
+        # Share of the maximum score; for MCQs this is the proportion answering correctly
+        p_value = _ratio(total, answered * 10)
+        discrimination = _ratio(sums[1], counts[1] * 10) - _ratio(sums[2], counts[2] * 10)
+        category_mean = _ratio(
+            np.bincount(self.question_category, weights=total, minlength=len(self.categories)),
+            np.bincount(self.question_category, weights=answered, minlength=len(self.categories))
+        )
+
+        questions: List[Dict] = []
+        for code, question_id in enumerate(self.question_ids):
+            flags = []
+            if p_value[code] > TOO_EASY_P_VALUE:
+                flags.append("too_easy")
+            elif p_value[code] < TOO_HARD_P_VALUE:
+                flags.append("too_hard")
+            if discrimination[code] < POOR_DISCRIMINATION:
+                flags.append("poor_discrimination")
+            questions.append({
+                "id": question_id,
+                "question_type": self.question_types[code],
+                "category": self.categories[self.question_category[code]],
+                "responses": int(answered[code]),
+                "p_value": _number(p_value[code]),
+                "discrimination": _number(discrimination[code]),
+                "flags": flags
+            })
+
+        percentiles = np.percentile(overall, SCORE_PERCENTILES) if self.session_count else []
+        return {
+            "sessions": self.session_count,
+            "responses": self.response_count,
+            "score_percentiles": {f"p{pct}": round(float(value), 2) for pct, value in zip(SCORE_PERCENTILES, percentiles)},
+            "category_means": {
+                category: _number(category_mean[code]) for code, category in enumerate(self.categories)
+            },
+            "questions": questions
+        }
@@ -0,0 +1,64 @@
+import json
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.session_model import SessionRecord
+
+
+class CompletedSessionArchive:
+    """Append-only file of completed interviews, one JSON line per session.
+
+    The session store drops sessions after SESSION_TTL, so exports and
+    cohort statistics read finished interviews from here instead. Each
+    session is written in a single append, so workers on one host can share
+    the file; a line torn by a crash is skipped when reading.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def append(self, session: SessionRecord) -> None:
+        line = json.dumps(session.to_dict(), separators=(",", ":")) + "\n"
+        try:
+            os.write(self._fd, line.encode("utf-8"))
+        except OSError as e:
+            print(f"Error archiving session {session.session_id}: {e}")
+
+    def iter_sessions(self) -> Iterator[SessionRecord]:
+        """Every archived session in completion order, read lazily; one archived twice is read as last written"""
+        with open(self.path, "rb") as f:
+            # First pass keeps only where each session's latest line starts, not the sessions
+            latest: Dict[str, Tuple[int, int]] = {}
+            offset = 0
+            for line in f:
+                session_id = _session_id(line)
+                if session_id is not None:
+                    latest.pop(session_id, None)
+                    latest[session_id] = (offset, len(line))
+                offset += len(line)
+
+            for offset, length in latest.values():
+                f.seek(offset)
+                try:
+                    yield SessionRecord.from_dict(json.loads(f.read(length)))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _session_id(line: bytes) -> Optional[str]:
+    """The session id of a complete archive line, or None for a torn or corrupt one"""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(line)["session_id"]
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,80 @@
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one.
+
+    The first caller for a key runs the call; anyone arriving with the same
+    key while it is in flight awaits the same result (or exception) instead
+    of starting another. Nothing is kept once the call settles.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def claim(self, key: Hashable) -> Tuple[asyncio.Future, bool]:
+        """The key's in-flight future, and whether the caller now owns it and must `settle` it"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            return future, False
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        return future, True
+
+    def settle(self, key: Hashable, result=None, error: BaseException = None) -> None:
+        future = self._calls.pop(key)
+        if error is not None and not isinstance(error, Exception):
+            # The owner was cancelled or closed; followers start over
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+            # The owner re-raises it; followers are optional
+            future.exception()
+        else:
+            future.set_result(result)
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future, owner = self.claim(key)
+            if owner:
+                break
+            try:
+                # Shielded so a follower that disconnects does not cancel the owner's call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Start over if the owner went away rather than this caller
+                if not future.cancelled():
+                    raise
+        try:
+            result = await call()
+        except BaseException as e:
+            self.settle(key, error=e)
+            raise
+        self.settle(key, result)
+        return result
+
+
+class KeyedLocks:
+    """One asyncio.Lock per key, dropped once nobody holds or waits on it"""
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[Hashable, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def __call__(self, key: Hashable) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
@@ -0,0 +1,116 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without it, clients that accept gzip still get gzip
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # Of 11; higher levels cost far more CPU for a few percent
+# Events must reach the client as they are sent, not when the compressor's buffer fills
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """br if the client takes it and brotli is installed, else gzip, else None"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        quality = params.replace(" ", "")
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class Compressor:
+    """Incremental gzip or brotli; every call returns bytes the client can decode right away"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 31: deflate in a gzip container
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses for clients that accept it.
+
+    A response sent in one piece is compressed only from `minimum_size`
+    bytes; streamed responses (exports) are compressed chunk by chunk.
+    Server-Sent Events, already encoded bodies and WebSockets pass through.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The start message is held until the first body chunk shows whether to compress
+        state = {"start": None, "compressor": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["start"] = message
+                return
+            start, compressor = state["start"], state["compressor"]
+            if message["type"] == "http.response.body" and compressor is not None:
+                more_body = message.get("more_body", False)
+                await send({"type": "http.response.body", "more_body": more_body,
+                            "body": compressor.compress(message.get("body", b""), final=not more_body)})
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            state["start"] = None
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start["headers"])
+            if "content-encoding" in headers or headers.get("content-type", "").startswith(UNCOMPRESSED_TYPES) \
+                    or (not more_body and len(body) < self.minimum_size):
+                await send(start)
+                await send(message)
+                return
+
+            compressor = state["compressor"] = Compressor(encoding)
+            body = compressor.compress(body, final=not more_body)
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            start["headers"] = headers.raw
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
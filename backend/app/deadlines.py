@@ -0,0 +1,54 @@
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+# Stale heap entries tolerated, relative to live deadlines, before the heap is rebuilt
+_COMPACT_RATIO = 2
+_COMPACT_MIN = 1024
+
+
+class DeadlineScheduler:
+    """Min-heap of deadlines, at most one per key.
+
+    Scheduling a key again replaces its deadline and cancelling forgets it;
+    both leave the old heap entry behind to be skipped when it surfaces,
+    so every operation is O(log n) or better. A sweep that finds nothing
+    due only looks at the top of the heap.
+    """
+
+    def __init__(self):
+        self._deadlines: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # Breaks ties so keys themselves are never compared
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        self._deadlines[key] = when
+        self._counter += 1
+        heapq.heappush(self._heap, (when, self._counter, key))
+        if len(self._heap) > _COMPACT_RATIO * len(self._deadlines) + _COMPACT_MIN:
+            self._compact()
+
+    def cancel(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """Remove and return keys whose deadline is at or before `now`, earliest first"""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == when:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _compact(self) -> None:
+        self._heap = [(when, number, key) for number, (key, when) in enumerate(self._deadlines.items())]
+        heapq.heapify(self._heap)
+        self._counter = len(self._heap)
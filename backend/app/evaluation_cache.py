@@ -0,0 +1,126 @@
+import copy
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n.,;:!?'\"`"
+
+
+def normalize_answer(answer: str) -> str:
+    """Case- and whitespace-insensitive form of an answer, used for cache keys"""
+    return _WHITESPACE.sub(" ", answer.lower()).strip(_EDGE_PUNCTUATION)
+
+
+def make_cache_key(question_id: str, answer: str, version: str) -> str:
+    raw = "\x1f".join((question_id, normalize_answer(answer), version))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """Content-addressed cache of LLM evaluations.
+
+    An in-memory LRU tier bounded by `max_entries` and `ttl_seconds`, backed
+    by an optional SQLite file so results survive restarts. The file drops
+    expired rows and all but the newest `max_rows` when opened and every
+    `prune_every` writes, so it can run over the cap by that many rows at
+    most. Safe to use from the evaluation executor threads.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persist_path: Optional[str] = None,
+                 max_rows: int = 0, prune_every: int = 1000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, stored_at REAL, evaluation TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_stored_at ON evaluations (stored_at)")
+            self._prune()
+
+    @property
+    def persistent(self) -> bool:
+        return self._db is not None
+
+    def get(self, *keys: str, load: bool = True) -> Optional[Dict]:
+        """The evaluation under the first of `keys` that has a live one; counted as one hit or miss.
+
+        With load=False only the memory tier is read and a miss is not
+        counted, so the caller can follow up with a full lookup off the
+        event loop.
+        """
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None and load and self._db is not None:
+                    entry = self._load(key)
+                    if entry is not None:
+                        self._entries[key] = entry
+                if entry is None or now - entry[0] > self.ttl_seconds:
+                    if entry is not None:
+                        self._drop(key)
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if load or self._db is None:
+                self.misses += 1
+            return None
+
+    def set(self, key: str, evaluation: Dict) -> None:
+        entry = (time.time(), copy.deepcopy(evaluation))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO evaluations (key, stored_at, evaluation) VALUES (?, ?, ?)",
+                    (key, entry[0], json.dumps(evaluation))
+                )
+                self._writes += 1
+                if self._writes % self.prune_every == 0:
+                    self._prune()
+                else:
+                    self._db.commit()
+
+    def _load(self, key: str) -> Optional[Tuple[float, Dict]]:
+        row = self._db.execute(
+            "SELECT stored_at, evaluation FROM evaluations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest past `max_rows` (0 keeps all)"""
+        self._db.execute("DELETE FROM evaluations WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+        if self.max_rows > 0:
+            self._db.execute(
+                "DELETE FROM evaluations WHERE key IN "
+                "(SELECT key FROM evaluations ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,)
+            )
+        self._db.commit()
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM evaluations WHERE key = ?", (key,))
+            self._db.commit()
@@ -0,0 +1,61 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+
+class EvaluationQueue:
+    """Runs deferred open-ended evaluations in the background.
+
+    Each job evaluates one stored response and hands the result to
+    `store_result(session_id, response_index, evaluation)`, so the candidate
+    can move on to the next question immediately.
+    """
+
+    def __init__(self, max_workers: int, store_result: Callable[[str, int, Dict], None]):
+        self.max_workers = max_workers
+        self.store_result = store_result
+        self._semaphore = None
+        self._tasks: Dict[str, List[asyncio.Task]] = {}
+
+    def submit(self, session_id: str, response_index: int, evaluate: Callable[[], Awaitable[Dict]]) -> None:
+        """Queue an evaluation for the response at `response_index` of the session"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        task = asyncio.create_task(self._run(session_id, response_index, evaluate))
+        self._tasks.setdefault(session_id, []).append(task)
+        task.add_done_callback(lambda t: self._forget(session_id, t))
+
+    async def _run(self, session_id: str, response_index: int, evaluate: Callable[[], Awaitable[Dict]]) -> None:
+        async with self._semaphore:
+            evaluation = await evaluate()
+        self.store_result(session_id, response_index, evaluation)
+
+    def _forget(self, session_id: str, task: asyncio.Task) -> None:
+        tasks = self._tasks.get(session_id)
+        if tasks and task in tasks:
+            tasks.remove(task)
+            if not tasks:
+                del self._tasks[session_id]
+
+    def __len__(self) -> int:
+        return sum(len(tasks) for tasks in self._tasks.values())
+
+    def pending_count(self, session_id: str) -> int:
+        return len(self._tasks.get(session_id, []))
+
+    async def wait_for_session(self, session_id: str) -> None:
+        """Block until every queued evaluation for the session has been stored"""
+        tasks = list(self._tasks.get(session_id, []))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def cancel_session(self, session_id: str) -> int:
+        """Drop the session's queued evaluations; returns how many were cancelled.
+
+        Jobs still waiting for a worker or an executor thread never reach the
+        model. A call already on the wire finishes, but its result is discarded.
+        """
+        tasks = self._tasks.pop(session_id, [])
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
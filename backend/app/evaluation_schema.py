@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+
+
+class Evaluation(BaseModel):
+    """What a model evaluation must contain. Validators are built once, when the class is defined."""
+
+    # Anything else the model adds is dropped
+    model_config = ConfigDict(extra="ignore")
+
+    score: float = Field(ge=0, le=10)
+    feedback: str = Field(min_length=1)
+    suggestions: List[str] = []
+    strengths: List[str] = []
+    missing_concepts: List[str] = []
+
+    @field_validator("score")
+    @classmethod
+    def _whole_scores_stay_ints(cls, score: float):
+        return int(score) if score.is_integer() else score
+
+
+class BatchEvaluation(Evaluation):
+    index: int
+
+
+_batch_adapter = TypeAdapter(List[BatchEvaluation])
+
+
+class InvalidModelOutput(ValueError):
+    """Model output that is not a valid evaluation, even after local repair"""
+
+
+def response_schema(model, property_ordering: bool = False) -> Dict:
+    """A Pydantic model's JSON schema cut down to what Gemini's response_schema accepts.
+
+    Only types, properties, items and required survive; range checks are
+    left to validation. Every field is required so the model always fills it.
+    Gemini writes properties in alphabetical order unless `property_ordering`
+    asks for the model's field order (score first).
+    """
+    def convert(schema: Dict) -> Dict:
+        converted = {"type": schema["type"]}
+        if "properties" in schema:
+            converted["properties"] = {name: convert(field) for name, field in schema["properties"].items()}
+            converted["required"] = list(schema["properties"])
+            if property_ordering:
+                converted["property_ordering"] = list(schema["properties"])
+        if "items" in schema:
+            converted["items"] = convert(schema["items"])
+        return converted
+    return convert(model.model_json_schema())
+
+
+EVALUATION_SCHEMA = response_schema(Evaluation)
+ORDERED_EVALUATION_SCHEMA = response_schema(Evaluation, property_ordering=True)
+BATCH_SCHEMA = {"type": "array", "items": response_schema(BatchEvaluation)}
+
+
+def extract_json_text(text: str) -> str:
+    """Strip markdown code fences the model sometimes wraps around JSON"""
+    json_str = text.strip()
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[1].split("```")[0]
+    elif "```" in json_str:
+        json_str = json_str.split("```")[1].split("```")[0]
+    return json_str.strip()
+
+
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+def repair_json(text: str) -> str:
+    """Cheap fixes for the ways model JSON usually breaks.
+
+    Drops code fences and prose around the value, escapes raw newlines and
+    tabs inside strings, removes trailing commas, and closes output that was
+    cut off mid-string or mid-object. One pass over the text; no guarantee
+    the result parses.
+    """
+    text = extract_json_text(text)
+    starts = [position for position in (text.find("{"), text.find("[")) if position != -1]
+    if not starts:
+        return text
+    out = []
+    closers = []
+    in_string = escaped = False
+    for ch in text[min(starts):]:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                ch = "\\n"
+            elif ch == "\t":
+                ch = "\\t"
+            out.append(ch)
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            closers.pop()
+            if not closers:
+                # Anything after the top-level value is commentary
+                out.append(ch)
+                break
+        out.append(ch)
+
+    if in_string:
+        if escaped:
+            out.pop()
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    # Cut off after a comma, a key or a colon
+    repaired = repaired.rstrip(",")
+    if closers and closers[-1] == "}":
+        if repaired.endswith(":"):
+            repaired = repaired[:-1].rstrip()
+        repaired = _DANGLING_KEY.sub(r"\1", repaired).rstrip(",")
+    return _TRAILING_COMMA.sub(r"\1", repaired + "".join(reversed(closers)))
+
+
+def _describe(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def parse_evaluation(text: str) -> Tuple[Dict, bool]:
+    """The validated evaluation in `text`, and whether it needed repair; raises InvalidModelOutput"""
+    try:
+        return Evaluation.model_validate_json(text).model_dump(), False
+    except ValidationError as e:
+        error = e
+    repaired = repair_json(text)
+    if repaired != text:
+        try:
+            return Evaluation.model_validate_json(repaired).model_dump(), True
+        except ValidationError as e:
+            error = e
+    raise InvalidModelOutput(_describe(error))
+
+
+def parse_batch_evaluations(text: str) -> Tuple[Dict[int, Dict], bool]:
+    """Map answer index -> validated evaluation from a batch response, and whether it needed repair.
+
+    If the array as a whole does not validate, objects are decoded and
+    validated one at a time, so a truncated or partly malformed array still
+    yields every item that is intact.
+    """
+    for candidate, repaired in ((text, False), (repair_json(text), True)):
+        try:
+            items = _batch_adapter.validate_json(candidate)
+            return {item.index: item.model_dump(exclude={"index"}) for item in items}, repaired
+        except ValidationError:
+            pass
+
+    items = {}
+    json_str = extract_json_text(text)
+    decoder = json.JSONDecoder()
+    position = json_str.find("{")
+    while position != -1:
+        try:
+            item, end = decoder.raw_decode(json_str, position)
+            position = json_str.find("{", end)
+        except json.JSONDecodeError:
+            position = json_str.find("{", position + 1)
+            continue
+        try:
+            evaluation = BatchEvaluation.model_validate(item)
+        except ValidationError:
+            continue
+        items[evaluation.index] = evaluation.model_dump(exclude={"index"})
+    return items, True
@@ -0,0 +1,210 @@
+"""
+Streaming export of completed interview reports.
+
+Every stage is a generator, so an export holds one chunk of rows in memory
+however many sessions the store has. Run from the backend directory:
+    python -m app.export --format csv --output reports.csv --since 2026-01-01 --min-score 5
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.scoring import average_scores
+from app.session_model import SessionRecord
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# One flat row per interview for CSV and Parquet; JSONL carries the full report
+ROW_FIELDS = [
+    "session_id", "candidate_name", "interview_date", "completed_at", "duration_minutes",
+    "overall_score", "mcq_score", "general_score", "performance_level", "total_questions",
+    "strengths", "areas_for_improvement", "recommendations"
+]
+
+
+def parse_date_bound(value: str, end_of_day: bool = False) -> datetime:
+    """ISO date or date-time; a bare date as an upper bound covers that whole day"""
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and "T" not in value and " " not in value.strip():
+        parsed += timedelta(days=1) - timedelta(microseconds=1)
+    return parsed
+
+
+def completed_reports(sessions: Iterable[SessionRecord], build_report: Callable[[SessionRecord], Dict],
+                      since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      min_score: Optional[float] = None, max_score: Optional[float] = None) -> Iterator[Dict]:
+    """Reports of finished sessions whose completion time and overall score pass the filters"""
+    since_ts = since.timestamp() if since else None
+    until_ts = until.timestamp() if until else None
+    for session in sessions:
+        if session.end_time is None:
+            continue
+        if (since_ts is not None and session.end_time < since_ts) or \
+                (until_ts is not None and session.end_time > until_ts):
+            continue
+        # The aggregate gives the score without building the full report
+        overall = round(average_scores(session.aggregate)["overall_score"], 1)
+        if (min_score is not None and overall < min_score) or (max_score is not None and overall > max_score):
+            continue
+        report = build_report(session)
+        report["session_id"] = session.session_id
+        report["completed_at"] = datetime.fromtimestamp(session.end_time).isoformat()
+        yield report
+
+
+def report_row(report: Dict) -> Dict:
+    summary = report["summary"]
+    return {
+        "session_id": report["session_id"],
+        "candidate_name": report["candidate_name"],
+        "interview_date": report["interview_date"],
+        "completed_at": report["completed_at"],
+        "duration_minutes": report["duration_minutes"],
+        "overall_score": report["overall_score"],
+        "mcq_score": report["mcq_score"],
+        "general_score": report["general_score"],
+        "performance_level": report["performance_level"],
+        "total_questions": summary["total_questions"],
+        "strengths": "; ".join(summary["strengths"]),
+        "areas_for_improvement": "; ".join(summary["areas_for_improvement"]),
+        "recommendations": "; ".join(report["recommendations"])
+    }
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(reports: Iterable[Dict], chunk_rows: int = 200) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=ROW_FIELDS)
+    writer.writeheader()
+    for chunk in _chunks(reports, chunk_rows):
+        writer.writerows(report_row(report) for report in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_jsonl(reports: Iterable[Dict], chunk_rows: int = 200) -> Iterator[str]:
+    for chunk in _chunks(reports, chunk_rows):
+        yield "".join(json.dumps(report, default=str) + "\n" for report in chunk)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(reports: Iterable[Dict], chunk_rows: int = 1000) -> Iterator[bytes]:
+    """One Parquet row group per chunk; needs the optional pyarrow package"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception as e:
+        raise RuntimeError("Parquet export needs a working 'pyarrow' package") from e
+
+    schema = pa.schema([
+        (field, pa.int64() if field in ("duration_minutes", "total_questions")
+         else pa.float64() if field.endswith("_score") else pa.string())
+        for field in ROW_FIELDS
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(reports, chunk_rows):
+            rows = [report_row(report) for report in chunk]
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+@lru_cache(maxsize=1)
+def parquet_available() -> bool:
+    """Whether pyarrow imports; an installed but broken build (e.g. against the wrong NumPy) does not count"""
+    try:
+        import pyarrow.parquet
+    except Exception:
+        return False
+    return True
+
+
+def stream_export(reports: Iterable[Dict], export_format: str) -> Iterator:
+    if export_format == "csv":
+        return stream_csv(reports)
+    if export_format == "jsonl":
+        return stream_jsonl(reports)
+    if export_format == "parquet":
+        return stream_parquet(reports)
+    raise ValueError(f"Unknown export format: {export_format}")
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--output", help="File to write; stdout when omitted (not for parquet)")
+    parser.add_argument("--since", type=parse_date_bound, help="Completed on or after (ISO date/time)")
+    parser.add_argument("--until", type=lambda value: parse_date_bound(value, end_of_day=True),
+                        help="Completed on or before (ISO date/time)")
+    parser.add_argument("--min-score", type=float)
+    parser.add_argument("--max-score", type=float)
+    args = parser.parse_args()
+
+    from app.main import completed_sessions, generate_final_report
+    from config.llm_config import InterviewConfig
+
+    # A fresh in-process store is empty, so read the archive, or failing that a shared Redis store
+    if not InterviewConfig.COMPLETED_SESSIONS_PATH and not InterviewConfig.SESSION_STORE_URL:
+        parser.error("set COMPLETED_SESSIONS_PATH (or SESSION_STORE_URL) to the values the server runs with")
+
+    reports = completed_reports(
+        completed_sessions(), generate_final_report,
+        since=args.since, until=args.until, min_score=args.min_score, max_score=args.max_score
+    )
+    binary = args.format == "parquet"
+    if binary and not args.output:
+        parser.error("--output is required for parquet")
+    out = open(args.output, "wb" if binary else "w", newline=None if binary else "") if args.output else sys.stdout
+    try:
+        for chunk in stream_export(reports, args.format):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
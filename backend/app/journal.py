@@ -0,0 +1,347 @@
+import asyncio
+import base64
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.scoring import add_score
+from app.session_model import ResponseRecord, SessionRecord, intern_blob
+
+# Event types, in the order a session produces them
+START = "start"
+ANSWER = "answer"
+EVALUATION = "evaluation"
+COMPLETE = "complete"
+EXPIRE = "expire"
+
+try:
+    # Optional; roughly halves replay time
+    from orjson import loads as _loads
+except ImportError:
+    _raw_decode = json.JSONDecoder().raw_decode
+
+    def _loads(line: bytes):
+        # Skips the encoding detection and whitespace handling of json.loads
+        return _raw_decode(line.decode("utf-8"))[0]
+
+
+def last_activity(session: SessionRecord) -> float:
+    if session.end_time is not None:
+        return session.end_time
+    if session.responses:
+        return session.responses[-1].answered_at
+    return session.start_time
+
+
+def capture_session(session: SessionRecord) -> tuple:
+    """The session's state as of now, for encoding off the event loop.
+
+    Responses are shared rather than copied: the only later change to one is
+    its evaluation, and replaying that event over a snapshot that already
+    has it is harmless, since the copied aggregate does not include it yet.
+    """
+    aggregate = dict(session.aggregate)
+    aggregate["high_by_category"] = dict(aggregate["high_by_category"])
+    aggregate["low_by_category"] = dict(aggregate["low_by_category"])
+    return (session.session_id, session.user_name, session.question_ids, session.current_question_index,
+            session.start_time, session.end_time, aggregate, list(session.responses))
+
+
+def encode_snapshot_entry(captured: tuple) -> bytes:
+    """One snapshot line; evaluations stay compressed, as in the journal"""
+    session_id, user_name, question_ids, index, start_time, end_time, aggregate, responses = captured
+    return json.dumps({
+        "session_id": session_id,
+        "user_name": user_name,
+        "question_ids": question_ids,
+        "current_question_index": index,
+        "start_time": start_time,
+        "end_time": end_time,
+        "aggregate": aggregate,
+        "responses": [
+            [r.answer, r.answered_at] if r.blob is None else
+            [r.answer, r.answered_at, r.score, r.blob.digest.hex(), base64.b64encode(r.blob.data).decode("ascii")]
+            for r in responses
+        ]
+    }, separators=(",", ":")).encode("utf-8")
+
+
+def decode_snapshot_entry(data: Dict) -> SessionRecord:
+    session = SessionRecord(data["session_id"], data["user_name"], data["question_ids"], data["start_time"])
+    session.current_question_index = data["current_question_index"]
+    session.end_time = data["end_time"]
+    session.aggregate = data["aggregate"]
+    for entry in data["responses"]:
+        response = ResponseRecord(entry[0], entry[1])
+        if len(entry) > 2:
+            response.complete_blob(intern_blob(bytes.fromhex(entry[3]), base64.b64decode(entry[4])), entry[2])
+        session.responses.append(response)
+    return session
+
+
+class _Snapshot:
+    __slots__ = ("seq", "sessions")
+
+    def __init__(self, seq: int, sessions: List[tuple]):
+        self.seq = seq
+        self.sessions = sessions
+
+
+def apply_event(sessions: Dict[str, SessionRecord], event: Dict) -> None:
+    """Replay one journal event onto the sessions it was recorded against"""
+    kind = event["type"]
+    if kind == START:
+        sessions[event["session_id"]] = SessionRecord(
+            event["session_id"], event["user_name"], event["question_ids"], event["start_time"]
+        )
+        return
+    session = sessions.get(event["session_id"])
+    if session is None:
+        # Its start was compacted away after the session expired
+        return
+    if kind == ANSWER:
+        session.responses.append(ResponseRecord(event["answer"], event["answered_at"]))
+        session.current_question_index = event["index"] + 1
+    elif kind == EVALUATION:
+        blob = intern_blob(bytes.fromhex(event["digest"]), base64.b64decode(event["blob"]))
+        session.responses[event["index"]].complete_blob(blob, event["score"])
+        add_score(session.aggregate, event["question_type"], event["category"], event["score"])
+    elif kind == COMPLETE:
+        session.end_time = event["end_time"]
+    elif kind == EXPIRE:
+        del sessions[event["session_id"]]
+
+
+class SessionJournal:
+    """Write-ahead log of session events with batched fsync.
+
+    Handlers append small event dicts, which only queues them; a writer
+    thread encodes whatever has gathered every `flush_interval` seconds and
+    makes it durable with one write and one fsync. Every `compact_every`
+    events the live sessions from `snapshot_source` are written to a
+    snapshot and the journal starts over; they are copied in a callback of
+    their own on the event loop, not inside the handler whose event
+    triggered it. Each event carries a sequence
+    number and the snapshot records the last one it covers, so a crash
+    between the two steps replays nothing twice.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05, compact_every: int = 20000,
+                 snapshot_source: Optional[Callable[[], Iterable[SessionRecord]]] = None):
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.snapshot_source = snapshot_source
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.written = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+        # Event dicts, or a _Snapshot that must be written at that point in the stream
+        self._pending: List = []
+        self._cond = threading.Condition()
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._compaction_scheduled = False
+
+    # --- Recording (event loop) ---
+
+    def session_started(self, session: SessionRecord) -> None:
+        self._append({
+            "type": START,
+            "session_id": session.session_id,
+            "user_name": session.user_name,
+            "question_ids": list(session.question_ids),
+            "start_time": session.start_time
+        })
+
+    def answer_recorded(self, session: SessionRecord, index: int) -> None:
+        response = session.responses[index]
+        self._append({
+            "type": ANSWER,
+            "session_id": session.session_id,
+            "index": index,
+            "answer": response.answer,
+            "answered_at": response.answered_at
+        })
+
+    def evaluation_stored(self, session: SessionRecord, index: int, question_type: str, category: str) -> None:
+        # The evaluation goes in as its compressed blob, so replay neither re-encodes nor re-compresses it;
+        # type and category travel with it so replay does not need the question bank
+        response = session.responses[index]
+        self._append({
+            "type": EVALUATION,
+            "session_id": session.session_id,
+            "index": index,
+            "score": response.score,
+            "digest": response.blob.digest,
+            "blob": response.blob.data,
+            "question_type": question_type,
+            "category": category
+        })
+
+    def session_completed(self, session: SessionRecord) -> None:
+        self._append({"type": COMPLETE, "session_id": session.session_id, "end_time": session.end_time})
+
+    def session_expired(self, session_id: str) -> None:
+        self._append({"type": EXPIRE, "session_id": session_id})
+
+    def _append(self, event: Dict) -> None:
+        self.seq += 1
+        event["seq"] = self.seq
+        with self._cond:
+            self._pending.append(event)
+            if len(self._pending) == 1:
+                self._cond.notify()
+        self.events_since_snapshot += 1
+        if self.snapshot_source is not None and self.events_since_snapshot >= self.compact_every \
+                and not self._compaction_scheduled:
+            self._schedule_compaction()
+
+    def _schedule_compaction(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not called from a handler (scripts, tests); nothing to keep responsive
+            self.compact(self.snapshot_source())
+            return
+        # Handlers make each change and its event together, without awaiting, so between callbacks
+        # the sessions match the journal
+        self._compaction_scheduled = True
+        loop.call_soon(self._compact_scheduled)
+
+    def _compact_scheduled(self) -> None:
+        self._compaction_scheduled = False
+        self.compact(self.snapshot_source())
+
+    def compact(self, sessions: Iterable[SessionRecord]) -> None:
+        """Queue a snapshot of `sessions`, which must reflect every event appended so far.
+
+        Sessions are copied here, while they match the journal position;
+        encoding and file work happen on the writer thread.
+        """
+        snapshot = _Snapshot(self.seq, [capture_session(session) for session in sessions])
+        with self._cond:
+            self._pending.append(snapshot)
+            if len(self._pending) == 1:
+                self._cond.notify()
+        self.events_since_snapshot = 0
+
+    # --- Recovery ---
+
+    def replay(self, ttl_seconds: Optional[float] = None) -> Dict[str, SessionRecord]:
+        """Rebuild sessions from the snapshot and journal, dropping those idle longer than `ttl_seconds`.
+
+        A torn final line from a crash mid-write is cut off the journal so
+        new events follow the last complete one.
+        """
+        sessions: Dict[str, SessionRecord] = {}
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                snapshot_seq = json.loads(f.readline())["seq"]
+                for line in f:
+                    session = decode_snapshot_entry(_loads(line))
+                    sessions[session.session_id] = session
+        self.seq = snapshot_seq
+
+        if os.path.exists(self.path):
+            good_offset = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        event = _loads(line)
+                    except ValueError:
+                        print(f"Error reading session journal at byte {good_offset}; discarding the rest")
+                        break
+                    good_offset += len(line)
+                    if event["seq"] > snapshot_seq:
+                        apply_event(sessions, event)
+                        self.seq = event["seq"]
+                        self.events_since_snapshot += 1
+            if good_offset < os.path.getsize(self.path):
+                os.truncate(self.path, good_offset)
+
+        if ttl_seconds is not None:
+            cutoff = time.time() - ttl_seconds
+            sessions = {sid: session for sid, session in sessions.items() if last_activity(session) > cutoff}
+        return sessions
+
+    # --- Writer thread ---
+
+    def start(self) -> None:
+        self._file = open(self.path, "ab")
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Write and fsync everything still queued"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                closing = self._closed
+            if not closing:
+                # Let a group of events gather so they share one fsync
+                time.sleep(self.flush_interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            try:
+                self._write(batch)
+            except OSError as e:
+                print(f"Error writing session journal: {e}")
+
+    def _write(self, batch: List) -> None:
+        lines = []
+        for item in batch:
+            if isinstance(item, _Snapshot):
+                self._flush(lines)
+                lines = []
+                self._write_snapshot(item)
+            else:
+                if item["type"] == EVALUATION:
+                    item["digest"] = item["digest"].hex()
+                    item["blob"] = base64.b64encode(item["blob"]).decode("ascii")
+                lines.append(json.dumps(item, separators=(",", ":"), default=str).encode("utf-8"))
+        self._flush(lines)
+
+    def _flush(self, lines: List[bytes]) -> None:
+        if not lines:
+            return
+        self._file.write(b"\n".join(lines) + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.written += len(lines)
+        self.fsyncs += 1
+
+    def _write_snapshot(self, snapshot: _Snapshot) -> None:
+        temporary = f"{self.snapshot_path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(json.dumps({"seq": snapshot.seq}).encode("utf-8") + b"\n")
+            for captured in snapshot.sessions:
+                f.write(encode_snapshot_entry(captured) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.snapshot_path)
+        # Everything journalled so far is in the snapshot
+        self._file.truncate(0)
+        self._file.seek(0)
+        self.fsyncs += 1
+        self.snapshots += 1
@@ -0,0 +1,122 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONFieldExtractor:
+    """Pulls top-level fields out of a JSON object while it is still streaming.
+
+    Feed raw model output chunk by chunk; each call returns the (name, value)
+    pairs whose values became complete in that chunk. Text before the opening
+    brace (such as a ```json fence) is ignored. Every character is scanned
+    once and only the value being read is kept, split into the pieces that
+    each chunk contributed, so total work is linear in the response length.
+    """
+
+    def __init__(self):
+        self._pieces: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "object"
+        self._key = None
+        self._token_start = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        fields = []
+        # The open key or value continues from the previous chunk, if any
+        self._token_start = 0
+
+        for i, ch in enumerate(chunk):
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key":
+                        self._key = json.loads(self._token(chunk, i + 1))
+                        self._state = "colon"
+                    elif self._depth == 1 and self._state == "value":
+                        self._emit(fields, self._token(chunk, i + 1))
+                        self._state = "comma"
+                continue
+
+            if self._state == "done":
+                break
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._state = "key"
+                continue
+
+            if self._depth > 1:
+                # Inside a nested array/object value; wait for it to close
+                if ch == '"':
+                    self._in_string = True
+                elif ch in "[{":
+                    self._depth += 1
+                elif ch in "]}":
+                    self._depth -= 1
+                    if self._depth == 1:
+                        self._emit(fields, self._token(chunk, i + 1))
+                        self._state = "comma"
+                continue
+
+            if self._state == "key":
+                if ch == '"':
+                    self._in_string = True
+                    self._start_token(i)
+                elif ch == "}":
+                    self._finish()
+            elif self._state == "colon":
+                if ch == ":":
+                    self._state = "value_start"
+            elif self._state == "value_start":
+                if ch.isspace():
+                    continue
+                self._start_token(i)
+                self._state = "value"
+                if ch == '"':
+                    self._in_string = True
+                elif ch in "[{":
+                    self._depth += 1
+            elif self._state == "value":
+                # Scalar (number, true/false/null) ends at the next delimiter
+                if ch in ",}":
+                    self._emit(fields, self._token(chunk, i))
+                    self._state = "key"
+                    if ch == "}":
+                        self._finish()
+            elif self._state == "comma":
+                if ch == ",":
+                    self._state = "key"
+                elif ch == "}":
+                    self._finish()
+
+        if self._state == "value" or (self._state == "key" and self._in_string):
+            self._pieces.append(chunk[self._token_start:])
+        return fields
+
+    def _start_token(self, i: int) -> None:
+        self._pieces = []
+        self._token_start = i
+
+    def _token(self, chunk: str, end: int) -> str:
+        """The open key or value, from its first character up to chunk[end]"""
+        self._pieces.append(chunk[self._token_start:end])
+        raw = "".join(self._pieces)
+        self._pieces = []
+        return raw
+
+    def _emit(self, fields: List[Tuple[str, Any]], raw: str) -> None:
+        try:
+            fields.append((self._key, json.loads(raw)))
+        except json.JSONDecodeError:
+            pass
+
+    def _finish(self) -> None:
+        self._depth = 0
+        self._state = "done"
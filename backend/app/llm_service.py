@@ -1,68 +1,437 @@
 import os
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
-import json
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 import time
 
+from app import metrics
+from app.coalescing import SingleFlight
+from app.evaluation_cache import EvaluationCache, make_cache_key
+from app.evaluation_schema import (
+    BATCH_SCHEMA, EVALUATION_SCHEMA, ORDERED_EVALUATION_SCHEMA, InvalidModelOutput, parse_batch_evaluations,
+    parse_evaluation
+)
+from app.json_stream import IncrementalJSONFieldExtractor
+from app.prompts import PromptBuilder, estimate_tokens
+from app.providers import LLMBackend, create_backend
+from app.resilience import HedgeBudget, TokenBucket, call_with_retry, hedged_call
+from config.llm_config import LLMConfig
+
 load_dotenv()
 
+# Bump whenever the evaluation prompt changes so cached results are not reused
+EVALUATION_PROMPT_VERSION = "3"
+# Bump whenever the reference answer prompt changes so generated reference answers are rewritten
+REFERENCE_PROMPT_VERSION = "1"
+
+# Schema.property_ordering arrived in later SDK releases; without it a schema makes Gemini write fields alphabetically
+SCHEMA_PROPERTY_ORDERING = "property_ordering" in glm.Schema.meta.fields
+
+# Transient API failures worth retrying: 429, 5xx and timeouts
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+def default_evaluation() -> Dict:
+    """Neutral evaluation returned when the model output is unusable"""
+    return {
+        "score": 5,
+        "feedback": "Thank you for your answer. Let me provide some guidance on this topic.",
+        "suggestions": ["Review the core concepts", "Practice with real examples"],
+        "strengths": ["You provided an answer"],
+        "missing_concepts": ["Unable to assess at this time"]
+    }
+
 class GeminiService:
-    def __init__(self):
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+    def __init__(self, model=None, cache: Optional[EvaluationCache] = None,
+                 backends: Optional[List[LLMBackend]] = None):
+        api_key = os.getenv("GEMINI_API_KEY")
+        genai.configure(api_key=api_key)
+        if backends is None:
+            # An injected model (tests, benchmarks) replaces the configured backends
+            backends = [LLMBackend("injected", model)] if model is not None \
+                else [create_backend(spec) for spec in LLMConfig.BACKENDS]
+        self.backends = backends
+        self.primary = backends[0]
+        # Slow primary calls are duplicated to the first secondary backend, if any
+        self.hedge = backends[1] if len(backends) > 1 else None
+        self.model = self.primary.model
+        self.is_configured = bool(api_key) or not any(backend.needs_api_key for backend in backends)
+        self.cache = cache or EvaluationCache(
+            max_entries=LLMConfig.EVALUATION_CACHE_SIZE,
+            ttl_seconds=LLMConfig.EVALUATION_CACHE_TTL,
+            persist_path=LLMConfig.EVALUATION_CACHE_PATH or None,
+            max_rows=LLMConfig.EVALUATION_CACHE_MAX_ROWS
+        )
+        self.prompts = PromptBuilder(max_answer_tokens=LLMConfig.MAX_ANSWER_TOKENS)
+        # Identical answers evaluated at the same time share one model call
+        self.in_flight = SingleFlight()
+        self.generation_config = genai.GenerationConfig(
+            temperature=LLMConfig.TEMPERATURE_EVALUATION,
+            max_output_tokens=LLMConfig.MAX_OUTPUT_TOKENS
+        )
+        # Evaluations ask for JSON matching the schema, so the model cannot answer in prose
+        evaluation_config = self._json_config(EVALUATION_SCHEMA)
+        self.generation_configs = {
+            "evaluate": evaluation_config,
+            # Streams need score first; an unordered schema would put it after feedback and missing_concepts,
+            # so without ordering support they get plain JSON in the prompt's field order, validated as usual
+            "stream": self._json_config(ORDERED_EVALUATION_SCHEMA if SCHEMA_PROPERTY_ORDERING else None),
+            "reask": evaluation_config,
+            "batch": self._json_config(BATCH_SCHEMA)
+        }
+        # Shared by every in-flight evaluation
+        self.rate_limiter = TokenBucket(
+            rate_per_minute=LLMConfig.MAX_REQUESTS_PER_MINUTE,
+            capacity=LLMConfig.RATE_LIMIT_BURST
+        )
+        self.hedge_budget = HedgeBudget(ratio=LLMConfig.HEDGE_BUDGET, capacity=LLMConfig.HEDGE_BUDGET_BURST)
+        # Blocking SDK calls run here so they never stall the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=LLMConfig.MAX_CONCURRENT_EVALUATIONS,
+            thread_name_prefix="llm-eval"
+        )
+        # Hedged calls race here, up to two per evaluation thread
+        self._call_executor = ThreadPoolExecutor(
+            max_workers=2 * LLMConfig.MAX_CONCURRENT_EVALUATIONS,
+            thread_name_prefix="llm-call"
+        )
+        
+    @staticmethod
+    def _json_config(schema: Optional[Dict]):
+        return genai.GenerationConfig(
+            temperature=LLMConfig.TEMPERATURE_EVALUATION,
+            max_output_tokens=LLMConfig.MAX_OUTPUT_TOKENS,
+            response_mime_type="application/json",
+            response_schema=schema
+        )
         
-    def evaluate_answer(self, question: str, answer: str, criteria: List[str]) -> Dict:
+    def probe(self) -> bool:
+        """Make one tiny model call to confirm the API key and model work"""
+        try:
+            response = self._generate("Reply with the single word OK.", operation="probe")
+            return bool(response.text.strip())
+        except Exception as e:
+            print(f"LLM health probe failed: {e}")
+            return False
+    
+    async def probe_async(self) -> bool:
+        return await self._run_in_executor(self.probe)
+    
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._call_executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run_in_executor(self, func, *args):
+        """Run on the executor with the caller's context, so timing spans follow the call"""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, contextvars.copy_context().run, func, *args)
+        
+    async def evaluate_answer_async(self, question: str, answer: str, criteria: List[str],
+                                    question_id: Optional[str] = None) -> Dict:
+        """Evaluate an answer on the bounded executor without blocking the event loop"""
+        cached = await self._cached_async(question, answer, question_id)
+        if cached is not None:
+            return cached
+        
+        cache_key = self._cache_key(question, answer, question_id)
+        if cache_key in self.in_flight:
+            metrics.llm_calls_saved.inc(reason="coalesced")
+        return await self.in_flight.run(
+            cache_key, lambda: self._run_in_executor(self._evaluate_uncached, question, answer, criteria, question_id)
+        )
+    
+    @property
+    def model_name(self) -> str:
+        return getattr(self.model, "model_name", type(self.model).__name__)
+    
+    def _cache_key(self, question: str, answer: str, question_id: Optional[str],
+                   backend: Optional[LLMBackend] = None) -> str:
+        """Key of the evaluation written by `backend` (the primary by default), so models never share an entry"""
+        model = (backend or self.primary).model
+        model_name = getattr(model, "model_name", type(model).__name__)
+        return make_cache_key(question_id or question, answer, f"{EVALUATION_PROMPT_VERSION}:{model_name}")
+    
+    def _cached(self, question: str, answer: str, question_id: Optional[str]) -> Optional[Dict]:
+        """The primary's cached evaluation, else one the hedge backend wrote when it answered first"""
+        return self.cache.get(*self._cache_keys(question, answer, question_id))
+    
+    async def _cached_async(self, question: str, answer: str, question_id: Optional[str]) -> Optional[Dict]:
+        """_cached for the event loop: memory hits return at once, SQLite is read on the default executor"""
+        keys = self._cache_keys(question, answer, question_id)
+        cached = self.cache.get(*keys, load=False)
+        if cached is not None or not self.cache.persistent:
+            return cached
+        # Not on the evaluation executor, where a lookup would queue behind model calls
+        return await asyncio.get_running_loop().run_in_executor(None, self.cache.get, *keys)
+    
+    def _cache_keys(self, question: str, answer: str, question_id: Optional[str]) -> List[str]:
+        return [self._cache_key(question, answer, question_id, backend)
+                for backend in (self.primary, self.hedge) if backend is not None]
+        
+    def evaluate_answer(self, question: str, answer: str, criteria: List[str],
+                        question_id: Optional[str] = None) -> Dict:
         """Evaluate a candidate's answer using Gemini"""
+        cached = self._cached(question, answer, question_id)
+        if cached is not None:
+            return cached
+        return self._evaluate_uncached(question, answer, criteria, question_id)
+    
+    def generate_reference_answer(self, question: str, criteria: List[str]) -> str:
+        """Write the reference answer for a question; raises if the model gives nothing usable"""
+        response = self._generate(self.prompts.reference(question, criteria), operation="reference")
+        answer = response.text.strip()
+        if not answer:
+            raise ValueError("Empty reference answer")
+        return answer
+    
+    async def generate_reference_answer_async(self, question: str, criteria: List[str]) -> str:
+        return await self._run_in_executor(self.generate_reference_answer, question, criteria)
+    
+    async def stream_evaluation(self, question: str, answer: str, criteria: List[str],
+                                question_id: Optional[str] = None) -> AsyncIterator[Tuple[str, object]]:
+        """Stream an evaluation as it is generated.
+        
+        Yields ("field", (name, value)) for each top-level JSON field as soon
+        as it is complete, then ("evaluation", evaluation) with the validated
+        result. That supersedes the fields: repair, a re-ask or the default
+        evaluation can change or drop any of them.
+        """
+        cached = await self._cached_async(question, answer, question_id)
+        if cached is not None:
+            for name, value in cached.items():
+                yield "field", (name, value)
+            yield "evaluation", cached
+            return
+        
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        prompt = self.prompts.evaluation(question, answer, criteria)
+        
+        def produce():
+            # Runs on the executor; hands chunks back to the event loop
+            started = time.perf_counter()
+            completion_tokens = 0
+            try:
+                response = self._generate(prompt, stream=True, operation="stream")
+                with metrics.span("llm"):
+                    for chunk in response:
+                        completion_tokens += estimate_tokens(chunk.text)
+                        loop.call_soon_threadsafe(chunks.put_nowait, ("chunk", chunk.text))
+                loop.call_soon_threadsafe(chunks.put_nowait, ("end", None))
+            except Exception as e:
+                metrics.llm_errors.inc(operation="stream", backend=self.primary.name, error=type(e).__name__)
+                loop.call_soon_threadsafe(chunks.put_nowait, ("error", e))
+            finally:
+                metrics.llm_call_duration.observe(time.perf_counter() - started, operation="stream",
+                                                  backend=self.primary.name)
+                metrics.llm_prompt_tokens.inc(estimate_tokens(prompt), operation="stream")
+                metrics.llm_completion_tokens.inc(completion_tokens, operation="stream")
         
-        prompt = f"""
-        You are an expert Excel interviewer. Evaluate this answer and provide helpful feedback.
+        producer = self._run_in_executor(produce)
+        extractor = IncrementalJSONFieldExtractor()
+        text = []
+        evaluation = None
+        while evaluation is None:
+            kind, payload = await chunks.get()
+            if kind == "chunk":
+                text.append(payload)
+                for field in extractor.feed(payload):
+                    yield "field", field
+            elif kind == "error":
+                print(f"Error evaluating answer: {payload}")
+                metrics.llm_fallbacks.inc(source="stream")
+                evaluation = default_evaluation()
+            else:
+                try:
+                    # Off the event loop, since a malformed response is asked for again
+                    evaluation = await self._run_in_executor(
+                        self._accept, prompt, "".join(text), (question, answer, question_id), self.primary, "stream"
+                    )
+                except Exception as e:
+                    print(f"Error evaluating answer: {e}")
+                    metrics.llm_fallbacks.inc(source="stream")
+                    evaluation = default_evaluation()
+        await producer
+        yield "evaluation", evaluation
+    
+    def _generate(self, prompt: str, stream: bool = False, operation: str = "evaluate"):
+        return self._generate_from(prompt, stream, operation)[0]
+    
+    def _generate_from(self, prompt: str, stream: bool = False,
+                       operation: str = "evaluate") -> Tuple[object, LLMBackend]:
+        """Call the primary model, hedging to the secondary when it is slower than usual or fails.
         
-        Question: {question}
-        Candidate's Answer: {answer}
+        Returns the response and the backend that wrote it. Streams always
+        use the primary alone: their first chunks are already on the way to
+        the candidate.
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        metrics.llm_prompt_size.observe(prompt_tokens, operation=operation)
         
-        Evaluation criteria: {', '.join(criteria)}
+        # Rate-limit waits, retry backoff and hedging all count as LLM time
+        with metrics.span("llm"):
+            if stream or self.hedge is None:
+                return self._call_backend(self.primary, prompt, stream, operation, prompt_tokens), self.primary
+            response, outcome = hedged_call(
+                lambda: self._call_backend(self.primary, prompt, False, operation, prompt_tokens),
+                lambda: self._call_backend(self.hedge, prompt, False, operation, prompt_tokens),
+                delay=self._hedge_delay(),
+                budget=self.hedge_budget,
+                executor=self._call_executor
+            )
+            metrics.llm_hedges.inc(outcome=outcome)
+            return response, self.hedge if outcome in ("hedge_won", "fallback") else self.primary
+    
+    def _hedge_delay(self) -> float:
+        """The primary's recent p95 latency, or a fixed delay until enough calls have been seen"""
+        latency = self.primary.latency
+        if len(latency) < LLMConfig.HEDGE_MIN_SAMPLES:
+            return LLMConfig.HEDGE_DEFAULT_DELAY
+        return max(LLMConfig.HEDGE_MIN_DELAY, latency.percentile(LLMConfig.HEDGE_PERCENTILE))
+    
+    def _call_backend(self, backend: LLMBackend, prompt: str, stream: bool, operation: str, prompt_tokens: int):
+        """One backend call under the shared rate limit, the backend's circuit breaker and the retry policy"""
+        generation_config = self.generation_configs.get(operation, self.generation_config)
         
-        Provide a JSON response with this exact format:
-        {{
-            "score": <number 0-10>,
-            "feedback": "<2-3 sentences of specific feedback WITHOUT mentioning the score>",
-            "correct_answer": "<Provide a comprehensive correct answer to the question>",
-            "suggestions": ["<specific suggestion 1>", "<specific suggestion 2>"],
-            "strengths": ["<what they got right>"],
-            "missing_concepts": ["<what they missed>"]
-        }}
+        def attempt():
+            # Streaming calls return before the model is done; stream_evaluation times those
+            if stream:
+                return backend.model.generate_content(prompt, generation_config=generation_config, stream=True)
+            started = time.perf_counter()
+            try:
+                response = backend.model.generate_content(prompt, generation_config=generation_config)
+            except Exception as e:
+                metrics.llm_errors.inc(operation=operation, backend=backend.name, error=type(e).__name__)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                metrics.llm_call_duration.observe(elapsed, operation=operation, backend=backend.name)
+            backend.latency.record(elapsed)
+            self._record_usage(operation, prompt_tokens, response)
+            return response
         
-        Important:
-        - Do NOT mention the score in the feedback
-        - Focus on what they did well and what to improve
-        - Provide the actual correct answer
-        - Give actionable suggestions
+        return call_with_retry(
+            attempt,
+            limiter=self.rate_limiter,
+            breaker=backend.circuit_breaker,
+            retryable=RETRYABLE_ERRORS,
+            max_retries=LLMConfig.MAX_RETRIES,
+            base_delay=LLMConfig.RETRY_DELAY,
+            max_delay=LLMConfig.MAX_RETRY_DELAY,
+            limiter_timeout=LLMConfig.RATE_LIMIT_MAX_WAIT
+        )
+    
+    @staticmethod
+    def _record_usage(operation: str, prompt_tokens: int, response) -> None:
+        """Count tokens from the API's usage metadata when the SDK provides it, else estimate"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and getattr(usage, "prompt_token_count", None):
+            prompt_tokens = usage.prompt_token_count
+            completion_tokens = usage.candidates_token_count
+        else:
+            completion_tokens = estimate_tokens(response.text)
+        metrics.llm_prompt_tokens.inc(prompt_tokens, operation=operation)
+        metrics.llm_completion_tokens.inc(completion_tokens, operation=operation)
+    
+    async def evaluate_answers_batch_async(self, items: List[Dict]) -> List[Dict]:
+        """Batch variant of evaluate_answer_async, run on the bounded executor"""
+        return await self._run_in_executor(self.evaluate_answers_batch, items)
+    
+    def evaluate_answers_batch(self, items: List[Dict]) -> List[Dict]:
+        """Evaluate several answers with one model call per LLMConfig.MAX_BATCH_SIZE items.
         
-        Return ONLY the JSON, no other text.
+        Each item has "question", "answer", "criteria" and optionally
+        "question_id". Results come back in input order; any item the batch
+        response does not cover cleanly is evaluated on its own.
         """
+        results: List[Optional[Dict]] = [None] * len(items)
+        pending = []
+        for position, item in enumerate(items):
+            cached = self._cached(item["question"], item["answer"], item.get("question_id"))
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.append(position)
+        
+        for start in range(0, len(pending), LLMConfig.MAX_BATCH_SIZE):
+            chunk = pending[start:start + LLMConfig.MAX_BATCH_SIZE]
+            evaluated, backend = self._evaluate_batch_uncached([items[position] for position in chunk])
+            for number, position in enumerate(chunk, start=1):
+                item = items[position]
+                evaluation = evaluated.get(number)
+                if evaluation is None:
+                    evaluation = self._evaluate_uncached(
+                        item["question"], item["answer"], item["criteria"], item.get("question_id")
+                    )
+                else:
+                    self.cache.set(self._cache_key(item["question"], item["answer"], item.get("question_id"), backend),
+                                   evaluation)
+                results[position] = evaluation
+        
+        return results
+    
+    def _evaluate_batch_uncached(self, items: List[Dict]) -> Tuple[Dict[int, Dict], Optional[LLMBackend]]:
+        """Evaluations by 1-based item number, and the backend that wrote them"""
+        prompt = self.prompts.batch(items)
         
         try:
-            response = self.model.generate_content(prompt)
-            # Clean the response to get JSON
-            json_str = response.text.strip()
-            if "```json" in json_str:
-                json_str = json_str.split("```json")[1].split("```")[0]
-            elif "```" in json_str:
-                json_str = json_str.split("```")[1].split("```")[0]
-            
-            return json.loads(json_str.strip())
+            response, backend = self._generate_from(prompt, operation="batch")
+            with metrics.span("parse"):
+                items, repaired = parse_batch_evaluations(response.text)
+        except Exception as e:
+            print(f"Error evaluating answer batch: {e}")
+            return {}, None
+        # Items missing from the response are evaluated one by one, and re-asked there if need be
+        outcome = "invalid" if not items else "repaired" if repaired else "valid"
+        metrics.llm_output_parses.inc(operation="batch", outcome=outcome)
+        return items, backend
+    
+    def _evaluate_uncached(self, question: str, answer: str, criteria: List[str],
+                           question_id: Optional[str] = None) -> Dict:
+        prompt = self.prompts.evaluation(question, answer, criteria)
+        
+        try:
+            response, backend = self._generate_from(prompt)
+            return self._accept(prompt, response.text, (question, answer, question_id), backend, "evaluate")
         except Exception as e:
             print(f"Error evaluating answer: {e}")
+            metrics.llm_fallbacks.inc(source="evaluate")
             # Return default evaluation on error
-            return {
-                "score": 5,
-                "feedback": "Thank you for your answer. Let me provide some guidance on this topic.",
-                "correct_answer": "Please refer to Excel documentation for detailed information on this topic.",
-                "suggestions": ["Review the core concepts", "Practice with real examples"],
-                "strengths": ["You provided an answer"],
-                "missing_concepts": ["Unable to assess at this time"]
-            }
-
-# Initialize service
-llm_service = GeminiService()
\ No newline at end of file
+            return default_evaluation()
+    
+    def _accept(self, prompt: str, text: str, item: Tuple[str, str, Optional[str]], backend: LLMBackend,
+                operation: str) -> Dict:
+        """Validate a model evaluation, repairing it locally or asking again up to LLMConfig.MAX_REASKS times.
+        
+        `item` is the (question, answer, question_id) evaluated and `backend`
+        the model that wrote `text`. The accepted evaluation is cached under
+        the model that wrote it; raises InvalidModelOutput if none is usable.
+        """
+        reasks = 0
+        while True:
+            try:
+                with metrics.span("parse"):
+                    evaluation, repaired = parse_evaluation(text)
+            except InvalidModelOutput as e:
+                metrics.llm_output_parses.inc(operation=operation, outcome="invalid")
+                metrics.llm_errors.inc(operation=operation, backend=backend.name, error="invalid_output")
+                if reasks >= LLMConfig.MAX_REASKS:
+                    raise
+                reasks += 1
+                operation = "reask"
+                response, backend = self._generate_from(self.prompts.reask(prompt, str(e)), operation=operation)
+                text = response.text
+                continue
+            metrics.llm_output_parses.inc(operation=operation, outcome="repaired" if repaired else "valid")
+            # Only real model output is cached; fallbacks are not
+            self.cache.set(self._cache_key(*item, backend=backend), evaluation)
+            return evaluation
@@ -1,12 +1,85 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Set
 import uuid
+import secrets
 from datetime import datetime
-import random
+import asyncio
+import json
+import orjson
+import time
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Excel Mock Interviewer API")
+from app import metrics
+from app.archive import CompletedSessionArchive
+from app.coalescing import KeyedLocks, SingleFlight
+from app.compression import CompressionMiddleware
+from app.deadlines import DeadlineScheduler
+from app.metrics import Counter, Gauge, MetricsMiddleware
+from app.evaluation_queue import EvaluationQueue
+from app.export import EXPORT_FORMATS, completed_reports, parquet_available, parse_date_bound, stream_export
+from app.journal import SessionJournal, last_activity
+from app.llm_service import REFERENCE_PROMPT_VERSION, GeminiService
+from app.pre_scorer import PreScorer
+from app.question_bank import QuestionBank
+from app.reference_answers import ReferenceAnswerStore
+from app.scoring import ScoreHistogram, add_score, average_scores, scored_count
+from app.session_model import COMPLETED, PENDING, STATUS_NAMES, ResponseRecord, SessionRecord
+from app.session_store import create_session_store
+from config.llm_config import InterviewConfig, LLMConfig
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the LLM client once per worker so no request pays for SDK setup
+    if app.state.llm_service is None:
+        try:
+            app.state.llm_service = GeminiService()
+        except Exception as e:
+            print(f"Error initializing LLM service: {e}")
+    
+    service = app.state.llm_service
+    app.state.llm_ready = service is not None and service.is_configured
+    if app.state.llm_ready and LLMConfig.STARTUP_PROBE:
+        app.state.llm_ready = await service.probe_async()
+    if not app.state.llm_ready:
+        print("LLM service is not usable; readiness check will fail")
+    
+    # Bring back sessions that were in progress when the process last stopped
+    if session_journal is not None:
+        restored = session_journal.replay(ttl_seconds=InterviewConfig.SESSION_TTL)
+        for session in sorted(restored.values(), key=last_activity):
+            session_store.save(session)
+            if session.end_time is None:
+                metrics.active_sessions.inc()
+                schedule_deadlines(session)
+        session_journal.start()
+        if restored:
+            print(f"Restored {len(restored)} sessions from the session journal")
+    
+    # Interviews completed before this worker started still count towards percentile ranks;
+    # read in the background, since the archive grows without bound
+    seeding = asyncio.create_task(seed_score_histogram())
+    sweeper = asyncio.create_task(sweep_deadlines()) if InterviewConfig.ENFORCE_TIME_LIMITS else None
+    
+    yield
+    
+    seeding.cancel()
+    if sweeper is not None:
+        sweeper.cancel()
+    if service is not None:
+        service.close()
+    if session_journal is not None:
+        session_journal.close()
+    if completed_archive is not None:
+        completed_archive.close()
+
+app = FastAPI(title="Excel Mock Interviewer API", lifespan=lifespan, default_response_class=ORJSONResponse)
+# Set by lifespan; tests and benchmarks may inject their own before startup
+app.state.llm_service = None
+app.state.llm_ready = False
 
 # CORS configuration
 app.add_middleware(
@@ -17,249 +90,262 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Data models
-class InterviewSession(BaseModel):
-    session_id: str
-    user_name: str
-    current_question_index: int = 0
-    responses: List[Dict] = []
-    start_time: datetime
-    end_time: Optional[datetime] = None
-    selected_questions: List[Dict] = []
-    
+# Request latency by route, plus Server-Timing spans when enabled
+app.add_middleware(MetricsMiddleware, server_timing=InterviewConfig.SERVER_TIMING)
+
+# gzip (brotli when installed) for responses from COMPRESSION_MIN_SIZE bytes
+if InterviewConfig.RESPONSE_COMPRESSION:
+    app.add_middleware(CompressionMiddleware, minimum_size=InterviewConfig.COMPRESSION_MIN_SIZE)
+
+# Data models (sessions themselves are app.session_model.SessionRecord)
 class UserResponse(BaseModel):
     session_id: str
     answer: str
+    defer_evaluation: bool = False  # Return the next question before the LLM evaluation finishes
+    question_number: Optional[int] = None  # Question being answered (1-based); repeats get the stored result
+    slim_report: bool = False  # Leave detailed_feedback out of the final report; page through /report/details instead
 
 class StartInterviewRequest(BaseModel):
     user_name: str
 
-# MCQ Questions Bank
-MCQ_QUESTIONS = [
-    {
-        "id": "mcq_1",
-        "question": "Which function would you use to find the position of a specific character in a text string?",
-        "options": ["A) FIND()", "B) VLOOKUP()", "C) MATCH()", "D) INDEX()"],
-        "correct_answer": "A",
-        "difficulty": "easy",
-        "category": "text_functions",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_2",
-        "question": "What is the keyboard shortcut to create an absolute reference in Excel?",
-        "options": ["A) Ctrl + $", "B) F4", "C) Alt + $", "D) Shift + F4"],
-        "correct_answer": "B",
-        "difficulty": "easy",
-        "category": "shortcuts",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_3",
-        "question": "Which of the following is NOT a valid Excel chart type?",
-        "options": ["A) Waterfall", "B) Sunburst", "C) Pyramid", "D) Treemap"],
-        "correct_answer": "C",
-        "difficulty": "intermediate",
-        "category": "charts",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_4",
-        "question": "What does the IFERROR function do?",
-        "options": [
-            "A) Checks if a cell contains an error",
-            "B) Returns a specified value if a formula results in an error",
-            "C) Removes all errors from a worksheet",
-            "D) Counts the number of errors in a range"
-        ],
-        "correct_answer": "B",
-        "difficulty": "easy",
-        "category": "error_handling",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_5",
-        "question": "Which function would you use to return the nth largest value in a dataset?",
-        "options": ["A) MAX()", "B) LARGE()", "C) RANK()", "D) TOP()"],
-        "correct_answer": "B",
-        "difficulty": "intermediate",
-        "category": "statistical_functions",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_6",
-        "question": "What is the maximum number of rows in Excel 365?",
-        "options": ["A) 65,536", "B) 1,048,576", "C) 2,097,152", "D) Unlimited"],
-        "correct_answer": "B",
-        "difficulty": "easy",
-        "category": "excel_basics",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_7",
-        "question": "Which of these is a dynamic array function introduced in Excel 365?",
-        "options": ["A) VLOOKUP()", "B) SUMIF()", "C) FILTER()", "D) COUNTIF()"],
-        "correct_answer": "C",
-        "difficulty": "intermediate",
-        "category": "dynamic_arrays",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_8",
-        "question": "What does pressing Ctrl+Shift+L do in Excel?",
-        "options": [
-            "A) Lock cells",
-            "B) Toggle AutoFilter",
-            "C) Create a list",
-            "D) Insert a hyperlink"
-        ],
-        "correct_answer": "B",
-        "difficulty": "easy",
-        "category": "shortcuts",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_9",
-        "question": "Which function combines text from multiple cells into one cell?",
-        "options": ["A) JOIN()", "B) COMBINE()", "C) CONCATENATE()", "D) MERGE()"],
-        "correct_answer": "C",
-        "difficulty": "easy",
-        "category": "text_functions",
-        "question_type": "mcq"
-    },
-    {
-        "id": "mcq_10",
-        "question": "What is the purpose of the INDIRECT function?",
-        "options": [
-            "A) To create indirect cell references",
-            "B) To convert text strings into cell references",
-            "C) To create circular references",
-            "D) To reference cells in closed workbooks"
-        ],
-        "correct_answer": "B",
-        "difficulty": "intermediate",
-        "category": "reference_functions",
-        "question_type": "mcq"
-    }
-]
-
-# General Questions Bank (expanded)
-GENERAL_QUESTIONS = [
-    {
-        "id": "gen_1",
-        "question": "What is the difference between VLOOKUP and XLOOKUP? When would you use each?",
-        "difficulty": "intermediate",
-        "category": "lookup_functions",
-        "evaluation_criteria": ["accuracy", "practical_examples", "limitations_understanding"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_2",
-        "question": "How would you create a dynamic dashboard in Excel that updates automatically when new data is added?",
-        "difficulty": "advanced",
-        "category": "data_visualization",
-        "evaluation_criteria": ["pivot_tables", "dynamic_ranges", "charts", "data_connections"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_3",
-        "question": "Explain how you would clean and prepare a dataset with 10,000 rows containing duplicates, missing values, and inconsistent formatting.",
-        "difficulty": "intermediate",
-        "category": "data_cleaning",
-        "evaluation_criteria": ["remove_duplicates", "handling_nulls", "text_functions", "efficiency"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_4",
-        "question": "What are the most common Excel functions you use for financial analysis and why?",
-        "difficulty": "intermediate",
-        "category": "financial_analysis",
-        "evaluation_criteria": ["function_knowledge", "practical_application", "financial_understanding"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_5",
-        "question": "Describe a complex Excel problem you've solved and walk me through your approach.",
-        "difficulty": "advanced",
-        "category": "problem_solving",
-        "evaluation_criteria": ["problem_complexity", "solution_approach", "technical_skills", "communication"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_6",
-        "question": "How would you use Power Query to combine data from multiple sources and transform it for analysis?",
-        "difficulty": "advanced",
-        "category": "power_query",
-        "evaluation_criteria": ["data_sources", "transformation_steps", "m_language", "best_practices"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_7",
-        "question": "Explain the concept of array formulas and provide an example of when they would be more efficient than regular formulas.",
-        "difficulty": "intermediate",
-        "category": "array_formulas",
-        "evaluation_criteria": ["concept_understanding", "practical_examples", "performance_benefits"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_8",
-        "question": "How would you set up a spreadsheet to track project budgets with automatic variance analysis and conditional formatting alerts?",
-        "difficulty": "intermediate",
-        "category": "project_management",
-        "evaluation_criteria": ["structure", "formulas", "conditional_formatting", "reporting"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_9",
-        "question": "What are your strategies for optimizing large Excel files that are running slowly?",
-        "difficulty": "advanced",
-        "category": "performance_optimization",
-        "evaluation_criteria": ["file_size_reduction", "formula_optimization", "data_model", "best_practices"],
-        "question_type": "general"
-    },
-    {
-        "id": "gen_10",
-        "question": "How would you create a data validation system to ensure data quality in a shared Excel workbook?",
-        "difficulty": "intermediate",
-        "category": "data_validation",
-        "evaluation_criteria": ["validation_rules", "error_messages", "dropdown_lists", "custom_formulas"],
-        "question_type": "general"
-    }
-]
+# Question bank, loaded and indexed once at startup
+question_bank = QuestionBank.load(InterviewConfig.QUESTION_BANK_DIR)
+
+# Correct answers shown with feedback: authored in the bank, or written by the model once per question
+reference_answers = ReferenceAnswerStore(
+    InterviewConfig.REFERENCE_ANSWERS_PATH,
+    REFERENCE_PROMPT_VERSION,
+    retry_after=InterviewConfig.REFERENCE_ANSWER_RETRY_AFTER
+)
+
+# Settles trivial open-ended answers before they reach the LLM
+pre_scorer = PreScorer.from_files(
+    [question_bank.get(question_id) for question_id in question_bank.ids(question_type="general")],
+    InterviewConfig.CONCEPT_LEXICON_PATH,
+    min_words=InterviewConfig.PRE_SCORE_MIN_WORDS,
+    min_similarity=InterviewConfig.PRE_SCORE_MIN_SIMILARITY,
+    max_local_score=InterviewConfig.PRE_SCORE_MAX_LOCAL_SCORE
+) if InterviewConfig.PRE_SCORING_ENABLED else None
+
+def session_evicted(session: SessionRecord) -> None:
+    # Abandoned: dropped by the store's TTL or size cap before it was completed
+    if session.end_time is None:
+        metrics.active_sessions.dec()
+
+# Session storage: in-process LRU/TTL by default, Redis when SESSION_STORE_URL is set
+session_store = create_session_store(on_evict=session_evicted)
 
-# In-memory session storage (replace with Redis in production)
-sessions = {}
+# Write-ahead journal of session events, replayed at startup; Redis already outlives the process
+session_journal = SessionJournal(
+    InterviewConfig.SESSION_JOURNAL_PATH,
+    flush_interval=InterviewConfig.SESSION_JOURNAL_FLUSH_INTERVAL,
+    compact_every=InterviewConfig.SESSION_JOURNAL_COMPACT_EVERY,
+    snapshot_source=session_store.iter_sessions
+) if InterviewConfig.SESSION_JOURNAL_PATH and not InterviewConfig.SESSION_STORE_URL else None
 
-def select_interview_questions():
-    """Randomly select 5 MCQ and 5 general questions for the interview"""
-    selected_mcq = random.sample(MCQ_QUESTIONS, 5)
-    selected_general = random.sample(GENERAL_QUESTIONS, 5)
+# Completed interviews, kept past the store's TTL and MAX_SESSIONS for report exports
+completed_archive = CompletedSessionArchive(InterviewConfig.COMPLETED_SESSIONS_PATH) \
+    if InterviewConfig.COMPLETED_SESSIONS_PATH else None
+
+def completed_sessions() -> Iterator[SessionRecord]:
+    """Every archived interview; without an archive, only the completed sessions the store still holds"""
+    if completed_archive is not None:
+        return completed_archive.iter_sessions()
+    return (session for session in session_store.iter_sessions() if session.end_time is not None)
+
+# Population of completed interviews: a histogram for each report's percentile rank,
+# and columnar per-response scores (built on first use) for cohort analytics.
+# Both start from completed_sessions(), then add this worker's completions.
+score_histogram = ScoreHistogram()
+cohort_log = None
+cohort_log_builds = SingleFlight()
+
+def record_completion(session: SessionRecord) -> None:
+    score_histogram.add(average_scores(session.aggregate)["overall_score"])
+    if cohort_log is not None:
+        cohort_log.add_session(session)
+
+async def seed_score_histogram() -> None:
+    # Interviews completed from here on reach the histogram through record_completion
+    started = time.time()
+    
+    def read() -> ScoreHistogram:
+        seeded = ScoreHistogram()
+        for session in completed_sessions():
+            if session.end_time < started:
+                seeded.add(average_scores(session.aggregate)["overall_score"])
+        return seeded
     
-    # Combine questions: MCQs first, then general questions
-    return selected_mcq + selected_general
+    try:
+        # Built apart and merged on the event loop, so completions meanwhile are not raced
+        score_histogram.merge(await run_in_threadpool(read))
+    except Exception as e:
+        print(f"Error seeding percentile ranks from completed interviews: {e}")
+
+def build_cohort_log():
+    # NumPy is only imported once analytics are asked for
+    from app.analytics import CohortLog
+    return CohortLog.from_sessions(question_bank, completed_sessions())
+
+async def get_cohort_log():
+    """The cohort log, read from completed_sessions() in a thread on first use; concurrent callers share one build"""
+    global cohort_log
+    if cohort_log is None:
+        built = await cohort_log_builds.run("cohort", lambda: run_in_threadpool(build_cohort_log))
+        if cohort_log is None:
+            cohort_log = built
+    return cohort_log
+
+# Per-session callbacks told about each deferred evaluation once it is stored (WebSocket pushes)
+evaluation_listeners: Dict[str, List[Callable[[SessionRecord, int], None]]] = {}
+
+def store_deferred_evaluation(session_id: str, response_index: int, evaluation: Dict) -> None:
+    # Compare-and-set, so neither this nor an answer another worker records meanwhile is lost
+    session = session_store.update(session_id, lambda session: store_evaluation(session, response_index, evaluation))
+    if not session:
+        return
+    for listener in evaluation_listeners.get(session_id, ()):
+        listener(session, response_index)
+
+def store_evaluation(session: SessionRecord, response_index: int, evaluation: Dict) -> bool:
+    """Attach an evaluation to a stored response and fold its score into the running aggregate.
+    
+    Returns False, changing nothing, if the response was already evaluated: a
+    worker finishing the interview may have batch-scored an answer another
+    worker still had queued, and the score must only count once.
+    """
+    stored = session.responses[response_index]
+    if stored.status == COMPLETED:
+        return False
+    stored.complete(evaluation)
+    question = session_question(session, response_index)
+    add_score(session.aggregate, question["question_type"], question["category"], stored.score)
+    if session_journal is not None:
+        session_journal.evaluation_stored(session, response_index, question["question_type"], question["category"])
+    return True
+
+# Double clicks and client retries of one question share a single in-flight submission,
+# and answers to a session are recorded one at a time
+submissions = SingleFlight()
+session_locks = KeyedLocks()
+
+# Background worker pool for deferred open-ended evaluations
+evaluation_queue = EvaluationQueue(
+    max_workers=LLMConfig.MAX_CONCURRENT_EVALUATIONS,
+    store_result=store_deferred_evaluation
+)
+
+# Time limits: an answer deadline and an interview deadline per open session, checked in the background
+ANSWER_DEADLINE = "answer"
+INTERVIEW_DEADLINE = "interview"
+deadlines = DeadlineScheduler()
+deadline_tasks = set()
+
+def cache_stat(name: str) -> int:
+    service = app.state.llm_service
+    return getattr(service.cache, name) if service is not None else 0
+
+# Read at scrape time so they always reflect the live store, queue and cache
+metrics.registry.register(Gauge(
+    "session_store_size", "Sessions currently held by the session store", callback=lambda: len(session_store)
+))
+metrics.registry.register(Gauge(
+    "evaluation_queue_pending", "Deferred evaluations queued or running", callback=lambda: len(evaluation_queue)
+))
+metrics.registry.register(Gauge(
+    "interview_deadlines_scheduled", "Answer and interview deadlines waiting to expire", callback=lambda: len(deadlines)
+))
+metrics.registry.register(Counter(
+    "reference_answers_generated_total", "Reference answers written by the model for questions without one",
+    callback=lambda: reference_answers.generated
+))
+metrics.registry.register(Counter(
+    "evaluation_cache_hits_total", "Evaluations served from the cache", callback=lambda: cache_stat("hits")
+))
+metrics.registry.register(Counter(
+    "evaluation_cache_misses_total", "Evaluations that needed an LLM call", callback=lambda: cache_stat("misses")
+))
+
+def select_interview_questions() -> List[str]:
+    """Pick question ids per InterviewConfig.QUESTION_MIX (5 MCQ, then 5 general by default)"""
+    return question_bank.select(InterviewConfig.QUESTION_MIX)
+
+def session_question(session: SessionRecord, index: int):
+    return question_bank.get(session.question_ids[index])
 
 @app.get("/")
 async def root():
     return {"message": "Excel Mock Interviewer API is running"}
 
+@app.get("/health/ready")
+async def readiness():
+    if not app.state.llm_ready:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": "LLM service is not ready"})
+    return {"status": "ready"}
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/export/reports")
+async def export_reports(format: str = "csv", since: Optional[str] = None, until: Optional[str] = None,
+                         min_score: Optional[float] = None, max_score: Optional[float] = None,
+                         x_api_key: Optional[str] = Header(None)):
+    """Stream every completed interview's report, filtered by completion time and overall score"""
+    require_admin_key(x_api_key)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs the 'pyarrow' package")
+    try:
+        since_bound = parse_date_bound(since) if since else None
+        until_bound = parse_date_bound(until, end_of_day=True) if until else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since and until must be ISO dates or date-times")
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    reports = completed_reports(
+        completed_sessions(), generate_final_report,
+        since=since_bound, until=until_bound, min_score=min_score, max_score=max_score
+    )
+    filename = f"interview-reports-{datetime.now():%Y%m%d-%H%M%S}.{extension}"
+    return StreamingResponse(
+        stream_export(reports, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/analytics/cohort")
+async def cohort_analytics(x_api_key: Optional[str] = Header(None)):
+    """Question difficulty and discrimination, category means and score percentiles over completed interviews"""
+    require_admin_key(x_api_key)
+    cohort = await get_cohort_log()
+    # add_session fills its rows before publishing the new counts, so stats() can run beside it
+    return await run_in_threadpool(cohort.stats)
+
+def require_admin_key(x_api_key: Optional[str]) -> None:
+    if InterviewConfig.ADMIN_API_KEY and not secrets.compare_digest(x_api_key or "", InterviewConfig.ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+def get_llm_service() -> GeminiService:
+    if app.state.llm_service is None:
+        raise RuntimeError("LLM service is not initialized")
+    return app.state.llm_service
+
 @app.post("/api/interview/start")
 async def start_interview(request: StartInterviewRequest):
     session_id = str(uuid.uuid4())
-    selected_questions = select_interview_questions()
+    question_ids = select_interview_questions()
     
-    session = {
-        "session_id": session_id,
-        "user_name": request.user_name,
-        "current_question_index": 0,
-        "responses": [],
-        "start_time": datetime.now(),
-        "end_time": None,
-        "selected_questions": selected_questions
-    }
-    sessions[session_id] = session
+    session = SessionRecord(session_id, request.user_name, question_ids)
+    session_store.save(session)
+    if session_journal is not None:
+        session_journal.session_started(session)
+    metrics.active_sessions.inc()
+    schedule_deadlines(session)
     
     # Get first question
-    first_question = selected_questions[0]
+    first_question = question_bank.get(question_ids[0])
     
     response = {
         "session_id": session_id,
@@ -278,120 +364,732 @@ async def start_interview(request: StartInterviewRequest):
 
 @app.post("/api/interview/submit-answer")
 async def submit_answer(response: UserResponse):
-    session = sessions.get(response.session_id)
+    session = session_store.get(response.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    current_q = session["selected_questions"][session["current_question_index"]]
+    number = submission_number(session, response.question_number)
+    key = (response.session_id, number)
+    if key not in submissions and number <= session.current_question_index:
+        # A retry of an answered question gets the stored result, without another evaluation
+        payload = await stored_answer(response.session_id, number)
+    else:
+        # Duplicates that arrive while the first is still running share its result
+        payload = await submissions.run(key, lambda: answer_question(session, number, response))
+    # Returned as a response so FastAPI skips jsonable_encoder; orjson serializes the datetimes itself
+    return ORJSONResponse(submit_result(payload, response))
+
+def submit_result(payload: Dict, response: UserResponse) -> Dict:
+    """The submit-answer payload as the client asked for it: with a slim report if requested"""
+    if not response.slim_report or payload["status"] != "completed":
+        return payload
+    # The payload may be shared with duplicate submissions, so it is copied rather than changed
+    report = {name: value for name, value in payload["report"].items() if name != "detailed_feedback"}
+    report["detailed_feedback_count"] = len(payload["report"]["detailed_feedback"])
+    report["details_url"] = f"/api/interview/{response.session_id}/report/details"
+    return dict(payload, report=report)
+
+async def answer_question(session: SessionRecord, number: int, response: UserResponse) -> Dict:
+    current_q = session_question(session, number - 1)
     
     # Handle MCQ vs General question evaluation differently
     if current_q["question_type"] == "mcq":
-        # Simple evaluation for MCQ
-        is_correct = response.answer.upper().strip() == current_q["correct_answer"]
-        evaluation = {
-            "score": 10 if is_correct else 0,
-            "feedback": f"{'Correct!' if is_correct else f'Incorrect. The correct answer is {current_q['correct_answer']}'}",
-            "correct_answer": current_q["correct_answer"],
-            "is_correct": is_correct
-        }
+        evaluation = evaluate_mcq_answer(current_q, response.answer)
     else:
-        # Use LLM for general questions
+        evaluation = pre_score_answer(current_q, response.answer)
+        if evaluation is None and not response.defer_evaluation:
+            # Use LLM for substantive general answers; deferred ones are queued by record_answer
+            evaluation = await evaluate_general_answer(current_q, response.answer)
+    
+    return await record_answer(session.session_id, number, current_q, response.answer, evaluation)
+
+@app.post("/api/interview/submit-answer/stream")
+async def submit_answer_stream(response: UserResponse):
+    """Server-Sent Events variant of submit-answer.
+    
+    Open-ended evaluations are streamed as `field` events ({"name", "value"})
+    as each top-level field of the model output completes, so score and
+    feedback arrive before the suggestions. Those are provisional: an
+    `evaluation` event then carries the validated evaluation, which replaces
+    every streamed field. A final `result` event carries the same payload
+    submit-answer would have returned, with the question's reference answer.
+    Duplicate submissions only get the `result` event.
+    """
+    session = session_store.get(response.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    number = submission_number(session, response.question_number)
+    key = (response.session_id, number)
+    current_q = session_question(session, number - 1)
+    
+    async def events():
+        if key not in submissions and number <= session.current_question_index:
+            yield format_sse("result", submit_result(await stored_answer(response.session_id, number), response))
+            return
+        # Claimed here rather than in the handler so a client that never reads the stream cannot leave it held
+        future, owner = submissions.claim(key)
+        if not owner:
+            yield format_sse("result", submit_result(await asyncio.shield(future), response))
+            return
         try:
-            from app.llm_service import llm_service
+            if current_q["question_type"] == "mcq":
+                evaluation = evaluate_mcq_answer(current_q, response.answer)
+            else:
+                evaluation = pre_score_answer(current_q, response.answer)
+            if evaluation is None:
+                try:
+                    llm_service = get_llm_service()
+                    # Written alongside the stream the first time the question needs one
+                    reference = asyncio.create_task(ensure_reference_answer(llm_service, current_q))
+                    
+                    async for kind, payload in llm_service.stream_evaluation(
+                        question=current_q["question"],
+                        answer=response.answer,
+                        criteria=current_q["evaluation_criteria"],
+                        question_id=current_q["id"]
+                    ):
+                        if kind == "field":
+                            name, value = payload
+                            yield format_sse("field", {"name": name, "value": value})
+                        else:
+                            evaluation = payload
+                    await reference
+                except Exception as e:
+                    print(f"Error with LLM service: {e}")
+                if evaluation is None:
+                    evaluation = fallback_evaluation()
+                # Validation may have repaired the streamed fields or replaced them with a fallback
+                yield format_sse("evaluation", evaluation)
             
-            evaluation = llm_service.evaluate_answer(
-                question=current_q["question"],
-                answer=response.answer,
-                criteria=current_q["evaluation_criteria"]
-            )
-        except Exception as e:
-            print(f"Error with LLM service: {e}")
-            evaluation = {
-                "score": 5,
-                "feedback": "Thank you for your answer. The system is currently unable to provide detailed feedback.",
-                "strengths": ["Provided an answer"],
-                "improvements": ["Unable to assess at this time"],
-                "correct_concepts": [],
-                "missing_concepts": []
-            }
-    
-    # Store response
-    session["responses"].append({
-        "question": current_q["question"],
-        "question_type": current_q["question_type"],
-        "answer": response.answer,
-        "evaluation": evaluation,
-        "timestamp": datetime.now()
-    })
+            result = await record_answer(response.session_id, number, current_q, response.answer, evaluation)
+        except BaseException as e:
+            submissions.settle(key, error=e)
+            raise
+        submissions.settle(key, result)
+        yield format_sse("result", submit_result(result, response))
     
-    # Move to next question
-    session["current_question_index"] += 1
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def submission_number(session: SessionRecord, question_number: Optional[int]) -> int:
+    """The question (1-based) a submission answers; only answered questions and the current one are open"""
+    total = len(session.question_ids)
+    if question_number is None:
+        # Untagged submissions answer the current question, or retry the last one once the interview is over
+        return min(session.current_question_index + 1, total)
+    if not 1 <= question_number <= min(session.current_question_index + 1, total):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Question {question_number} is not open; the interview is at question "
+                   f"{min(session.current_question_index + 1, total)} of {total}"
+        )
+    return question_number
+
+async def stored_answer(session_id: str, number: int) -> Dict:
+    """The submit-answer payload for an already answered question, rebuilt from the session"""
+    async with session_locks(session_id):
+        session = session_store.get(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if session.is_complete and session.end_time is None:
+            # The process stopped while finishing the interview (e.g. restored from the journal)
+            session = await complete_interview(session)
+        return answer_payload(session, number - 1)
+
+@app.websocket("/ws/interview/{session_id}")
+async def interview_socket(websocket: WebSocket, session_id: str):
+    """The submit-answer state machine over one connection per interview.
     
-    if session["current_question_index"] >= len(session["selected_questions"]):
-        # Interview complete
-        session["end_time"] = datetime.now()
-        report = generate_final_report(session)
-        return {
-            "status": "completed",
-            "report": report
-        }
+    On connect the server sends a `session` message and the current
+    `question`. The client sends {"type": "answer", "answer", "question_number"}
+    and gets the next `question` straight back; open-ended answers are
+    evaluated in the background and their `evaluation` is pushed when ready.
+    The final answer is followed by `completed` with the report, then the
+    server closes. Problems come back as `error` messages with an HTTP-style
+    status. Duplicate and repeated answers behave as they do over HTTP.
+    """
+    await websocket.accept()
+    session = session_store.get(session_id)
+    if not session:
+        await websocket.send_text(socket_message({"type": "error", "status": 404, "detail": "Session not found"}))
+        await websocket.close(code=4404)
+        return
+    
+    outbox: asyncio.Queue = asyncio.Queue()
+    # Responses whose evaluation this connection has sent, so none goes out twice
+    sent_evaluations = set()
+    
+    def push_evaluation(stored: SessionRecord, index: int) -> None:
+        sent_evaluations.add(index)
+        outbox.put_nowait(evaluation_message(stored, index))
+    
+    listeners = evaluation_listeners.setdefault(session_id, [])
+    listeners.append(push_evaluation)
+    sender = asyncio.create_task(send_socket_messages(websocket, outbox))
+    try:
+        outbox.put_nowait({
+            "type": "session",
+            "session_id": session_id,
+            "total_questions": len(session.question_ids),
+            "answered": session.current_question_index
+        })
+        if session.is_complete:
+            # Reconnected after the last answer: just the report
+            payload = await stored_answer(session_id, len(session.question_ids))
+            replies = [{"type": "completed", "report": payload["report"]}, None]
+        else:
+            replies = [question_message(session, session.current_question_index)]
+        
+        while True:
+            for reply in replies:
+                outbox.put_nowait(reply)
+            if replies[-1] is None:
+                # The report is queued; the sender closes the connection after it
+                await sender
+                return
+            try:
+                message = json.loads(await websocket.receive_text())
+                if not isinstance(message, dict) or message.get("type") != "answer" \
+                        or not isinstance(message.get("answer"), str):
+                    raise HTTPException(status_code=400, detail='Expected {"type": "answer", "answer": ...}')
+                question_number = message.get("question_number")
+                if question_number is not None and type(question_number) is not int:  # bool is an int too
+                    raise HTTPException(status_code=400, detail="question_number must be an integer")
+                replies = await socket_answer(session_id, message, sent_evaluations)
+            except HTTPException as e:
+                replies = [{"type": "error", "status": e.status_code, "detail": e.detail}]
+            except ValueError:
+                replies = [{"type": "error", "status": 400, "detail": "Messages must be JSON"}]
+    except WebSocketDisconnect:
+        pass
+    finally:
+        listeners.remove(push_evaluation)
+        if not listeners:
+            evaluation_listeners.pop(session_id, None)
+        if not sender.done():
+            sender.cancel()
+
+async def socket_answer(session_id: str, message: Dict, sent_evaluations: Set[int]) -> List[Dict]:
+    """Record one answer received over the WebSocket; returns the replies.
+    
+    The answer's evaluation is included if it is ready and not already in `sent_evaluations`.
+    """
+    session = session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    number = submission_number(session, message.get("question_number"))
+    key = (session_id, number)
+    if key not in submissions and number <= session.current_question_index:
+        payload = await stored_answer(session_id, number)
     else:
-        # Get next question
-        next_question = session["selected_questions"][session["current_question_index"]]
-        response_data = {
-            "status": "continue",
-            "feedback": evaluation.get("feedback", "Thank you for your answer."),
-            "score": evaluation.get("score", 5),
-            "next_question": next_question["question"],
-            "question_number": session["current_question_index"] + 1,
-            "total_questions": 10,
-            "question_type": next_question["question_type"]
-        }
+        # Open-ended evaluations never hold up the next question; they are pushed when stored
+        submission = UserResponse(session_id=session_id, answer=message["answer"], defer_evaluation=True)
+        payload = await submissions.run(key, lambda: answer_question(session, number, submission))
+    
+    if payload["status"] == "completed":
+        # Sending None closes the connection once the report is out
+        return [{"type": "completed", "report": payload["report"]}, None]
+    session = session_store.get(session_id)
+    replies = []
+    if session.responses[number - 1].blob is not None and number - 1 not in sent_evaluations:
+        sent_evaluations.add(number - 1)
+        replies.append(evaluation_message(session, number - 1))
+    replies.append(question_message(session, number))
+    return replies
+
+async def send_socket_messages(websocket: WebSocket, outbox: asyncio.Queue) -> None:
+    while True:
+        message = await outbox.get()
+        if message is None:
+            await websocket.close()
+            return
+        await websocket.send_text(socket_message(message))
+
+def socket_message(message: Dict) -> str:
+    return orjson.dumps(message, default=str).decode()
+
+def question_message(session: SessionRecord, index: int) -> Dict:
+    question = session_question(session, index)
+    message = {
+        "type": "question",
+        "question_number": index + 1,
+        "question": question["question"],
+        "question_type": question["question_type"]
+    }
+    if question["question_type"] == "mcq":
+        message["options"] = question["options"]
+    return message
+
+def evaluation_message(session: SessionRecord, index: int) -> Dict:
+    message = {"type": "evaluation", "question_number": index + 1}
+    message.update(feedback_fields(session_question(session, index), session.responses[index].evaluation))
+    return message
+
+def format_sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data, default=str).decode()}\n\n"
+
+def evaluate_mcq_answer(question: Dict, answer: str) -> Dict:
+    # Simple evaluation for MCQ
+    is_correct = answer.upper().strip() == question["correct_answer"]
+    return {
+        "score": 10 if is_correct else 0,
+        "feedback": "Correct!" if is_correct else f"Incorrect. The correct answer is {question['correct_answer']}",
+        "correct_answer": question["correct_answer"],
+        "is_correct": is_correct
+    }
+
+def pre_score_answer(question: Dict, answer: str) -> Optional[Dict]:
+    """Local evaluation for a trivial open-ended answer, or None if it needs the LLM"""
+    if pre_scorer is None:
+        return None
+    pre_score = pre_scorer.assess(question, answer)
+    if not pre_score.is_local:
+        return None
+    metrics.llm_calls_saved.inc(reason=pre_score.reason)
+    return pre_scorer.local_evaluation(question, pre_score)
+
+async def record_answer(session_id: str, number: int, current_q: Dict, answer: str, evaluation: Optional[Dict]) -> Dict:
+    """Store the answer to question `number`, advance the session and build the submit-answer payload.
+    
+    `evaluation` is None for a deferred open-ended answer. Answers to one
+    session are recorded one at a time, against a freshly loaded session.
+    """
+    async with session_locks(session_id):
+        recorded = []
         
-        # Add options if next question is MCQ
-        if next_question["question_type"] == "mcq":
-            response_data["options"] = next_question["options"]
+        def record(session: SessionRecord) -> bool:
+            recorded.clear()
+            if session.current_question_index >= number:
+                # Recorded meanwhile by another worker sharing the store
+                return False
+            # Store response and move to next question
+            session.responses.append(ResponseRecord(answer, time.time()))
+            session.current_question_index += 1
+            if session_journal is not None:
+                session_journal.answer_recorded(session, len(session.responses) - 1)
+            if evaluation is not None:
+                store_evaluation(session, len(session.responses) - 1, evaluation)
+            recorded.append(number)
+            return True
         
-        # Add additional feedback for general questions
-        if current_q["question_type"] == "general":
-            response_data["suggestions"] = evaluation.get("suggestions", [])
-            response_data["correct_answer"] = evaluation.get("correct_answer", "")
+        # Compare-and-set, so a deferred evaluation another worker stores meanwhile is not overwritten
+        session = session_store.update(session_id, record)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if not recorded:
+            return answer_payload(session, number - 1)
         
+        if evaluation is None and InterviewConfig.DEFERRED_EVALUATION_MODE == "queue":
+            evaluation_queue.submit(
+                session.session_id,
+                len(session.responses) - 1,
+                lambda: evaluate_general_answer(current_q, answer)
+            )
+        
+        if session.is_complete:
+            session = await complete_interview(session)
+        else:
+            schedule_deadlines(session)
+        return answer_payload(session, number - 1)
+
+async def complete_interview(session: SessionRecord) -> SessionRecord:
+    """Fold in any evaluations still running, score what is pending and close the session"""
+    if evaluation_queue.pending_count(session.session_id):
+        await evaluation_queue.wait_for_session(session.session_id)
+        session = session_store.get(session.session_id)
+    session = await evaluate_pending_batch(session)
+    
+    closed = []
+    
+    def close(session: SessionRecord) -> bool:
+        closed.clear()
+        if session.end_time is not None:
+            return False
+        session.end_time = time.time()
+        if session_journal is not None:
+            session_journal.session_completed(session)
+        closed.append(True)
+        return True
+    
+    # Compare-and-set, so an evaluation another worker stores meanwhile is kept
+    session = session_store.update(session.session_id, close) or session
+    if not closed:
+        # Completed by another worker sharing the store, which has done the rest
+        return session
+    if completed_archive is not None:
+        completed_archive.append(session)
+    metrics.active_sessions.dec()
+    cancel_deadlines(session.session_id)
+    record_completion(session)
+    return session
+
+def schedule_deadlines(session: SessionRecord) -> None:
+    """(Re)arm the session's time limits: the current question's, and the whole interview's"""
+    if not InterviewConfig.ENFORCE_TIME_LIMITS:
+        return
+    deadlines.schedule((session.session_id, ANSWER_DEADLINE), answer_deadline(session))
+    if (session.session_id, INTERVIEW_DEADLINE) not in deadlines:
+        deadlines.schedule((session.session_id, INTERVIEW_DEADLINE), interview_deadline(session))
+
+def cancel_deadlines(session_id: str) -> None:
+    deadlines.cancel((session_id, ANSWER_DEADLINE))
+    deadlines.cancel((session_id, INTERVIEW_DEADLINE))
+
+def answer_deadline(session: SessionRecord) -> float:
+    # The current question is sent with the previous answer's result, so its time includes reading that feedback
+    return last_activity(session) + InterviewConfig.MAX_ANSWER_TIME + InterviewConfig.TIME_LIMIT_GRACE
+
+def interview_deadline(session: SessionRecord) -> float:
+    return session.start_time + InterviewConfig.TOTAL_INTERVIEW_TIME + InterviewConfig.TIME_LIMIT_GRACE
+
+async def sweep_deadlines() -> None:
+    """Background loop handing each expired deadline to its handler"""
+    handlers = {ANSWER_DEADLINE: answer_time_expired, INTERVIEW_DEADLINE: interview_time_expired}
+    while True:
+        await asyncio.sleep(InterviewConfig.DEADLINE_SWEEP_INTERVAL)
+        for session_id, kind in deadlines.pop_due(time.time()):
+            # Each in its own task: finishing an interview may wait on its evaluations
+            task = asyncio.create_task(handle_deadline(handlers[kind], session_id))
+            deadline_tasks.add(task)
+            task.add_done_callback(deadline_tasks.discard)
+
+async def handle_deadline(handler: Callable, session_id: str) -> None:
+    try:
+        await handler(session_id)
+    except Exception as e:
+        print(f"Error enforcing time limit for session {session_id}: {e}")
+
+async def answer_time_expired(session_id: str) -> None:
+    """Score the unanswered current question 0 and move on, or drop the session if the candidate has left"""
+    session = session_store.get(session_id)
+    if not session or session.end_time is not None:
+        return
+    if session.is_complete:
+        # Stopped while finishing the interview; complete it now
+        await stored_answer(session_id, len(session.question_ids))
+        return
+    due = answer_deadline(session)
+    if due > time.time():
+        # Answered through another worker sharing the store since this was scheduled
+        deadlines.schedule((session_id, ANSWER_DEADLINE), due)
+        return
+    if 0 < InterviewConfig.ABANDON_AFTER_TIMEOUTS <= timed_out_in_a_row(session) + 1:
+        await expire_session(session_id, session.current_question_index + 1)
+        return
+    await time_out_question(session_id, session.current_question_index + 1)
+
+async def interview_time_expired(session_id: str) -> None:
+    """Finish the interview: every question still open is scored 0 and the report is built from the rest"""
+    session = session_store.get(session_id)
+    if not session or session.end_time is not None:
+        return
+    for number in range(session.current_question_index + 1, len(session.question_ids) + 1):
+        await time_out_question(session_id, number)
+    # Completes a session that stopped while finishing, and waits for one that is finishing now
+    await stored_answer(session_id, len(session.question_ids))
+    metrics.interview_deadlines.inc(outcome="interview_finished")
+
+async def time_out_question(session_id: str, number: int) -> None:
+    session = session_store.get(session_id)
+    if not session:
+        return
+    current_q = session_question(session, number - 1)
+    
+    async def record_timeout() -> Dict:
+        payload = await record_answer(session_id, number, current_q, "", timed_out_evaluation(current_q))
+        # Counted only if the placeholder was recorded, not an answer that got there first
+        stored = session_store.get(session_id)
+        evaluation = stored.responses[number - 1].evaluation if stored else None
+        if evaluation is not None and evaluation.get("timed_out"):
+            metrics.interview_deadlines.inc(outcome="question_timed_out")
+        return payload
+    
+    # An answer submitted just in time is still in flight under this key, and wins
+    await submissions.run((session_id, number), record_timeout)
+
+def timed_out_evaluation(question: Dict) -> Dict:
+    evaluation = {
+        "score": 0,
+        "feedback": "Time ran out before an answer was submitted.",
+        "timed_out": True
+    }
+    if question["question_type"] == "mcq":
+        evaluation["correct_answer"] = question["correct_answer"]
+        evaluation["is_correct"] = False
+    return evaluation
+
+def timed_out_in_a_row(session: SessionRecord) -> int:
+    count = 0
+    for stored in reversed(session.responses):
+        evaluation = stored.evaluation
+        if evaluation is None or not evaluation.get("timed_out"):
+            break
+        count += 1
+    return count
+
+async def expire_session(session_id: str, number: int) -> None:
+    """Drop an abandoned interview along with the evaluations nobody will read.
+    
+    Left alone if question `number` was answered meanwhile, or an answer to it
+    is still being processed; recording that answer re-arms the deadlines.
+    """
+    async with session_locks(session_id):
+        session = session_store.get(session_id)
+        if not session or session.end_time is not None or session.current_question_index + 1 != number \
+                or (session_id, number) in submissions:
+            return
+        cancelled = evaluation_queue.cancel_session(session_id)
+        if cancelled:
+            metrics.evaluations_cancelled.inc(cancelled)
+        cancel_deadlines(session_id)
+        session_store.delete(session_id)
+        if session_journal is not None:
+            session_journal.session_expired(session_id)
+    metrics.active_sessions.dec()
+    metrics.interview_deadlines.inc(outcome="session_expired")
+
+def answer_payload(session: SessionRecord, index: int) -> Dict:
+    """The submit-answer response for the answer at `index`: the next question and its feedback, or the report"""
+    if index + 1 >= len(session.question_ids):
+        return {
+            "status": "completed",
+            "report": generate_final_report(session)
+        }
+    
+    # Get next question
+    next_question = session_question(session, index + 1)
+    response_data = {
+        "status": "continue",
+        "next_question": next_question["question"],
+        "question_number": index + 2,
+        "total_questions": 10,
+        "question_type": next_question["question_type"]
+    }
+    
+    # Add options if next question is MCQ
+    if next_question["question_type"] == "mcq":
+        response_data["options"] = next_question["options"]
+    
+    evaluation = session.responses[index].evaluation
+    if evaluation is None:
+        # Feedback is fetched later from the evaluations endpoint
+        response_data["evaluation_status"] = "pending"
+        response_data["evaluated_question_number"] = index + 1
+        response_data["feedback"] = "Your answer has been recorded. Feedback will be available shortly."
         return response_data
+    
+    response_data.update(feedback_fields(session_question(session, index), evaluation))
+    return response_data
+
+def feedback_fields(question: Dict, evaluation: Dict) -> Dict:
+    fields = {
+        "feedback": evaluation.get("feedback", "Thank you for your answer."),
+        "score": evaluation.get("score", 5)
+    }
+    
+    # Add additional feedback for general questions
+    if question["question_type"] == "general":
+        fields["suggestions"] = evaluation.get("suggestions", [])
+        fields["correct_answer"] = reference_answers.get(question) or evaluation.get("correct_answer", "")
+    
+    return fields
+
+@app.get("/api/interview/{session_id}/evaluations")
+async def get_evaluations(session_id: str, question_number: Optional[int] = None):
+    session = session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    evaluations = []
+    for index, stored in enumerate(session.responses):
+        if question_number is not None and index + 1 != question_number:
+            continue
+        evaluations.append({
+            "question_number": index + 1,
+            "question_type": session_question(session, index)["question_type"],
+            "status": STATUS_NAMES[stored.status],
+            "evaluation": with_reference_answer(session_question(session, index), stored.evaluation)
+        })
+    
+    return {
+        "session_id": session_id,
+        "pending": evaluation_queue.pending_count(session_id),
+        "evaluations": evaluations
+    }
+
+@app.get("/api/interview/{session_id}/report/details")
+async def get_report_details(
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(InterviewConfig.REPORT_DETAILS_PAGE_SIZE, ge=1, le=InterviewConfig.REPORT_DETAILS_MAX_PAGE_SIZE)
+):
+    """A page of the report's detailed_feedback, for clients that asked for a slim report"""
+    session = session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    total = len(session.responses)
+    end = min(offset + limit, total)
+    return ORJSONResponse({
+        "session_id": session_id,
+        "total": total,
+        "offset": offset,
+        "next_offset": end if end < total else None,
+        "detailed_feedback": [
+            dict(response_detail(session, i), question_number=i + 1) for i in range(offset, end)
+        ]
+    })
+
+@app.get("/api/interview/{session_id}/progress")
+async def get_progress(session_id: str):
+    session = session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    aggregate = session.aggregate
+    scores = average_scores(aggregate)
+    answered = session.current_question_index
+    return {
+        "session_id": session_id,
+        "answered": answered,
+        "total_questions": len(session.question_ids),
+        "scored": scored_count(aggregate),
+        "pending_evaluations": answered - scored_count(aggregate),
+        "mcq_score": round(scores["mcq_score"], 1),
+        "general_score": round(scores["general_score"], 1),
+        "overall_score": round(scores["overall_score"], 1),
+        "performance_level": get_performance_level(scores["overall_score"])
+    }
 
-def generate_final_report(session: Dict) -> Dict:
-    responses = session["responses"]
+async def evaluate_general_answer(question: Dict, answer: str) -> Dict:
+    """Score an open-ended answer with the LLM, falling back to a neutral evaluation"""
+    try:
+        llm_service = get_llm_service()
+        
+        evaluation, _ = await asyncio.gather(
+            llm_service.evaluate_answer_async(
+                question=question["question"],
+                answer=answer,
+                criteria=question["evaluation_criteria"],
+                question_id=question["id"]
+            ),
+            ensure_reference_answer(llm_service, question)
+        )
+        return evaluation
+    except Exception as e:
+        print(f"Error with LLM service: {e}")
+        return fallback_evaluation()
+
+async def ensure_reference_answer(llm_service: GeminiService, question: Dict) -> str:
+    """The question's reference answer, written by the model the first time it is needed; "" if that fails"""
+    try:
+        return await reference_answers.fill(
+            question,
+            lambda: llm_service.generate_reference_answer_async(question["question"], question["evaluation_criteria"]),
+            model=llm_service.model_name
+        )
+    except Exception as e:
+        print(f"Error generating reference answer for {question['id']}: {e}")
+        return ""
+
+def with_reference_answer(question: Dict, evaluation: Optional[Dict]) -> Optional[Dict]:
+    """A stored open-ended evaluation with the question's reference answer as its correct_answer"""
+    if evaluation is None or question["question_type"] != "general":
+        return evaluation
+    reference = reference_answers.get(question)
+    if reference:
+        evaluation["correct_answer"] = reference
+    return evaluation
+
+async def evaluate_pending_batch(session: SessionRecord) -> SessionRecord:
+    """Score every still-pending open-ended answer of the session with batched LLM calls; returns it as stored"""
+    pending = [i for i, r in enumerate(session.responses) if r.status == PENDING]
+    if not pending:
+        return session
     
-    # Separate MCQ and general question scores
-    mcq_responses = [r for r in responses if r["question_type"] == "mcq"]
-    general_responses = [r for r in responses if r["question_type"] == "general"]
+    # Response i answers question i
+    questions = [session_question(session, i) for i in pending]
+    items = [
+        {
+            "question": question["question"],
+            "answer": session.responses[i].answer,
+            "criteria": question["evaluation_criteria"],
+            "question_id": question["id"]
+        }
+        for i, question in zip(pending, questions)
+    ]
+    try:
+        llm_service = get_llm_service()
+        
+        evaluations, *_ = await asyncio.gather(
+            llm_service.evaluate_answers_batch_async(items),
+            *(ensure_reference_answer(llm_service, question) for question in {q["id"]: q for q in questions}.values())
+        )
+    except Exception as e:
+        print(f"Error with LLM service: {e}")
+        evaluations = [fallback_evaluation() for _ in pending]
     
-    # Calculate scores
-    mcq_score = sum(r["evaluation"].get("score", 0) for r in mcq_responses) / len(mcq_responses) if mcq_responses else 0
-    general_score = sum(r["evaluation"].get("score", 0) for r in general_responses) / len(general_responses) if general_responses else 0
+    def store_all(session: SessionRecord) -> bool:
+        # Answers another worker evaluated meanwhile keep that evaluation
+        stored = [store_evaluation(session, i, evaluation) for i, evaluation in zip(pending, evaluations)]
+        return any(stored)
     
-    # Overall score (weighted average)
-    overall_score = (mcq_score + general_score) / 2 if responses else 0
+    return session_store.update(session.session_id, store_all) or session
+
+def fallback_evaluation() -> Dict:
+    metrics.llm_fallbacks.inc(source="handler")
+    return {
+        "score": 5,
+        "feedback": "Thank you for your answer. The system is currently unable to provide detailed feedback.",
+        "strengths": ["Provided an answer"],
+        "improvements": ["Unable to assess at this time"],
+        "correct_concepts": [],
+        "missing_concepts": []
+    }
+
+def generate_final_report(session: SessionRecord) -> Dict:
+    aggregate = session.aggregate
+    scores = average_scores(aggregate)
     
     return {
-        "candidate_name": session["user_name"],
-        "interview_date": session["start_time"].isoformat(),
-        "duration_minutes": int((session["end_time"] - session["start_time"]).total_seconds() / 60) if session["end_time"] else 0,
-        "overall_score": round(overall_score, 1),
-        "mcq_score": round(mcq_score, 1),
-        "general_score": round(general_score, 1),
-        "performance_level": get_performance_level(overall_score),
-        "detailed_feedback": responses,
-        "recommendations": generate_recommendations(responses),
+        "candidate_name": session.user_name,
+        "interview_date": session.start_datetime.isoformat(),
+        "duration_minutes": int((session.end_time - session.start_time) / 60) if session.end_time else 0,
+        "overall_score": round(scores["overall_score"], 1),
+        "mcq_score": round(scores["mcq_score"], 1),
+        "general_score": round(scores["general_score"], 1),
+        "performance_level": get_performance_level(scores["overall_score"]),
+        "percentile_rank": score_histogram.percentile_rank(scores["overall_score"]),
+        "detailed_feedback": [response_detail(session, i) for i in range(len(session.responses))],
+        "recommendations": generate_recommendations(aggregate),
         "summary": {
-            "total_questions": len(responses),
-            "mcq_questions": len(mcq_responses),
-            "general_questions": len(general_responses),
-            "strengths": get_strengths(responses),
-            "areas_for_improvement": get_improvement_areas(responses)
+            "total_questions": scored_count(aggregate),
+            "mcq_questions": aggregate["mcq_count"],
+            "general_questions": aggregate["general_count"],
+            "strengths": get_strengths(aggregate),
+            "areas_for_improvement": get_improvement_areas(aggregate)
         }
     }
 
+def response_detail(session: SessionRecord, index: int) -> Dict:
+    """Expand a compact response into the report's per-question entry"""
+    stored = session.responses[index]
+    question = session_question(session, index)
+    return {
+        "question": question["question"],
+        "question_type": question["question_type"],
+        "category": question["category"],
+        "answer": stored.answer,
+        "evaluation": with_reference_answer(question, stored.evaluation),
+        "evaluation_status": STATUS_NAMES[stored.status],
+        "timestamp": datetime.fromtimestamp(stored.answered_at)
+    }
+
 def get_performance_level(score: float) -> str:
     if score >= 8.5:
         return "Expert"
@@ -402,54 +1100,34 @@ def get_performance_level(score: float) -> str:
     else:
         return "Beginner"
 
-def get_strengths(responses: List[Dict]) -> List[str]:
+def get_strengths(aggregate: Dict) -> List[str]:
     strengths = []
-    high_score_categories = {}
-    
-    for response in responses:
-        if response["evaluation"].get("score", 0) >= 7:
-            category = response.get("category", "general")
-            if category not in high_score_categories:
-                high_score_categories[category] = 0
-            high_score_categories[category] += 1
     
-    for category, count in high_score_categories.items():
+    for category, count in aggregate["high_by_category"].items():
         if count >= 1:
             strengths.append(f"Strong performance in {category.replace('_', ' ').title()}")
     
     return strengths[:3]  # Return top 3 strengths
 
-def get_improvement_areas(responses: List[Dict]) -> List[str]:
+def get_improvement_areas(aggregate: Dict) -> List[str]:
     areas = []
-    low_score_categories = {}
     
-    for response in responses:
-        if response["evaluation"].get("score", 0) < 5:
-            category = response.get("category", "general")
-            if category not in low_score_categories:
-                low_score_categories[category] = 0
-            low_score_categories[category] += 1
-    
-    for category, count in low_score_categories.items():
+    for category, count in aggregate["low_by_category"].items():
         if count >= 1:
             areas.append(f"Needs improvement in {category.replace('_', ' ').title()}")
     
     return areas[:3]  # Return top 3 areas for improvement
 
-def generate_recommendations(responses: List[Dict]) -> List[str]:
+def generate_recommendations(aggregate: Dict) -> List[str]:
     recommendations = []
     
-    if not responses:
+    if not scored_count(aggregate):
         return ["Complete the interview to receive recommendations"]
     
-    # Separate MCQ and general responses
-    mcq_responses = [r for r in responses if r["question_type"] == "mcq"]
-    general_responses = [r for r in responses if r["question_type"] == "general"]
-    
-    # Calculate average scores
-    mcq_avg = sum(r["evaluation"].get("score", 0) for r in mcq_responses) / len(mcq_responses) if mcq_responses else 0
-    general_avg = sum(r["evaluation"].get("score", 0) for r in general_responses) / len(general_responses) if general_responses else 0
-    overall_avg = (mcq_avg + general_avg) / 2
+    scores = average_scores(aggregate)
+    mcq_avg = scores["mcq_score"]
+    general_avg = scores["general_score"]
+    overall_avg = scores["overall_score"]
     
     # General recommendations based on overall performance
     if overall_avg < 5:
@@ -468,15 +1146,7 @@ def generate_recommendations(responses: List[Dict]) -> List[str]:
         recommendations.append("Practice explaining Excel concepts and solutions in real-world scenarios")
     
     # Category-specific recommendations
-    weak_categories = {}
-    for response in responses:
-        if response["evaluation"].get("score", 0) < 5:
-            category = response.get("category", "general")
-            if category not in weak_categories:
-                weak_categories[category] = 0
-            weak_categories[category] += 1
-    
-    for category, count in weak_categories.items():
+    for category, count in aggregate["low_by_category"].items():
         if count >= 2:
             readable_category = category.replace('_', ' ').title()
             recommendations.append(f"Dedicate extra study time to {readable_category}")
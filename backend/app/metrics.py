@@ -0,0 +1,243 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency buckets in seconds: handler work sits at the low end, LLM calls at the high end
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _ValueMetric(_Metric):
+    """One number per label set, or a single value read at scrape time from `callback`"""
+
+    def __init__(self, *args, callback: Optional[Callable[[], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        if self.callback is not None:
+            return [f"{self.name} {self.callback()}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Counter(_ValueMetric):
+    kind = "counter"
+
+
+class Gauge(_ValueMetric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = buckets
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to serve an HTTP request", labels=("method", "route", "status")
+))
+llm_call_duration = registry.register(Histogram(
+    "llm_call_duration_seconds", "Wall time of a single model API call", labels=("operation", "backend")
+))
+llm_errors = registry.register(Counter(
+    "llm_errors_total", "Model calls that raised or returned unusable output", labels=("operation", "backend", "error")
+))
+llm_output_parses = registry.register(Counter(
+    "llm_output_parse_total", "Model evaluations by parse outcome (valid, repaired, invalid)", labels=("operation", "outcome")
+))
+llm_hedges = registry.register(Counter(
+    "llm_hedged_requests_total", "Non-streaming model requests by hedging outcome", labels=("outcome",)
+))
+llm_fallbacks = registry.register(Counter(
+    "llm_fallback_evaluations_total", "Evaluations answered with a canned fallback score", labels=("source",)
+))
+llm_prompt_size = registry.register(Histogram(
+    "llm_prompt_size_tokens", "Estimated prompt tokens per model call", labels=("operation",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+))
+llm_prompt_tokens = registry.register(Counter(
+    "llm_prompt_tokens_total", "Prompt tokens sent to the model", labels=("operation",)
+))
+llm_completion_tokens = registry.register(Counter(
+    "llm_completion_tokens_total", "Completion tokens received from the model", labels=("operation",)
+))
+llm_calls_saved = registry.register(Counter(
+    "llm_calls_saved_total", "Evaluations that skipped the LLM: scored by the pre-scorer or coalesced with one in flight",
+    labels=("reason",)
+))
+active_sessions = registry.register(Gauge(
+    "interview_sessions_active", "Interviews started in this worker and not yet completed"
+))
+interview_deadlines = registry.register(Counter(
+    "interview_deadlines_expired_total", "Time limits that ran out, by what became of the session", labels=("outcome",)
+))
+evaluations_cancelled = registry.register(Counter(
+    "evaluations_cancelled_total", "Deferred evaluations dropped because their session was abandoned"
+))
+
+
+# Per-request timing spans; None outside a request or when disabled
+_spans: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("spans", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Add the block's duration to the current request's `name` span"""
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans[name] = spans.get(name, 0.0) + time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template.
+
+    With `server_timing` enabled it also opens a span collection for the
+    request and reports it in a Server-Timing header, splitting time spent
+    waiting on the LLM from our own processing.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+        token = _spans.set({}) if self.server_timing else None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if token is not None:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", self._server_timing(started).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"]
+            )
+            if token is not None:
+                _spans.reset(token)
+
+    @staticmethod
+    def _server_timing(started: float) -> str:
+        spans = _spans.get() or {}
+        total = time.perf_counter() - started
+        app_time = total - sum(spans.values())
+        entries = [f"{name};dur={duration * 1000:.1f}" for name, duration in spans.items()]
+        entries.append(f"app;dur={app_time * 1000:.1f}")
+        return ", ".join(entries)
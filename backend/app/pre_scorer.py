@@ -0,0 +1,158 @@
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9#+_/]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i if in is it its me my of on or so that the "
+    "their them then there these this to use used using was we what when where which while who "
+    "why will with would you your".split()
+)
+
+# Whole answers that say nothing, after normalization
+NON_ANSWERS = frozenset({
+    "", "idk", "i dont know", "i do not know", "dont know", "no idea", "not sure", "i am not sure",
+    "im not sure", "pass", "skip", "n/a", "na", "none", "nothing", "no", "yes", "ok", "test"
+})
+
+SparseVector = Dict[str, float]
+
+
+def _stem(token: str) -> str:
+    # Plural folding is enough to match "duplicates" against "duplicate"
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(token) for token in _TOKEN.findall(text.lower().replace("'", ""))]
+
+
+def _padded(tokens: List[str]) -> str:
+    return f" {' '.join(tokens)} "
+
+
+def _normalize(vector: Counter) -> SparseVector:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+class PreScore:
+    """Outcome of pre-scoring one answer; `score` is None when the LLM should decide"""
+
+    __slots__ = ("score", "reason", "word_count", "coverage", "similarity", "matched", "missing")
+
+    def __init__(self, score: Optional[int], reason: str, word_count: int, coverage: float,
+                 similarity: float, matched: List[str], missing: List[str]):
+        self.score = score
+        self.reason = reason
+        self.word_count = word_count
+        self.coverage = coverage
+        self.similarity = similarity
+        self.matched = matched
+        self.missing = missing
+
+    @property
+    def is_local(self) -> bool:
+        return self.score is not None
+
+
+class PreScorer:
+    """Deterministic first pass over open-ended answers.
+
+    Empty, very short and off-topic answers are scored locally; everything
+    else goes to the LLM. Off-topic means the answer hits none of the
+    question's concepts (from `evaluation_criteria`, its category and the
+    concept lexicon) and has low TF-IDF cosine similarity to the question's
+    reference text. The reference text is the question, its reference_answer
+    when present and its lexicon terms; its vectors and the IDF table are
+    built once, so scoring an answer is a single pass over its tokens.
+    """
+
+    def __init__(self, questions: Iterable[Mapping], lexicon: Dict[str, List[str]], min_words: int,
+                 min_similarity: float, max_local_score: int):
+        self.min_words = min_words
+        self.min_similarity = min_similarity
+        self.max_local_score = max_local_score
+        self._concepts: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        documents: Dict[str, List[str]] = {}
+
+        for question in questions:
+            if question["question_type"] != "general":
+                continue
+            groups = []
+            terms = []
+            for name in (question["category"],) + tuple(question["evaluation_criteria"]):
+                if name in lexicon:
+                    group = tuple(_padded(tokenize(term)) for term in lexicon[name])
+                    groups.append((name, group))
+                    terms.extend(lexicon[name])
+            self._concepts[question["id"]] = groups
+            reference = " ".join([question["question"], question.get("reference_answer", "")] + terms)
+            documents[question["id"]] = [token for token in tokenize(reference) if token not in STOPWORDS]
+
+        document_frequency = Counter(term for tokens in documents.values() for term in set(tokens))
+        count = len(documents)
+        self._idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        # Terms no reference uses get the highest weight, so padding an answer with them lowers similarity
+        self._unknown_idf = math.log(1 + count) + 1
+        self._references = {
+            question_id: _normalize(self._weigh(Counter(tokens))) for question_id, tokens in documents.items()
+        }
+
+    @classmethod
+    def from_files(cls, questions: Iterable[Mapping], lexicon_path: str, **thresholds) -> "PreScorer":
+        with open(lexicon_path, encoding="utf-8") as f:
+            lexicon = json.load(f)
+        return cls(questions, lexicon, **thresholds)
+
+    def _weigh(self, counts: Counter) -> Counter:
+        return Counter({term: tf * self._idf.get(term, self._unknown_idf) for term, tf in counts.items()})
+
+    def similarity(self, question_id: str, tokens: List[str]) -> float:
+        reference = self._references.get(question_id)
+        if not reference:
+            return 0.0
+        answer = _normalize(self._weigh(Counter(token for token in tokens if token not in STOPWORDS)))
+        return sum(weight * reference.get(term, 0.0) for term, weight in answer.items())
+
+    def assess(self, question: Mapping, answer: str) -> PreScore:
+        tokens = tokenize(answer)
+        padded = _padded(tokens)
+        groups = self._concepts.get(question["id"], [])
+        matched = [name for name, terms in groups if any(term in padded for term in terms)]
+        missing = [name for name, terms in groups if name not in matched]
+        coverage = len(matched) / len(groups) if groups else 0.0
+        similarity = self.similarity(question["id"], tokens)
+
+        def result(score: Optional[int], reason: str) -> PreScore:
+            return PreScore(score, reason, len(tokens), coverage, similarity, matched, missing)
+
+        if " ".join(tokens) in NON_ANSWERS:
+            return result(0, "empty")
+        if len(tokens) < self.min_words:
+            return result(round(self.max_local_score * coverage), "too_short")
+        if groups and not matched and similarity < self.min_similarity:
+            return result(0 if similarity == 0 else 1, "off_topic")
+        return result(None, "substantive")
+
+    def local_evaluation(self, question: Mapping, pre_score: PreScore) -> Dict:
+        """Evaluation in the LLM's format for an answer the pre-scorer settled"""
+        concepts = [name.replace("_", " ") for name in pre_score.missing]
+        feedback = {
+            "empty": "No answer was given to this question.",
+            "too_short": "Your answer is too brief to show your understanding. Explain your approach in a few sentences.",
+            "off_topic": "Your answer does not address the question that was asked."
+        }[pre_score.reason]
+        return {
+            "score": pre_score.score,
+            "feedback": feedback,
+            "correct_answer": "A complete answer would cover: " + ", ".join(concepts) if concepts else "",
+            "suggestions": [f"Address {concept} in your answer" for concept in concepts[:2]]
+                           or ["Describe your approach step by step"],
+            "strengths": [name.replace("_", " ") for name in pre_score.matched],
+            "missing_concepts": concepts,
+            "pre_scored": pre_score.reason
+        }
@@ -0,0 +1,119 @@
+import json
+import re
+import threading
+from typing import Callable, Dict, Tuple
+
+from app.prompts import REFERENCE_HEADER
+from app.resilience import CircuitBreaker, LatencyTracker
+from config.llm_config import LLMConfig
+
+# kind -> (factory taking a model name, whether it needs GEMINI_API_KEY)
+BACKEND_FACTORIES: Dict[str, Tuple[Callable[[str], object], bool]] = {}
+
+
+def register_backend(kind: str, needs_api_key: bool = False):
+    """Make a model factory available to LLMConfig.BACKENDS as "<kind>:<model name>"."""
+    def decorator(factory: Callable[[str], object]):
+        BACKEND_FACTORIES[kind] = (factory, needs_api_key)
+        return factory
+    return decorator
+
+
+class LocalResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LocalModel:
+    """Offline stand-in with GenerativeModel's interface.
+
+    Answers instantly with a fixed, well-formed evaluation (a JSON array for
+    batch prompts, plain text for reference answers), so the app runs end to
+    end without an API key. Evaluations carry a correct_answer only when the
+    prompt asks for one.
+    """
+
+    def __init__(self, model_name: str = "local", score: int = 5, correct_answer_chars: int = 0):
+        self.model_name = model_name
+        self.score = score
+        # Real reference answers run to a few hundred words; pad to mimic that
+        self.correct_answer_chars = correct_answer_chars
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        text = self.respond(prompt)
+        if stream:
+            return self._stream(text)
+        return LocalResponse(text)
+
+    def respond(self, prompt: str) -> str:
+        if prompt.startswith(REFERENCE_HEADER):
+            return self._correct_answer()
+        with_answer = '"correct_answer"' in prompt
+        if "JSON array" in prompt:
+            return json.dumps([
+                dict(self._evaluation(with_answer), index=index)
+                for index in range(1, len(re.findall(r"Candidate's Answer:", prompt)) + 1)
+            ])
+        return json.dumps(self._evaluation(with_answer))
+
+    def _correct_answer(self) -> str:
+        correct_answer = "A reference answer covering the key concepts."
+        if self.correct_answer_chars:
+            correct_answer = f"{correct_answer} ({self.calls})".ljust(self.correct_answer_chars, ".")
+        return correct_answer
+
+    def _evaluation(self, with_answer: bool = False) -> dict:
+        evaluation = {
+            "score": self.score,
+            "feedback": "Solid explanation with practical detail.",
+            "suggestions": ["Mention edge cases", "Give a worked example"],
+            "strengths": ["Clear structure"],
+            "missing_concepts": []
+        }
+        if with_answer:
+            evaluation["correct_answer"] = self._correct_answer()
+        return evaluation
+
+    def _stream(self, text: str, chunks: int = 10):
+        size = -(-len(text) // chunks)
+        for start in range(0, len(text), size):
+            yield LocalResponse(text[start:start + size])
+
+
+@register_backend("gemini", needs_api_key=True)
+def _gemini_model(model_name: str):
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name or LLMConfig.MODEL)
+
+
+@register_backend("local")
+def _local_model(model_name: str):
+    return LocalModel(model_name or "local")
+
+
+class LLMBackend:
+    """One model the LLM service can call, with its own circuit breaker and latency history"""
+
+    def __init__(self, kind: str, model, needs_api_key: bool = False):
+        self.kind = kind
+        self.model = model
+        self.name = f"{kind}:{getattr(model, 'model_name', type(model).__name__)}"
+        self.needs_api_key = needs_api_key
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=LLMConfig.CIRCUIT_BREAKER_THRESHOLD,
+            reset_timeout=LLMConfig.CIRCUIT_BREAKER_RESET
+        )
+        self.latency = LatencyTracker(window=LLMConfig.HEDGE_LATENCY_WINDOW)
+
+
+def create_backend(spec: str) -> LLMBackend:
+    """Build a backend from "<kind>:<model name>", e.g. "gemini:gemini-1.5-flash" or "local" """
+    kind, _, model_name = spec.strip().partition(":")
+    if kind not in BACKEND_FACTORIES:
+        raise ValueError(f"Unknown LLM backend '{kind}'; registered: {', '.join(sorted(BACKEND_FACTORIES))}")
+    factory, needs_api_key = BACKEND_FACTORIES[kind]
+    return LLMBackend(kind, factory(model_name), needs_api_key)
@@ -0,0 +1,116 @@
+import json
+import os
+import random
+from itertools import product
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Fields every question needs, plus the extra ones each type is scored with
+REQUIRED_FIELDS = ("id", "question", "question_type", "category", "difficulty")
+TYPE_FIELDS = {
+    "mcq": ("options", "correct_answer"),
+    "general": ("evaluation_criteria",)
+}
+
+PoolKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _freeze(question: Dict) -> Mapping:
+    """Read-only view of a question; lists become tuples"""
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in question.items()
+    })
+
+
+class QuestionBank:
+    """Immutable, indexed set of interview questions.
+
+    Every combination of (question_type, category, difficulty) filters, with
+    None meaning "any", maps to a precomputed tuple of ids, so pool lookup is
+    O(1) and sampling costs O(count) however large the bank grows.
+    """
+
+    def __init__(self, questions: Iterable[Dict]):
+        by_id = {}
+        pools: Dict[PoolKey, List[str]] = {}
+        for question in questions:
+            self._validate(question)
+            if question["id"] in by_id:
+                raise ValueError(f"Duplicate question id: {question['id']}")
+            by_id[question["id"]] = _freeze(question)
+
+            attributes = (question["question_type"], question["category"], question["difficulty"])
+            for mask in product((True, False), repeat=3):
+                key = tuple(value if keep else None for value, keep in zip(attributes, mask))
+                pools.setdefault(key, []).append(question["id"])
+
+        self._by_id = MappingProxyType(by_id)
+        self._pools = MappingProxyType({key: tuple(ids) for key, ids in pools.items()})
+
+    @classmethod
+    def load(cls, directory: str) -> "QuestionBank":
+        """Load every .json/.yaml/.yml file in `directory` (each a list of questions)"""
+        questions = []
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if name.endswith(".json"):
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            elif name.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError as e:
+                    raise RuntimeError(f"PyYAML is required to load {path}") from e
+                with open(path, encoding="utf-8") as f:
+                    data = yaml.safe_load(f)
+            else:
+                continue
+            questions.extend(data["questions"] if isinstance(data, dict) else data)
+        return cls(questions)
+
+    @staticmethod
+    def _validate(question: Dict) -> None:
+        required = REQUIRED_FIELDS + TYPE_FIELDS.get(question.get("question_type"), ())
+        missing = [field for field in required if field not in question]
+        if missing:
+            raise ValueError(f"Question {question.get('id', '?')} is missing {', '.join(missing)}")
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, question_id: str) -> bool:
+        return question_id in self._by_id
+
+    def get(self, question_id: str) -> Mapping:
+        return self._by_id[question_id]
+
+    def ids(self, question_type: Optional[str] = None, category: Optional[str] = None,
+            difficulty: Optional[str] = None) -> Tuple[str, ...]:
+        return self._pools.get((question_type, category, difficulty), ())
+
+    def sample(self, count: int, question_type: Optional[str] = None, category: Optional[str] = None,
+               difficulty: Optional[str] = None, exclude: Iterable[str] = (), rng=random) -> List[str]:
+        """Pick `count` distinct ids matching the filters, skipping any in `exclude`"""
+        pool = self.ids(question_type, category, difficulty)
+        exclude = set(exclude)
+        # Over-draw by the exclusion size so skipped ids cannot leave us short
+        drawn = rng.sample(pool, min(len(pool), count + len(exclude)))
+        picked = [question_id for question_id in drawn if question_id not in exclude][:count]
+        if len(picked) < count:
+            raise ValueError(
+                f"Only {len(picked)} questions match type={question_type} category={category} "
+                f"difficulty={difficulty}, {count} requested"
+            )
+        return picked
+
+    def select(self, strata: Iterable[Dict], rng=random) -> List[str]:
+        """Stratified selection, e.g. [{"count": 2, "difficulty": "easy", "category": "lookup_functions"}].
+
+        Strata are filled in order and never repeat a question.
+        """
+        selected: List[str] = []
+        for stratum in strata:
+            filters = {key: value for key, value in stratum.items() if key != "count"}
+            selected.extend(self.sample(stratum["count"], exclude=selected, rng=rng, **filters))
+        return selected
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+from app.coalescing import SingleFlight
+
+# Bump when the file layout changes; a file in an older layout is ignored and refilled
+FORMAT_VERSION = 1
+
+
+def question_digest(question: Mapping) -> str:
+    """Changes whenever the question's text or criteria do, so an edited question gets a new reference"""
+    text = "\n".join([question["question"], *question.get("evaluation_criteria", ())])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ReferenceAnswerStore:
+    """One reference answer per open-ended question, shown to candidates as the correct answer.
+
+    An answer authored in the question bank (`reference_answer`) always
+    wins. Other questions get one written by the model the first time they
+    need it, kept in a JSON file at `path` and tagged with the question
+    digest and `prompt_version`; a change to either makes the entry stale.
+    After a generation fails, the question gets "" for `retry_after` seconds
+    instead of another model call.
+    """
+
+    def __init__(self, path: Optional[str], prompt_version: str, retry_after: float = 0):
+        self.path = path
+        self.prompt_version = prompt_version
+        self.retry_after = retry_after
+        self.generated = 0
+        self._answers: Dict[str, Dict] = {}
+        # Question id -> monotonic time its last generation failed
+        self._failed: Dict[str, float] = {}
+        # Concurrent misses for one question share a single generation
+        self._filling = SingleFlight()
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading reference answers from {self.path}: {e}")
+            return
+        if data.get("version") == FORMAT_VERSION:
+            self._answers = data["answers"]
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def get(self, question: Mapping) -> Optional[str]:
+        authored = question.get("reference_answer")
+        if authored:
+            return authored
+        entry = self._answers.get(question["id"])
+        if entry is None or entry["prompt_version"] != self.prompt_version \
+                or entry["question_digest"] != question_digest(question):
+            return None
+        return entry["answer"]
+
+    async def fill(self, question: Mapping, generate: Callable[[], Awaitable[str]], model: str = "") -> str:
+        """The question's reference answer, written by `generate` if it has none yet; "" while cooling down from a failure"""
+        answer = self.get(question)
+        if answer is not None:
+            return answer
+        failed_at = self._failed.get(question["id"])
+        if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+            return ""
+        return await self._filling.run(question["id"], lambda: self._generate(question, generate, model))
+
+    async def _generate(self, question: Mapping, generate: Callable[[], Awaitable[str]], model: str) -> str:
+        try:
+            answer = await generate()
+        except Exception:
+            self._failed[question["id"]] = time.monotonic()
+            raise
+        self._failed.pop(question["id"], None)
+        self._answers[question["id"]] = {
+            "answer": answer,
+            "question_digest": question_digest(question),
+            "prompt_version": self.prompt_version,
+            "model": model,
+            "generated_at": datetime.now().isoformat(timespec="seconds")
+        }
+        self.generated += 1
+        self.save()
+        return answer
+
+    def save(self) -> None:
+        """Write every stored answer, replacing the file in one step"""
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"version": FORMAT_VERSION, "answers": self._answers}, f, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Error writing reference answers to {self.path}: {e}")
@@ -0,0 +1,228 @@
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, TimeoutError as FutureTimeout, wait
+from typing import Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class RateLimitTimeout(Exception):
+    """No request token became available within the allowed wait"""
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker is rejecting calls until its reset timeout passes"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every in-flight model call.
+
+    Callers block in `acquire` until a token is free, so bursts queue up and
+    drain at `rate_per_minute` instead of failing.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"Rate limit wait exceeded {timeout}s")
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for `reset_timeout` seconds.
+
+    After `failure_threshold` consecutive failures the breaker opens. Once the
+    timeout passes a single trial call is let through (half-open); its outcome
+    closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return self.state == "closed"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial that ended without an outcome, so the next call can try again"""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(
+    call: Callable[[], T],
+    *,
+    limiter: TokenBucket,
+    breaker: CircuitBreaker,
+    retryable: Tuple[Type[BaseException], ...],
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    limiter_timeout: Optional[float] = None
+) -> T:
+    """Run `call` under the rate limiter and circuit breaker, retrying transient errors.
+
+    Only `retryable` errors count towards opening the breaker. Anything else
+    (a bad request, a revoked API key) is raised at once without retries, and
+    is left out on purpose: an error caused by one request's input must not
+    suspend model calls for every other candidate.
+    """
+    attempt = 0
+    while True:
+        # A call the open breaker rejects must not spend a rate-limit token
+        if not breaker.allow():
+            raise CircuitOpenError("Model calls are temporarily suspended after repeated failures")
+        try:
+            limiter.acquire(timeout=limiter_timeout)
+            result = call()
+        except retryable:
+            breaker.record_failure()
+            if attempt >= max_retries:
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
+            continue
+        except BaseException:
+            # Not a sign the dependency is down (a RateLimitTimeout included), but a trial must not stay claimed
+            breaker.release_trial()
+            raise
+        breaker.record_success()
+        return result
+
+
+class LatencyTracker:
+    """Latencies of the last `window` successful calls to one backend"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class HedgeBudget:
+    """Caps hedged requests at `ratio` of primary requests.
+
+    Every primary request deposits `ratio` of a token and every hedge spends
+    a whole one, so sustained hedging can never exceed that share of traffic;
+    `capacity` bounds how many unused hedges can be saved up for a burst.
+    """
+
+    def __init__(self, ratio: float, capacity: float):
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+def hedged_call(primary: Callable[[], T], hedge: Callable[[], T], *, delay: float,
+                budget: HedgeBudget, executor: Executor) -> Tuple[T, str]:
+    """Run `primary`; if it has not finished after `delay` seconds, race `hedge` against it.
+
+    Returns the first successful result and an outcome label: "primary" (no
+    hedge needed), "budget_exhausted", "primary_won", "hedge_won" or
+    "fallback" (primary failed, so `hedge` ran alone without spending budget,
+    whether or not the budget allowed a hedge).
+    The loser is cancelled if it has not started; a call already in flight
+    runs to completion and its result is discarded.
+    """
+    budget.deposit()
+    first = executor.submit(contextvars.copy_context().run, primary)
+    try:
+        return first.result(timeout=delay), "primary"
+    except FutureTimeout:
+        pass
+    except Exception:
+        return hedge(), "fallback"
+
+    if not budget.try_spend():
+        try:
+            return first.result(), "budget_exhausted"
+        except Exception:
+            # Too late to hedge, but the secondary is still the fallback
+            return hedge(), "fallback"
+
+    second = executor.submit(contextvars.copy_context().run, hedge)
+    pending = {first: "primary_won", second: "hedge_won"}
+    error = None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            outcome = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                error = e
+                continue
+            for loser in pending:
+                loser.cancel()
+            return result, outcome
+    raise error
@@ -0,0 +1,87 @@
+from typing import Dict, Optional
+
+# Score bands used by the report's strengths / improvement areas
+HIGH_SCORE = 7
+LOW_SCORE = 5
+
+
+def new_aggregate() -> Dict:
+    """Running totals for a session, updated once per evaluated answer.
+
+    Kept as a plain dict so it serializes with the rest of the session.
+    """
+    return {
+        "mcq_sum": 0.0,
+        "mcq_count": 0,
+        "general_sum": 0.0,
+        "general_count": 0,
+        "high_by_category": {},
+        "low_by_category": {}
+    }
+
+
+def add_score(aggregate: Dict, question_type: str, category: str, score: float) -> None:
+    if question_type == "mcq":
+        aggregate["mcq_sum"] += score
+        aggregate["mcq_count"] += 1
+    else:
+        aggregate["general_sum"] += score
+        aggregate["general_count"] += 1
+
+    if score >= HIGH_SCORE:
+        high = aggregate["high_by_category"]
+        high[category] = high.get(category, 0) + 1
+    elif score < LOW_SCORE:
+        low = aggregate["low_by_category"]
+        low[category] = low.get(category, 0) + 1
+
+
+def scored_count(aggregate: Dict) -> int:
+    return aggregate["mcq_count"] + aggregate["general_count"]
+
+
+def average_scores(aggregate: Dict) -> Dict:
+    """MCQ, general and overall averages; overall weighs both parts equally"""
+    mcq_score = aggregate["mcq_sum"] / aggregate["mcq_count"] if aggregate["mcq_count"] else 0
+    general_score = aggregate["general_sum"] / aggregate["general_count"] if aggregate["general_count"] else 0
+    overall_score = (mcq_score + general_score) / 2 if scored_count(aggregate) else 0
+    return {
+        "mcq_score": mcq_score,
+        "general_score": general_score,
+        "overall_score": overall_score
+    }
+
+
+class ScoreHistogram:
+    """Counts of overall scores in 0.1-point bins, updated once per completed interview.
+
+    Percentile rank is a sum over at most 101 bins, so it costs the same
+    however many interviews have been recorded.
+    """
+
+    BINS = 101
+
+    def __init__(self):
+        self.counts = [0] * self.BINS
+        self.total = 0
+
+    @classmethod
+    def _bin(cls, score: float) -> int:
+        return min(cls.BINS - 1, max(0, int(round(score * 10))))
+
+    def add(self, score: float) -> None:
+        self.counts[self._bin(score)] += 1
+        self.total += 1
+
+    def merge(self, other: "ScoreHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+
+    def percentile_rank(self, score: float) -> Optional[float]:
+        """Share of recorded interviews scoring below `score`, ties counted half; None if empty"""
+        if not self.total:
+            return None
+        index = self._bin(score)
+        below = sum(self.counts[:index])
+        return round(100 * (below + 0.5 * self.counts[index]) / self.total, 1)
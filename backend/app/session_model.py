@@ -0,0 +1,144 @@
+import hashlib
+import json
+import sys
+import time
+import weakref
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.scoring import new_aggregate
+
+# Response evaluation states, stored as small ints
+PENDING = 0
+COMPLETED = 1
+STATUS_NAMES = ("pending", "completed")
+
+
+class EvaluationBlob:
+    """An evaluation dict held as compressed JSON.
+
+    Blobs are interned by content, so identical evaluations (cache hits,
+    fallbacks, MCQ results) share one object across every session that
+    references them, and are freed once the last session lets go.
+    """
+
+    __slots__ = ("digest", "data", "__weakref__")
+
+    def __init__(self, digest: bytes, data: bytes):
+        self.digest = digest
+        self.data = data
+
+    def load(self) -> Dict:
+        return json.loads(zlib.decompress(self.data))
+
+
+_interned_blobs: "weakref.WeakValueDictionary[bytes, EvaluationBlob]" = weakref.WeakValueDictionary()
+
+
+def intern_evaluation(evaluation: Dict) -> EvaluationBlob:
+    payload = json.dumps(evaluation, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    blob = _interned_blobs.get(digest)
+    if blob is None:
+        blob = EvaluationBlob(digest, zlib.compress(payload))
+        _interned_blobs[digest] = blob
+    return blob
+
+
+def intern_blob(digest: bytes, data: bytes) -> EvaluationBlob:
+    """Intern an evaluation that is already compressed, e.g. one read back from the session journal"""
+    blob = _interned_blobs.get(digest)
+    if blob is None:
+        blob = EvaluationBlob(digest, data)
+        _interned_blobs[digest] = blob
+    return blob
+
+
+class ResponseRecord:
+    """One answered question. Question text, type and category come from the bank."""
+
+    __slots__ = ("answer", "status", "score", "blob", "answered_at")
+
+    def __init__(self, answer: str, answered_at: float, status: int = PENDING,
+                 score: Optional[float] = None, blob: Optional[EvaluationBlob] = None):
+        self.answer = answer
+        self.answered_at = answered_at
+        self.status = status
+        self.score = score
+        self.blob = blob
+
+    @property
+    def evaluation(self) -> Optional[Dict]:
+        return self.blob.load() if self.blob is not None else None
+
+    def complete(self, evaluation: Dict) -> None:
+        self.complete_blob(intern_evaluation(evaluation), evaluation.get("score", 0))
+
+    def complete_blob(self, blob: EvaluationBlob, score: float) -> None:
+        self.blob = blob
+        self.score = score
+        self.status = COMPLETED
+
+    def to_dict(self) -> Dict:
+        return {
+            "answer": self.answer,
+            "answered_at": self.answered_at,
+            "status": self.status,
+            "evaluation": self.evaluation
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ResponseRecord":
+        record = cls(data["answer"], data["answered_at"])
+        if data["status"] == COMPLETED:
+            record.complete(data["evaluation"])
+        return record
+
+
+class SessionRecord:
+    """Compact interview session: ids, counters and epoch timestamps only"""
+
+    __slots__ = ("session_id", "user_name", "question_ids", "current_question_index",
+                 "responses", "start_time", "end_time", "aggregate")
+
+    def __init__(self, session_id: str, user_name: str, question_ids: List[str],
+                 start_time: Optional[float] = None):
+        self.session_id = session_id
+        self.user_name = user_name
+        # Ids repeat across thousands of sessions, so share one string each
+        self.question_ids = tuple(sys.intern(question_id) for question_id in question_ids)
+        self.current_question_index = 0
+        self.responses: List[ResponseRecord] = []
+        self.start_time = time.time() if start_time is None else start_time
+        self.end_time: Optional[float] = None
+        self.aggregate = new_aggregate()
+
+    @property
+    def is_complete(self) -> bool:
+        return self.current_question_index >= len(self.question_ids)
+
+    @property
+    def start_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.start_time)
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "user_name": self.user_name,
+            "question_ids": list(self.question_ids),
+            "current_question_index": self.current_question_index,
+            "responses": [response.to_dict() for response in self.responses],
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "aggregate": self.aggregate
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SessionRecord":
+        session = cls(data["session_id"], data["user_name"], data["question_ids"], data["start_time"])
+        session.current_question_index = data["current_question_index"]
+        session.responses = [ResponseRecord.from_dict(response) for response in data["responses"]]
+        session.end_time = data["end_time"]
+        session.aggregate = data["aggregate"]
+        return session
@@ -0,0 +1,218 @@
+import json
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional
+
+from app.session_model import SessionRecord
+from config.llm_config import InterviewConfig
+
+
+class SessionStore(ABC):
+    """Storage interface for interview sessions.
+
+    Callers mutate the SessionRecord they got from `get` and hand it back to
+    `save`; backends that serialize (Redis) only see changes once they are
+    saved.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        ...
+
+    @abstractmethod
+    def save(self, session: SessionRecord) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        ...
+
+    def update(self, session_id: str, change: Callable[[SessionRecord], Optional[bool]]) -> Optional[SessionRecord]:
+        """Apply `change` to the stored session and save it, unless `change` returns False.
+
+        Returns the session as changed, or None if there is none. Stores
+        shared between workers re-run `change` on a fresh copy if the session
+        was saved meanwhile, so it must only touch the session it is given.
+        """
+        session = self.get(session_id)
+        if session is not None and change(session) is not False:
+            self.save(session)
+        return session
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def iter_sessions(self) -> Iterator[SessionRecord]:
+        """Every live session, fetched lazily; sessions saved meanwhile may or may not appear"""
+        ...
+
+
+class InMemorySessionStore(SessionStore):
+    """In-process LRU store with a sliding TTL and a cap on live sessions.
+
+    `on_evict` is called with each session the TTL or the cap drops, but not
+    with those removed through `delete`.
+    """
+
+    def __init__(self, ttl_seconds: int, max_sessions: int,
+                 on_evict: Optional[Callable[[SessionRecord], None]] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        self._evict_expired()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._touch(session_id)
+        return session
+
+    def save(self, session: SessionRecord) -> None:
+        session_id = session.session_id
+        self._sessions[session_id] = session
+        self._touch(session_id)
+        self._evict_expired()
+        while len(self._sessions) > self.max_sessions:
+            oldest, evicted = self._sessions.popitem(last=False)
+            self._touched.pop(oldest, None)
+            self._evicted(evicted)
+
+    def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._touched.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def iter_sessions(self) -> Iterator[SessionRecord]:
+        # Snapshot the ids so callers may save or evict while iterating; reads do not refresh LRU order
+        for session_id in list(self._sessions):
+            session = self._sessions.get(session_id)
+            if session is not None:
+                yield session
+
+    def _touch(self, session_id: str) -> None:
+        self._sessions.move_to_end(session_id)
+        self._touched[session_id] = time.monotonic()
+
+    def _evict_expired(self) -> None:
+        # LRU order means the least recently touched sessions sit at the front
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            oldest = next(iter(self._sessions))
+            if self._touched[oldest] > cutoff:
+                break
+            evicted = self._sessions.pop(oldest)
+            self._touched.pop(oldest, None)
+            self._evicted(evicted)
+
+    def _evicted(self, session: SessionRecord) -> None:
+        if self.on_evict is not None:
+            self.on_evict(session)
+
+
+def serialize_session(session: SessionRecord) -> bytes:
+    """Compact JSON, zlib-compressed"""
+    payload = json.dumps(session.to_dict(), separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def deserialize_session(blob: bytes) -> SessionRecord:
+    return SessionRecord.from_dict(json.loads(zlib.decompress(blob).decode("utf-8")))
+
+
+class RedisSessionStore(SessionStore):
+    """Shares sessions between workers through any Redis-protocol client.
+
+    `client` only needs get/mget/set/delete/scan_iter and pipeline, so
+    redis.Redis and fakeredis.FakeRedis both work. Sessions are evicted by
+    their TTL; a cap on their number is the server's maxmemory-policy.
+    """
+
+    def __init__(self, client, ttl_seconds: int, key_prefix: str = "interview:session:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        blob = self.client.get(self._key(session_id))
+        if blob is None:
+            return None
+        return deserialize_session(blob)
+
+    def save(self, session: SessionRecord) -> None:
+        self.client.set(self._key(session.session_id), serialize_session(session), ex=self.ttl_seconds)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def update(self, session_id: str, change: Callable[[SessionRecord], Optional[bool]]) -> Optional[SessionRecord]:
+        # Optimistic: WATCH the key and start over if another worker saved the session before EXEC
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    blob = pipe.get(key)
+                    if blob is None:
+                        return None
+                    session = deserialize_session(blob)
+                    if change(session) is False:
+                        return session
+                    pipe.multi()
+                    pipe.set(key, serialize_session(session), ex=self.ttl_seconds)
+                    pipe.execute()
+                    return session
+                except WatchError:
+                    continue
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.key_prefix}*"))
+
+    def iter_sessions(self, batch_size: int = 100) -> Iterator[SessionRecord]:
+        keys = []
+        for key in self.client.scan_iter(match=f"{self.key_prefix}*", count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                yield from self._load_many(keys)
+                keys = []
+        if keys:
+            yield from self._load_many(keys)
+
+    def _load_many(self, keys) -> Iterator[SessionRecord]:
+        # A key may expire between SCAN and MGET
+        for blob in self.client.mget(keys):
+            if blob is not None:
+                yield deserialize_session(blob)
+
+
+def create_session_store(on_evict: Optional[Callable[[SessionRecord], None]] = None) -> SessionStore:
+    """Build the store selected by InterviewConfig.SESSION_STORE_URL.
+
+    `on_evict` only applies to the in-process store; Redis expires keys on
+    the server without telling any worker.
+    """
+    url = InterviewConfig.SESSION_STORE_URL
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SESSION_STORE_URL points at Redis but the 'redis' package is not installed") from e
+        return RedisSessionStore(redis.Redis.from_url(url), ttl_seconds=InterviewConfig.SESSION_TTL)
+
+    return InMemorySessionStore(
+        ttl_seconds=InterviewConfig.SESSION_TTL,
+        max_sessions=InterviewConfig.MAX_SESSIONS,
+        on_evict=on_evict
+    )
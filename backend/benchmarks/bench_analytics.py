@@ -0,0 +1,80 @@
+"""
+Cohort analytics cost over a large synthetic population.
+
+Fills a CohortLog and a ScoreHistogram with completed interviews whose
+scores come from a simple ability model, then times the full statistics
+pass and percentile-rank lookups. Run from the backend directory:
+    python -m benchmarks.bench_analytics --sessions 50000
+"""
+import argparse
+import random
+import time
+
+from app.analytics import CohortLog
+from app.question_bank import QuestionBank
+from app.scoring import ScoreHistogram, add_score, average_scores
+from app.session_model import ResponseRecord, SessionRecord
+from config.llm_config import InterviewConfig
+
+
+def synthetic_session(number, bank, rng):
+    question_ids = bank.select(InterviewConfig.QUESTION_MIX, rng=rng)
+    session = SessionRecord(f"s{number}", f"candidate-{number}", question_ids)
+    ability = rng.random()
+    for question_id in question_ids:
+        question = bank.get(question_id)
+        if question["question_type"] == "mcq":
+            score = 10 if rng.random() < 0.2 + 0.7 * ability else 0
+        else:
+            score = max(0, min(10, round(rng.gauss(2 + 7 * ability, 1.5))))
+        response = ResponseRecord("answer", time.time())
+        response.complete({"score": score})
+        session.responses.append(response)
+        add_score(session.aggregate, question["question_type"], question["category"], score)
+    session.current_question_index = len(question_ids)
+    session.end_time = time.time()
+    return session
+
+
+def main(args):
+    bank = QuestionBank.load(InterviewConfig.QUESTION_BANK_DIR)
+    rng = random.Random(args.seed)
+    sessions = [synthetic_session(number, bank, rng) for number in range(args.sessions)]
+
+    started = time.perf_counter()
+    log = CohortLog.from_sessions(bank, sessions)
+    load_time = time.perf_counter() - started
+
+    histogram = ScoreHistogram()
+    started = time.perf_counter()
+    for session in sessions:
+        histogram.add(average_scores(session.aggregate)["overall_score"])
+    histogram_time = time.perf_counter() - started
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        stats = log.stats()
+        timings.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for score in range(1000):
+        histogram.percentile_rank(score / 100)
+    rank_time = (time.perf_counter() - started) / 1000
+
+    print(f"{stats['sessions']} sessions, {stats['responses']} responses, {len(stats['questions'])} questions")
+    print(f"  build column arrays  {load_time * 1000:8.1f} ms (once; then appended per completion)")
+    print(f"  build histogram      {histogram_time * 1000:8.1f} ms")
+    print(f"  full stats pass      {min(timings) * 1000:8.2f} ms (best of {args.repeat})")
+    print(f"  percentile rank      {rank_time * 1e6:8.2f} us")
+    print(f"  score percentiles    {stats['score_percentiles']}")
+    flagged = [q for q in stats["questions"] if q["flags"]]
+    print(f"  flagged questions    {len(flagged)}: " + ", ".join(f"{q['id']} {'/'.join(q['flags'])}" for q in flagged[:6]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
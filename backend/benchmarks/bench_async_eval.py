@@ -0,0 +1,87 @@
+"""
+MCQ-submit latency while slow open-ended evaluations are in flight.
+
+Run from the backend directory:
+    python -m benchmarks.bench_async_eval --slow 8 --latency 2.0
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.main import app
+from benchmarks.fake_llm import make_fake_service
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def start_session(client, name):
+    response = await client.post("/api/interview/start", json={"user_name": name})
+    return response.json()["session_id"]
+
+
+async def answer_mcqs(client, session_id, count):
+    for _ in range(count):
+        await client.post("/api/interview/submit-answer", json={"session_id": session_id, "answer": "A"})
+
+
+async def measure_mcq_latency(client, sessions):
+    """Submit one MCQ answer per session, one at a time, returning latencies in ms"""
+    latencies = []
+    for session_id in sessions:
+        started = time.perf_counter()
+        await client.post("/api/interview/submit-answer", json={"session_id": session_id, "answer": "B"})
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:<28} n={len(latencies):<4} p50={statistics.median(latencies):7.2f}ms  "
+          f"p99={percentile(latencies, 99):7.2f}ms  max={max(latencies):7.2f}ms")
+
+
+async def main(slow: int, latency: float, probes: int):
+    app.state.llm_service = make_fake_service(latency=latency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Baseline: no LLM work in flight
+        probe_sessions = [await start_session(client, f"probe-{i}") for i in range(probes)]
+        baseline = await measure_mcq_latency(client, probe_sessions)
+
+        # Park `slow` sessions on their first open-ended question
+        slow_sessions = [await start_session(client, f"slow-{i}") for i in range(slow)]
+        for session_id in slow_sessions:
+            await answer_mcqs(client, session_id, 5)
+
+        probe_sessions = [await start_session(client, f"probe-loaded-{i}") for i in range(probes)]
+        in_flight = [
+            asyncio.create_task(client.post(
+                "/api/interview/submit-answer",
+                json={"session_id": session_id, "answer": "I would use XLOOKUP for exact matches."}
+            ))
+            for session_id in slow_sessions
+        ]
+        await asyncio.sleep(0.05)
+        loaded = await measure_mcq_latency(client, probe_sessions)
+        await asyncio.gather(*in_flight)
+
+    print(f"{slow} slow evaluations at {latency:.1f}s each")
+    report("MCQ submit (idle)", baseline)
+    report("MCQ submit (LLM in flight)", loaded)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slow", type=int, default=8, help="Concurrent slow open-ended evaluations")
+    parser.add_argument("--latency", type=float, default=2.0, help="Fake model latency in seconds")
+    parser.add_argument("--probes", type=int, default=50, help="MCQ submits measured per phase")
+    args = parser.parse_args()
+    asyncio.run(main(args.slow, args.latency, args.probes))
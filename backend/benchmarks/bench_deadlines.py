@@ -0,0 +1,122 @@
+"""
+Cost of enforcing time limits with a large number of open interviews.
+
+Every session gets an answer deadline and an interview deadline, spread
+the way a steady stream of candidates would leave them. The clock is
+simulated: each tick of the sweep interval pops whatever expired and re-arms
+the answer deadlines it timed out, while a share of sessions answer and
+push theirs back. The same ticks are then timed as a full scan over every
+session, which is what a sweep without the scheduler would have to do. Run
+from the backend directory:
+    python -m benchmarks.bench_deadlines --sessions 200000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.deadlines import DeadlineScheduler
+from app.journal import last_activity
+from app.session_model import ResponseRecord, SessionRecord
+from config.llm_config import InterviewConfig
+
+ANSWER_TIME = InterviewConfig.MAX_ANSWER_TIME
+INTERVIEW_TIME = InterviewConfig.TOTAL_INTERVIEW_TIME
+
+
+def make_sessions(count: int, now: float, rng: random.Random):
+    """Sessions started over the last interview length, each some way into its current question"""
+    sessions = []
+    for number in range(count):
+        session = SessionRecord(f"s{number}", f"candidate-{number}", [f"q{i}" for i in range(10)],
+                                start_time=now - rng.uniform(0, INTERVIEW_TIME))
+        answered = min(9, int((now - session.start_time) / (INTERVIEW_TIME / 10)))
+        for index in range(answered):
+            session.responses.append(ResponseRecord("", session.start_time + (index + 1) * rng.uniform(60, 170)))
+        session.current_question_index = answered
+        sessions.append(session)
+    return sessions
+
+
+def arm(scheduler: DeadlineScheduler, session: SessionRecord) -> None:
+    scheduler.schedule((session.session_id, "answer"), last_activity(session) + ANSWER_TIME)
+    scheduler.schedule((session.session_id, "interview"), session.start_time + INTERVIEW_TIME)
+
+
+def scan(sessions, now: float) -> int:
+    """What a sweep without the scheduler does: check every session's limits"""
+    due = 0
+    for session in sessions:
+        if last_activity(session) + ANSWER_TIME <= now or session.start_time + INTERVIEW_TIME <= now:
+            due += 1
+    return due
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    now = time.time()
+    sessions = make_sessions(args.sessions, now, rng)
+    by_id = {session.session_id: session for session in sessions}
+
+    tracemalloc.start()
+    scheduler = DeadlineScheduler()
+    for session in sessions:
+        arm(scheduler, session)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    scheduler = DeadlineScheduler()
+    for session in sessions:
+        arm(scheduler, session)
+    schedule_time = time.perf_counter() - started
+
+    # Nothing due: the common case between expiries
+    idle = []
+    for _ in range(10000):
+        started = time.perf_counter()
+        scheduler.pop_due(now - 1)
+        idle.append(time.perf_counter() - started)
+
+    answers_per_tick = int(args.sessions * args.interval / (INTERVIEW_TIME / 10))
+    sweep_time, answer_time, expired, answered = 0.0, 0.0, 0, 0
+    for tick in range(1, args.ticks + 1):
+        clock = now + tick * args.interval
+        started = time.perf_counter()
+        for session_id, kind in scheduler.pop_due(clock):
+            expired += 1
+            if kind == "answer":
+                # The handler records a timed-out answer and arms the next question
+                scheduler.schedule((session_id, "answer"), clock + ANSWER_TIME)
+        sweep_time += time.perf_counter() - started
+        started = time.perf_counter()
+        for session in rng.sample(sessions, answers_per_tick):
+            scheduler.schedule((session.session_id, "answer"), clock + ANSWER_TIME)
+        answer_time += time.perf_counter() - started
+        answered += answers_per_tick
+
+    scan_ticks = min(args.ticks, 20)
+    started = time.perf_counter()
+    for tick in range(1, scan_ticks + 1):
+        scan(by_id.values(), now + tick * args.interval)
+    scan_time = (time.perf_counter() - started) / scan_ticks
+
+    idle.sort()
+    print(f"{args.sessions} sessions, {len(scheduler)} live deadlines, "
+          f"{args.ticks} sweeps {args.interval:g} s apart, {expired} expired, {answered} answers")
+    print(f"  schedule          {schedule_time / (2 * args.sessions) * 1e6:8.2f} us per deadline, "
+          f"{memory / (2 * args.sessions):.0f} bytes each")
+    print(f"  re-arm on answer  {answer_time / max(answered, 1) * 1e6:8.2f} us")
+    print(f"  idle sweep        {idle[len(idle) // 2] * 1e9:8.0f} ns median")
+    print(f"  sweep per tick    {sweep_time / args.ticks * 1e6:8.1f} us mean "
+          f"({sweep_time / max(expired, 1) * 1e6:.2f} us per expiry)")
+    print(f"  full scan         {scan_time * 1e6:8.1f} us per tick")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200000)
+    parser.add_argument("--interval", type=float, default=InterviewConfig.DEADLINE_SWEEP_INTERVAL)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,112 @@
+"""
+Session journal cost on the request path, and replay time after a crash.
+
+Journals complete synthetic interviews (start, ten answers, ten
+evaluations, completion) until the event count is reached, then replays
+the snapshot and journal into sessions as startup would. Every session is
+kept live, so each snapshot holds all of them. Run from the backend
+directory:
+    python -m benchmarks.bench_journal --events 100000
+    python -m benchmarks.bench_journal --events 100000 --compact-every 0   # one uncompacted journal
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.journal import SessionJournal
+from app.question_bank import QuestionBank
+from app.session_model import ResponseRecord, SessionRecord
+from config.llm_config import InterviewConfig
+
+
+def evaluation_for(question, rng):
+    if question["question_type"] == "mcq":
+        correct = rng.random() < 0.6
+        return {
+            "score": 10 if correct else 0,
+            "feedback": "Correct!" if correct else f"Incorrect. The correct answer is {question['correct_answer']}",
+            "correct_answer": question["correct_answer"],
+            "is_correct": correct
+        }
+    return {
+        "score": rng.randint(2, 9),
+        "feedback": "Good grasp of the core idea; the explanation of edge cases could be more concrete.",
+        "correct_answer": "A reference answer covering the key concepts in a few sentences. " * 6,
+        "suggestions": ["Mention edge cases", "Give a worked example"],
+        "strengths": ["Clear structure"],
+        "missing_concepts": ["Error handling"]
+    }
+
+
+def journal_sessions(journal, sessions, bank, events, rng):
+    """Drive the journal as the handlers do; returns the time each journal call took"""
+    timings = []
+
+    def timed(record, *args):
+        started = time.perf_counter()
+        record(*args)
+        timings.append(time.perf_counter() - started)
+
+    while journal.seq < events:
+        number = len(sessions)
+        question_ids = bank.select(InterviewConfig.QUESTION_MIX, rng=rng)
+        session = SessionRecord(f"s{number}", f"candidate-{number}", question_ids)
+        sessions[session.session_id] = session
+        timed(journal.session_started, session)
+        for index, question_id in enumerate(question_ids):
+            question = bank.get(question_id)
+            session.responses.append(ResponseRecord(f"Answer {index} from {session.user_name}: " + "text " * 40, time.time()))
+            session.current_question_index += 1
+            timed(journal.answer_recorded, session, index)
+            session.responses[index].complete(evaluation_for(question, rng))
+            timed(journal.evaluation_stored, session, index, question["question_type"], question["category"])
+        session.end_time = time.time()
+        timed(journal.session_completed, session)
+    return timings
+
+
+def main(args):
+    bank = QuestionBank.load(InterviewConfig.QUESTION_BANK_DIR)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.journal")
+        sessions = {}
+        journal = SessionJournal(
+            path, flush_interval=args.flush_interval, compact_every=args.compact_every or 1,
+            snapshot_source=sessions.values if args.compact_every else None
+        )
+        journal.start()
+        started = time.perf_counter()
+        calls = journal_sessions(journal, sessions, bank, args.events, rng)
+        journal.close()
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+        snapshot_size = os.path.getsize(journal.snapshot_path) if journal.snapshots else 0
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            restored = SessionJournal(path).replay()
+            timings.append(time.perf_counter() - started)
+    assert len(restored) == len(sessions)
+
+    calls.sort()
+    print(f"{journal.seq} events, {len(restored)} sessions, "
+          f"journal {size / 1e6:.1f} MB, snapshot {snapshot_size / 1e6:.1f} MB")
+    print(f"  append (request path)  {sum(calls) / len(calls) * 1e6:8.2f} us mean, "
+          f"{calls[int(len(calls) * 0.999)] * 1e6:.1f} us p99.9, {calls[-1] * 1000:.1f} ms max")
+    print(f"  writer                 {journal.fsyncs} fsyncs, {journal.snapshots} snapshots, {elapsed:.2f} s wall")
+    print(f"  replay                 {min(timings) * 1000:8.1f} ms (best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    parser.add_argument("--compact-every", type=int, default=InterviewConfig.SESSION_JOURNAL_COMPACT_EVERY,
+                        help="Events between snapshots; 0 never compacts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
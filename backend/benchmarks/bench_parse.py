@@ -0,0 +1,115 @@
+"""
+What malformed model output costs: a plain json.loads with a canned
+fallback against the validated parser with local repair and a re-ask.
+
+First times both parsers on each kind of output in fake_llm.MALFORMATIONS
+and on well-formed output. Then evaluates answers on a fake model that
+corrupts a share of its responses. The old path is measured on the same
+raw responses: anything json.loads rejects gets the fallback score, and an
+out-of-range score goes through unnoticed. Run from the backend directory:
+    python -m benchmarks.bench_parse --evaluations 500 --malformed-rate 0.2
+"""
+import argparse
+import json
+import time
+
+from app import metrics
+from app.evaluation_cache import EvaluationCache
+from app.evaluation_schema import InvalidModelOutput, extract_json_text, parse_evaluation
+from app.llm_service import default_evaluation
+from app.providers import LocalModel
+from benchmarks.bench_prompt import ANSWER
+from benchmarks.fake_llm import MALFORMATIONS, FakeGenerativeModel, make_fake_service
+
+QUESTION = "Explain how you would use INDEX and MATCH to look up a value."
+CRITERIA = ["accuracy", "practical_examples"]
+
+
+def legacy_parse(text):
+    """How evaluations were parsed before: the JSON as-is, or None for the fallback"""
+    try:
+        return json.loads(extract_json_text(text))
+    except json.JSONDecodeError:
+        return None
+
+
+def validated_parse(text):
+    try:
+        return parse_evaluation(text)[0]
+    except InvalidModelOutput:
+        return None
+
+
+def time_parse(parse, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse(text)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def parse_costs(repeat):
+    well_formed = LocalModel().respond("JSON object")
+    samples = {"well-formed": well_formed, **{kind: corrupt(well_formed) for kind, corrupt in MALFORMATIONS.items()}}
+    print(f"  {'output':<16}{'json.loads us':>14}{'validated us':>14}  result")
+    for kind, text in samples.items():
+        try:
+            outcome = "repaired" if parse_evaluation(text)[1] else "valid"
+        except InvalidModelOutput:
+            outcome = "invalid"
+        legacy_note = "fallback" if legacy_parse(text) is None else "accepted"
+        print(f"  {kind:<16}{time_parse(legacy_parse, text, repeat):>14.1f}"
+              f"{time_parse(validated_parse, text, repeat):>14.1f}  {outcome} (json.loads: {legacy_note})")
+
+
+def legacy_outcomes(args, prompt):
+    model = FakeGenerativeModel(latency=0, malformed_rate=args.malformed_rate, seed=args.seed)
+    fallbacks = out_of_range = 0
+    for _ in range(args.evaluations):
+        evaluation = legacy_parse(model.generate_content(prompt).text)
+        if evaluation is None:
+            fallbacks += 1
+        elif not 0 <= evaluation["score"] <= 10:
+            out_of_range += 1
+    return fallbacks, out_of_range, model.calls
+
+
+def validated_outcomes(args):
+    service = make_fake_service(cache=EvaluationCache(max_entries=1, ttl_seconds=1), latency=0,
+                                malformed_rate=args.malformed_rate, seed=args.seed)
+    fallback = default_evaluation()
+    fallbacks = out_of_range = 0
+    for number in range(args.evaluations):
+        evaluation = service.evaluate_answer(QUESTION, f"{ANSWER} ({number})", CRITERIA)
+        if evaluation == fallback:
+            fallbacks += 1
+        elif not 0 <= evaluation["score"] <= 10:
+            out_of_range += 1
+    service.close()
+    return fallbacks, out_of_range, service.model.calls
+
+
+def main(args):
+    print(f"Parse cost per response, {args.repeat} runs each")
+    parse_costs(args.repeat)
+
+    prompt = make_fake_service().prompts.evaluation(QUESTION, ANSWER, CRITERIA)
+    print(f"\n{args.evaluations} evaluations, {args.malformed_rate:.0%} of model responses malformed")
+    print(f"  {'parser':<22}{'fallbacks':>10}{'bad scores':>12}{'model calls':>13}")
+    for label, (fallbacks, out_of_range, calls) in (
+        ("json.loads", legacy_outcomes(args, prompt)),
+        ("validated + re-ask", validated_outcomes(args))
+    ):
+        print(f"  {label:<22}{fallbacks:>10}{out_of_range:>12}{calls:>13}")
+    print("  validated outcomes: " + " ".join(
+        f"{outcome}={metrics.llm_output_parses.value(operation=operation, outcome=outcome):.0f}/{operation}"
+        for operation in ("evaluate", "reask") for outcome in ("valid", "repaired", "invalid")
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--evaluations", type=int, default=500)
+    parser.add_argument("--malformed-rate", type=float, default=0.2, help="Share of model responses corrupted")
+    parser.add_argument("--repeat", type=int, default=2000, help="Timing runs per parser and output kind")
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
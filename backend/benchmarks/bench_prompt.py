@@ -0,0 +1,109 @@
+"""
+Prompt size, latency and cost per evaluation: the original f-string prompt
+against PromptBuilder.
+
+Runs the same mix of answers (mostly ordinary, some pasted walls of text)
+through GeminiService on a fake model whose latency grows with prompt
+length. Run from the backend directory:
+    python -m benchmarks.bench_prompt --evaluations 200 --long-share 0.1
+"""
+import argparse
+import random
+import time
+
+from app.evaluation_cache import EvaluationCache
+from benchmarks.fake_llm import make_fake_service
+
+QUESTION = "What is the difference between VLOOKUP and XLOOKUP? When would you use each?"
+CRITERIA = ["accuracy", "practical_examples", "limitations_understanding"]
+ANSWER = ("XLOOKUP searches in any direction, defaults to an exact match and can return a value when nothing "
+          "is found, while VLOOKUP only looks to the right and breaks when columns are inserted. ")
+
+
+class LegacyPrompts:
+    """The evaluation prompt as it was built before PromptBuilder"""
+
+    def evaluation(self, question, answer, criteria):
+        return f"""
+        You are an expert Excel interviewer. Evaluate this answer and provide helpful feedback.
+        
+        Question: {question}
+        Candidate's Answer: {answer}
+        
+        Evaluation criteria: {', '.join(criteria)}
+        
+        Provide a JSON response with this exact format:
+        {{
+            "score": <number 0-10>,
+            "feedback": "<2-3 sentences of specific feedback WITHOUT mentioning the score>",
+            "correct_answer": "<Provide a comprehensive correct answer to the question>",
+            "suggestions": ["<specific suggestion 1>", "<specific suggestion 2>"],
+            "strengths": ["<what they got right>"],
+            "missing_concepts": ["<what they missed>"]
+        }}
+        
+        Important:
+        - Do NOT mention the score in the feedback
+        - Focus on what they did well and what to improve
+        - Provide the actual correct answer
+        - Give actionable suggestions
+        
+        Return ONLY the JSON, no other text.
+        """
+
+
+def workload(count, long_share, long_chars, rng):
+    answers = []
+    for number in range(count):
+        if rng.random() < long_share:
+            answers.append((ANSWER * (long_chars // len(ANSWER) + 1))[:long_chars] + f" ({number})")
+        else:
+            answers.append(ANSWER * rng.randint(1, 3) + f"({number})")
+    return answers
+
+
+def run(label, prompts, answers, args):
+    service = make_fake_service(
+        cache=EvaluationCache(max_entries=1, ttl_seconds=1),
+        latency=args.latency,
+        latency_per_1k_tokens=args.latency_per_1k
+    )
+    if prompts is not None:
+        service.prompts = prompts
+
+    started = time.perf_counter()
+    for answer in answers:
+        service.prompts.evaluation(QUESTION, answer, CRITERIA)
+    build_us = (time.perf_counter() - started) / len(answers) * 1e6
+
+    started = time.perf_counter()
+    for answer in answers:
+        service.evaluate_answer(QUESTION, answer, CRITERIA, question_id="gen_1")
+    elapsed = time.perf_counter() - started
+    service.close()
+
+    tokens = service.model.prompt_chars / 4 / len(answers)
+    print(f"  {label:<14}{tokens:>10.0f}{build_us:>10.1f}{elapsed / len(answers) * 1000:>12.1f}"
+          f"{tokens * args.price_per_1m / 1e6 * 1000:>16.4f}")
+    return tokens, elapsed
+
+
+def main(args):
+    answers = workload(args.evaluations, args.long_share, args.long_chars, random.Random(args.seed))
+    print(f"{args.evaluations} evaluations, {args.long_share:.0%} of answers {args.long_chars:,} characters; "
+          f"fake latency {args.latency}s + {args.latency_per_1k}s per 1k prompt tokens")
+    print(f"  {'prompt':<14}{'tokens':>10}{'build us':>10}{'latency ms':>12}{'$ per 1k evals':>16}")
+    legacy_tokens, legacy_time = run("f-string", LegacyPrompts(), answers, args)
+    tokens, elapsed = run("PromptBuilder", None, answers, args)
+    print(f"  prompt tokens -{1 - tokens / legacy_tokens:.0%}, latency -{1 - elapsed / legacy_time:.0%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--evaluations", type=int, default=200)
+    parser.add_argument("--long-share", type=float, default=0.1, help="Fraction of pasted, very long answers")
+    parser.add_argument("--long-chars", type=int, default=20000, help="Length of a pasted answer")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fixed fake latency per call in seconds")
+    parser.add_argument("--latency-per-1k", type=float, default=0.05, help="Extra seconds per 1k prompt tokens")
+    parser.add_argument("--price-per-1m", type=float, default=0.35, help="Input price in $ per 1M tokens")
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,98 @@
+"""
+Completion tokens and latency per evaluation: a correct_answer written in
+every evaluation against one stored reference answer per question.
+
+Evaluates the same answers twice on a fake model whose latency grows with
+the text it generates, as a real model's does. The first run uses the old
+prompt, which asks for the correct answer every time. The second uses the
+current prompt and fills a reference answer store the way the app does:
+once per question, on first use, alongside the first evaluation. The
+questions have no authored reference, so that one-off cost is included. Run
+from the backend directory:
+    python -m benchmarks.bench_reference_answers --evaluations 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.evaluation_cache import EvaluationCache
+from app.llm_service import REFERENCE_PROMPT_VERSION
+from app.prompts import EVALUATION_HEADER, PromptBuilder
+from app.reference_answers import ReferenceAnswerStore
+from benchmarks.bench_prompt import ANSWER
+from benchmarks.fake_llm import make_fake_service
+
+
+class LegacyPrompts(PromptBuilder):
+    """The evaluation prompt as it was while every evaluation wrote its own correct answer"""
+
+    header = EVALUATION_HEADER.replace(
+        '"suggestions":', '"correct_answer": "<a comprehensive correct answer to the question>", "suggestions":'
+    ).replace("- Give actionable", "- Provide the actual correct answer\n- Give actionable")
+
+    def evaluation(self, question, answer, criteria):
+        return self.header + self._item(question, answer, criteria)
+
+
+def questions(count):
+    return [
+        {"id": f"bench_{number}", "question": f"Benchmark question {number}: explain your approach.",
+         "evaluation_criteria": ["accuracy", "practical_examples"], "question_type": "general"}
+        for number in range(count)
+    ]
+
+
+async def run(label, legacy, workload, args):
+    service = make_fake_service(
+        cache=EvaluationCache(max_entries=1, ttl_seconds=1),
+        latency=args.latency,
+        latency_per_1k_output_tokens=args.latency_per_1k_output,
+        correct_answer_chars=args.answer_chars
+    )
+    store = ReferenceAnswerStore(None, REFERENCE_PROMPT_VERSION)
+    if legacy:
+        service.prompts = LegacyPrompts(max_answer_tokens=service.prompts.max_answer_chars // 4)
+
+    timings = []
+    for question, answer in workload:
+        started = time.perf_counter()
+        calls = [service.evaluate_answer_async(question["question"], answer, question["evaluation_criteria"])]
+        if not legacy:
+            calls.append(store.fill(
+                question,
+                lambda: service.generate_reference_answer_async(question["question"], question["evaluation_criteria"])
+            ))
+        await asyncio.gather(*calls)
+        timings.append(time.perf_counter() - started)
+    service.close()
+
+    tokens = service.model.completion_chars / 4 / len(workload)
+    timings.sort()
+    print(f"  {label:<22}{tokens:>10.0f}{sum(timings) / len(timings) * 1000:>11.0f}"
+          f"{timings[len(timings) // 2] * 1000:>11.0f}{service.model.calls:>8}")
+    return tokens, sum(timings)
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    bank = questions(args.questions)
+    workload = [(rng.choice(bank), ANSWER * rng.randint(1, 3) + f"({number})") for number in range(args.evaluations)]
+    print(f"{args.evaluations} evaluations over {args.questions} questions, {args.answer_chars}-char correct answers; "
+          f"fake latency {args.latency}s + {args.latency_per_1k_output}s per 1k completion tokens")
+    print(f"  {'correct answer':<22}{'tokens':>10}{'mean ms':>11}{'p50 ms':>11}{'calls':>8}")
+    legacy_tokens, legacy_time = asyncio.run(run("in every evaluation", True, workload, args))
+    tokens, elapsed = asyncio.run(run("stored per question", False, workload, args))
+    print(f"  completion tokens -{1 - tokens / legacy_tokens:.0%}, evaluation time -{1 - elapsed / legacy_time:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--evaluations", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--answer-chars", type=int, default=1500, help="Length of each correct answer the model writes")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fixed fake latency per call in seconds")
+    parser.add_argument("--latency-per-1k-output", type=float, default=0.2,
+                        help="Extra seconds per 1k completion tokens (scaled down from ~5 s on a real model)")
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
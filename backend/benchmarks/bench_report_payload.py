@@ -0,0 +1,119 @@
+"""
+Size and serialization cost of the completed-interview response.
+
+Finishes a few interviews on the in-process app with a fake model, then
+builds and serializes each final submit-answer response:
+  - through FastAPI's previous path: jsonable_encoder, then the stdlib JSONResponse
+  - as an ORJSONResponse, which is what submit-answer now returns
+  - with a slim report, and as one default page of /report/details
+Sizes are given raw, gzipped and, if the brotli package is installed,
+brotli-compressed, with the middleware's settings. Run from the backend
+directory:
+    python -m benchmarks.bench_report_payload --answer-chars 1200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+import app.main as main
+from app.compression import Compressor, brotli
+from app.evaluation_cache import EvaluationCache
+from app.session_store import InMemorySessionStore
+from benchmarks.bench_prompt import ANSWER
+from benchmarks.fake_llm import make_fake_service
+from config.llm_config import InterviewConfig
+
+
+def run_now(coroutine):
+    """Result of a coroutine that never awaits, without an event loop's overhead in the timing"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine awaited")
+
+
+def time_call(call, repeat):
+    """Median microseconds per call, and its last result"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6, result
+
+
+async def finish_interviews(args, rng):
+    """Session ids of completed interviews, answered at around `answer_chars` per open-ended answer"""
+    session_ids = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for number in range(args.sessions):
+            started = (await client.post("/api/interview/start", json={"user_name": f"bench-{number}"})).json()
+            session_id = started["session_id"]
+            options = started.get("options")
+            open_ended = (ANSWER * (args.answer_chars // len(ANSWER) + 1))[:args.answer_chars]
+            for _ in range(len(main.session_store.get(session_id).question_ids)):
+                answer = rng.choice(options) if options else open_ended
+                reply = (await client.post("/api/interview/submit-answer",
+                                           json={"session_id": session_id, "answer": answer})).json()
+                options = reply.get("options")
+            session_ids.append(session_id)
+    return session_ids
+
+
+def main_bench(args):
+    main.session_store = InMemorySessionStore(max_sessions=10000, ttl_seconds=3600)
+    main.app.state.llm_service = make_fake_service(cache=EvaluationCache(max_entries=1, ttl_seconds=1), latency=0)
+    session_ids = asyncio.run(finish_interviews(args, random.Random(args.seed)))
+
+    rows = {}
+    for session_id in session_ids:
+        session = main.session_store.get(session_id)
+        last = len(session.question_ids) - 1
+        slim_request = main.UserResponse(session_id=session_id, answer="", slim_report=True)
+        variants = {
+            "jsonable + json": lambda: JSONResponse(jsonable_encoder(main.answer_payload(session, last))).body,
+            "orjson": lambda: ORJSONResponse(main.answer_payload(session, last)).body,
+            "orjson, slim report": lambda: ORJSONResponse(
+                main.submit_result(main.answer_payload(session, last), slim_request)).body,
+            "details page": lambda: run_now(
+                main.get_report_details(session_id, 0, InterviewConfig.REPORT_DETAILS_PAGE_SIZE)).body
+        }
+        for label, render in variants.items():
+            micros, body = time_call(render, args.repeat)
+            rows.setdefault(label, []).append((micros, body))
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    print(f"{len(session_ids)} completed interviews, {args.answer_chars}-char open-ended answers")
+    print(f"  {'payload':<22}{'build+json us':>14}{'bytes':>9}" + "".join(f"{name:>9}" for name in encodings)
+          + f"{'compress us':>13}")
+    for label, results in rows.items():
+        micros = statistics.median(micros for micros, _ in results)
+        sizes = [len(body) for _, body in results]
+        compressed, compress_micros = [], []
+        for encoding in encodings:
+            timed = [time_call(lambda: Compressor(encoding).compress(body, final=True), args.repeat)
+                     for _, body in results]
+            compressed.append(statistics.median(len(out) for _, out in timed))
+            compress_micros.append(statistics.median(us for us, _ in timed))
+        print(f"  {label:<22}{micros:>14.1f}{statistics.median(sizes):>9.0f}"
+              + "".join(f"{size:>9.0f}" for size in compressed)
+              + f"{'/'.join(f'{us:.0f}' for us in compress_micros):>13}")
+    if brotli is None:
+        print("  (brotli not installed: pip install brotli to compare it)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--answer-chars", type=int, default=1200, help="Length of each open-ended answer")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing runs per payload")
+    parser.add_argument("--seed", type=int, default=1)
+    main_bench(parser.parse_args())
@@ -0,0 +1,64 @@
+"""
+Bytes held per active and per completed interview session.
+
+Sessions are driven through the real handlers against the in-process store
+and a zero-latency fake model. Run from the backend directory:
+    python -m benchmarks.bench_session_memory --sessions 2000
+"""
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+import app.main as main
+from app.evaluation_cache import EvaluationCache
+from app.session_store import InMemorySessionStore
+from benchmarks.fake_llm import make_fake_service
+
+
+async def run_sessions(count: int, answers: int):
+    for i in range(count):
+        started = await main.start_interview(main.StartInterviewRequest(user_name=f"candidate-{i}"))
+        for turn in range(answers):
+            await main.submit_answer(main.UserResponse(
+                session_id=started["session_id"],
+                answer=f"Candidate {i} answer {turn}: I would use INDEX/MATCH with a helper column."
+            ))
+
+
+def measure(count: int, answers: int) -> float:
+    """Average bytes retained per session after `answers` submissions each"""
+    main.session_store = InMemorySessionStore(ttl_seconds=3600, max_sessions=count * 2)
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    asyncio.run(run_sessions(count, answers))
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return retained / count
+
+
+def main_cli(sessions: int, answer_chars: int):
+    # A one-entry cache keeps cached evaluations out of the per-session figure
+    main.app.state.llm_service = make_fake_service(
+        cache=EvaluationCache(max_entries=1, ttl_seconds=60),
+        latency=0,
+        correct_answer_chars=answer_chars
+    )
+    tracemalloc.start()
+    measure(10, 10)  # warm up imports and interned strings
+    active = measure(sessions, 5)
+    completed = measure(sessions, 10)
+    tracemalloc.stop()
+
+    print(f"{sessions} sessions, {answer_chars}-char reference answers")
+    print(f"  active (5 of 10 answered) {active:10,.0f} bytes/session")
+    print(f"  completed                 {completed:10,.0f} bytes/session")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--answer-chars", type=int, default=1500, help="Length of each fake reference answer")
+    args = parser.parse_args()
+    main_cli(args.sessions, args.answer_chars)
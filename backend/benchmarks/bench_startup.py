@@ -0,0 +1,79 @@
+"""
+Cold-start cost of importing app.main and running its startup.
+
+Each sample is a fresh interpreter, like a worker boot after a Railway
+restart. Run from the backend directory:
+    python -m benchmarks.bench_startup --runs 5 --fail-above 3.0
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SNIPPET = """
+import asyncio, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+async def boot():
+    async with app.main.lifespan(app.main.app):
+        pass
+asyncio.run(boot())
+print(f"{imported - started:.4f} {time.perf_counter() - imported:.4f}")
+"""
+
+
+def run_once():
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    total = time.perf_counter() - started
+    import_time, lifespan_time = (float(value) for value in output.split())
+    return total, import_time, lifespan_time
+
+
+def slowest_imports(limit):
+    """Top cumulative entries from python -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match and len(match.group(2)) <= 2:
+            rows.append((int(match.group(1)), match.group(3)))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main(runs, top, fail_above):
+    samples = [run_once() for _ in range(runs)]
+    totals, imports, lifespans = zip(*samples)
+    print(f"{runs} cold starts")
+    print(f"  process total   median={statistics.median(totals):.3f}s  max={max(totals):.3f}s")
+    print(f"  import app.main median={statistics.median(imports):.3f}s  max={max(imports):.3f}s")
+    print(f"  lifespan start  median={statistics.median(lifespans):.3f}s  max={max(lifespans):.3f}s")
+
+    print("Slowest top-level imports:")
+    for micros, module in slowest_imports(top):
+        print(f"  {micros / 1000:8.1f}ms  {module}")
+
+    if fail_above is not None and statistics.median(totals) > fail_above:
+        print(f"Median cold start exceeds {fail_above:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    parser.add_argument("--fail-above", type=float, default=None, help="Exit non-zero if the median exceeds this many seconds")
+    args = parser.parse_args()
+    main(args.runs, args.top, args.fail_above)
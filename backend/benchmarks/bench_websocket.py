@@ -0,0 +1,181 @@
+"""
+Per-turn overhead and server CPU per interview: WebSocket against HTTP.
+
+Both paths drive the ASGI app directly, with no client library in the
+measurement, so the numbers are the server's own cost: middleware, routing,
+parsing, session handling and serialization. The fake model answers
+instantly, leaving only that overhead. HTTP submits with defer_evaluation
+and question_number, the closest match to what the WebSocket does. Run from
+the backend directory:
+    python -m benchmarks.bench_websocket --sessions 300
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import app.main as main
+from app.evaluation_cache import EvaluationCache
+from app.session_store import InMemorySessionStore
+from benchmarks.fake_llm import make_fake_service
+from benchmarks.load_test import OPEN_ENDED_ANSWERS, percentile
+
+ORIGIN = (b"origin", b"http://localhost:5173")
+
+
+async def http_call(method: str, path: str, body: dict = None):
+    """One HTTP request through the app; returns (status, JSON body, bytes on the wire)"""
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode("ascii"), "query_string": b"",
+        "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 50000),
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode("ascii")), ORIGIN],
+    }
+    received = False
+    status, chunks, header_bytes = 0, [], 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        nonlocal status, header_bytes
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            header_bytes = sum(len(name) + len(value) + 4 for name, value in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await main.app(scope, receive, send)
+    data = b"".join(chunks)
+    return status, json.loads(data), len(payload) + len(data) + header_bytes
+
+
+class SocketClient:
+    """Client end of a WebSocket connected straight to the app"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes = 0
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    async def connect(self):
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "ws",
+            "path": self.path, "raw_path": self.path.encode("ascii"), "query_string": b"", "root_path": "",
+            "server": ("bench", 80), "client": ("127.0.0.1", 50000), "subprotocols": [],
+            "headers": [(b"host", b"bench"), ORIGIN],
+        }
+        self._to_app.put_nowait({"type": "websocket.connect"})
+        self._task = asyncio.create_task(main.app(scope, self._to_app.get, self._from_app.put))
+        accepted = await self._from_app.get()
+        assert accepted["type"] == "websocket.accept", accepted
+
+    async def send(self, message: dict):
+        text = json.dumps(message)
+        self.bytes += len(text)
+        self._to_app.put_nowait({"type": "websocket.receive", "text": text})
+
+    async def receive(self) -> dict:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            return {"type": "closed"}
+        self.bytes += len(message["text"])
+        return json.loads(message["text"])
+
+    async def close(self):
+        self._to_app.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await self._task
+
+
+def pick_answer(question_type: str, rng: random.Random) -> str:
+    return rng.choice("ABCD") if question_type == "mcq" else rng.choice(OPEN_ENDED_ANSWERS[:3])
+
+
+async def http_interview(number: int, turns: list, rng: random.Random) -> int:
+    _, payload, wire = await http_call("POST", "/api/interview/start", {"user_name": f"candidate-{number}"})
+    session_id = payload["session_id"]
+    question_type, question_number = payload["question_type"], payload["question_number"]
+    while True:
+        started = time.perf_counter()
+        _, payload, size = await http_call("POST", "/api/interview/submit-answer", {
+            "session_id": session_id, "answer": pick_answer(question_type, rng),
+            "question_number": question_number, "defer_evaluation": True
+        })
+        turns.append(time.perf_counter() - started)
+        wire += size
+        if payload["status"] == "completed":
+            return wire
+        question_type, question_number = payload["question_type"], payload["question_number"]
+
+
+async def socket_interview(number: int, turns: list, rng: random.Random) -> int:
+    _, payload, wire = await http_call("POST", "/api/interview/start", {"user_name": f"candidate-{number}"})
+    client = SocketClient(f"/ws/interview/{payload['session_id']}")
+    await client.connect()
+    message = await client.receive()
+    while message["type"] != "question":
+        message = await client.receive()
+    while True:
+        started = time.perf_counter()
+        await client.send({"type": "answer", "answer": pick_answer(message["question_type"], rng),
+                           "question_number": message["question_number"]})
+        message = await client.receive()
+        while message["type"] == "evaluation":
+            message = await client.receive()
+        turns.append(time.perf_counter() - started)
+        if message["type"] == "completed":
+            break
+    await client.close()
+    return wire + client.bytes
+
+
+async def measure(name: str, interview, sessions: int, seed: int) -> dict:
+    main.session_store = InMemorySessionStore(ttl_seconds=3600, max_sessions=sessions * 2)
+    rng = random.Random(seed)
+    turns, wire = [], 0
+    # Warm up routes, the question bank and the pre-scorer
+    await interview(-1, [], rng)
+    cpu_started, started = time.process_time(), time.perf_counter()
+    for number in range(sessions):
+        wire += await interview(number, turns, rng)
+    cpu, elapsed = time.process_time() - cpu_started, time.perf_counter() - started
+    return {
+        "name": name, "turn_p50": statistics.median(turns), "turn_p99": percentile(turns, 99),
+        "cpu": cpu / sessions, "wall": elapsed / sessions, "bytes": wire / sessions
+    }
+
+
+async def run(args):
+    main.app.state.llm_service = make_fake_service(
+        cache=EvaluationCache(max_entries=1, ttl_seconds=1), client_rpm=None, latency=0.0
+    )
+    results = [
+        await measure("http", http_interview, args.sessions, args.seed),
+        await measure("websocket", socket_interview, args.sessions, args.seed),
+    ]
+    print(f"{args.sessions} interviews each, one at a time, instant fake model")
+    print(f"  {'path':<11}{'turn p50 us':>13}{'turn p99 us':>13}{'CPU ms/interview':>18}{'bytes/interview':>17}")
+    for result in results:
+        print(f"  {result['name']:<11}{result['turn_p50'] * 1e6:>13.0f}{result['turn_p99'] * 1e6:>13.0f}"
+              f"{result['cpu'] * 1000:>18.2f}{result['bytes']:>17.0f}")
+    http, socket = results
+    print(f"  websocket: {1 - socket['cpu'] / http['cpu']:.0%} less CPU per interview, "
+          f"{1 - socket['turn_p50'] / http['turn_p50']:.0%} lower median turn, "
+          f"{1 - socket['bytes'] / http['bytes']:.0%} fewer bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,121 @@
+# Local stand-in for the Gemini model so benchmarks run without network access
+import random
+import time
+from collections import deque
+from typing import Optional
+
+from google.api_core import exceptions as google_exceptions
+
+from app.providers import LocalModel, LocalResponse
+
+# Ways real model JSON goes wrong, applied to a `malformed_rate` share of JSON responses
+MALFORMATIONS = {
+    "fenced": lambda text: f"Here is the evaluation:\n```json\n{text}\n```\nLet me know if you need more.",
+    "trailing_comma": lambda text: text[:-1] + ",\n" + text[-1],
+    "raw_newline": lambda text: text.replace('"feedback": "', '"feedback": "Overall:\n', 1),
+    "truncated": lambda text: text[:len(text) * 3 // 4],
+    "out_of_range": lambda text: text.replace('"score": ', '"score": 1', 1),
+    "prose": lambda text: "I'm sorry, I can't evaluate this answer in the requested format."
+}
+
+class FakeGenerativeModel(LocalModel):
+    """LocalModel with configurable latency and faults.
+
+    Latency is `latency` seconds, or lognormal around that median when
+    `latency_sigma` is set, plus `latency_per_1k_tokens` for every thousand
+    (estimated) prompt tokens, since long prompts are slower to process, and
+    `latency_per_1k_output_tokens` for every thousand tokens generated.
+    `error_rate` of calls raise ServiceUnavailable, and calls beyond
+    `rate_limit_per_minute` in a sliding minute raise ResourceExhausted
+    (HTTP 429), like the real API. `malformed_rate` of JSON responses are
+    corrupted in one of the MALFORMATIONS ways, picked at random.
+    """
+
+    def __init__(self, latency: float = 2.0, score: int = 7, correct_answer_chars: int = 0,
+                 latency_sigma: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_per_minute: Optional[int] = None, seed: Optional[int] = None,
+                 latency_per_1k_tokens: float = 0.0, latency_per_1k_output_tokens: float = 0.0,
+                 malformed_rate: float = 0.0, model_name: str = "fake"):
+        super().__init__(model_name=model_name, score=score, correct_answer_chars=correct_answer_chars)
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.latency_per_1k_output_tokens = latency_per_1k_output_tokens
+        self.malformed_rate = malformed_rate
+        self.malformed = {kind: 0 for kind in MALFORMATIONS}
+        self.prompt_chars = 0
+        self.completion_chars = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._recent_calls = deque()
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        latency = self._admit() + self.latency_per_1k_tokens * len(prompt) / 4000
+        text = self._malform(self.respond(prompt))
+        latency += self.latency_per_1k_output_tokens * len(text) / 4000
+        with self._lock:
+            self.prompt_chars += len(prompt)
+            self.completion_chars += len(text)
+        if stream:
+            return self._slow_stream(text, latency)
+        time.sleep(latency)
+        return LocalResponse(text)
+
+    def _admit(self) -> float:
+        """Count the call, apply simulated faults and pick its latency"""
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            if self.rate_limit_per_minute is not None:
+                while self._recent_calls and now - self._recent_calls[0] > 60:
+                    self._recent_calls.popleft()
+                if len(self._recent_calls) >= self.rate_limit_per_minute:
+                    self.rate_limited += 1
+                    raise google_exceptions.ResourceExhausted("Simulated quota exceeded")
+                self._recent_calls.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                raise google_exceptions.ServiceUnavailable("Simulated backend error")
+            if self.latency_sigma:
+                return self.latency * self._random.lognormvariate(0, self.latency_sigma)
+            return self.latency
+
+    def _malform(self, text: str) -> str:
+        if not self.malformed_rate or text[:1] not in "{[":
+            return text
+        with self._lock:
+            if self._random.random() >= self.malformed_rate:
+                return text
+            kind = self._random.choice(list(MALFORMATIONS))
+            self.malformed[kind] += 1
+        return MALFORMATIONS[kind](text)
+
+    def _slow_stream(self, text: str, latency: float, chunks: int = 10):
+        for chunk in self._stream(text, chunks):
+            time.sleep(latency / chunks)
+            yield chunk
+
+
+def make_fake_service(cache=None, client_rpm: Optional[float] = None, hedge: Optional[dict] = None, **model_kwargs):
+    """GeminiService over a fake model.
+
+    `hedge`, if given, holds FakeGenerativeModel arguments for a secondary
+    backend that receives hedged requests. Client-side rate limiting is
+    lifted unless `client_rpm` is given.
+    """
+    from app.llm_service import GeminiService
+    from app.providers import LLMBackend
+    from app.resilience import TokenBucket
+
+    backends = [LLMBackend("fake", FakeGenerativeModel(**model_kwargs))]
+    if hedge is not None:
+        backends.append(LLMBackend("fake", FakeGenerativeModel(**dict({"model_name": "fake-hedge"}, **hedge))))
+    service = GeminiService(cache=cache, backends=backends)
+    if client_rpm is None:
+        service.rate_limiter = TokenBucket(rate_per_minute=1e9, capacity=1_000_000)
+    else:
+        service.rate_limiter = TokenBucket(rate_per_minute=client_rpm, capacity=service.rate_limiter.capacity)
+    return service
@@ -0,0 +1,163 @@
+"""
+In-process load test: full interviews against the ASGI app and a fake LLM.
+
+Each virtual candidate starts an interview, answers all ten questions and
+receives the final report. Nothing leaves the process, so results are
+comparable between runs. Run from the backend directory:
+    python -m benchmarks.load_test --sessions 200 --concurrency 50 --latency 1.5 --sigma 0.5
+    python -m benchmarks.load_test --duplicates 3   # every answer double-submitted, as in a retry storm
+"""
+import argparse
+import asyncio
+import random
+import resource
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+
+import httpx
+
+import app.main as main
+from app import metrics
+from app.evaluation_cache import EvaluationCache
+from app.session_store import InMemorySessionStore
+from benchmarks.fake_llm import make_fake_service
+
+OPEN_ENDED_ANSWERS = [
+    "I would use XLOOKUP because it can search left and returns a default when nothing matches.",
+    "Convert the range to a table, build pivot tables on it and refresh them with a macro.",
+    "Remove duplicates, use TRIM and PROPER for text, and Power Query for repeatable cleaning.",
+    "",
+    "I don't know.",
+]
+
+
+ROUTES = ("start", "submit_mcq", "submit_general", "submit_final")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_interview(client, number, latencies, defer, rng, duplicates=1):
+    """One candidate from start to final report; returns wall time in seconds.
+
+    Each answer is sent `duplicates` times at once; every copy must get the same response.
+    """
+    started = time.perf_counter()
+
+    t = time.perf_counter()
+    response = await client.post("/api/interview/start", json={"user_name": f"candidate-{number}"})
+    latencies["start"].append(time.perf_counter() - t)
+    payload = response.json()
+    session_id = payload["session_id"]
+    question_type = payload["question_type"]
+    question_number = payload["question_number"]
+
+    while True:
+        if question_type == "mcq":
+            answer, route = rng.choice("ABCD"), "submit_mcq"
+        else:
+            answer, route = rng.choice(OPEN_ENDED_ANSWERS), "submit_general"
+        t = time.perf_counter()
+        body = {"session_id": session_id, "answer": answer, "defer_evaluation": defer, "question_number": question_number}
+        responses = await asyncio.gather(*(
+            client.post("/api/interview/submit-answer", json=body) for _ in range(duplicates)
+        ))
+        payload = responses[0].json()
+        if any(response.json() != payload for response in responses[1:]):
+            latencies["mismatched"].append(0)
+        if payload["status"] == "completed":
+            latencies["submit_final"].append(time.perf_counter() - t)
+            return time.perf_counter() - started
+        latencies[route].append(time.perf_counter() - t)
+        question_type = payload["question_type"]
+        question_number = payload["question_number"]
+
+
+async def run(args):
+    service = make_fake_service(
+        cache=None if args.cache else EvaluationCache(max_entries=1, ttl_seconds=1),
+        client_rpm=args.client_rpm,
+        latency=args.latency,
+        latency_sigma=args.sigma,
+        error_rate=args.error_rate,
+        rate_limit_per_minute=args.server_rpm,
+        correct_answer_chars=args.answer_chars,
+        seed=args.seed,
+        hedge=None if args.hedge_latency is None else {
+            "latency": args.hedge_latency, "latency_sigma": args.sigma, "seed": args.seed + 1
+        }
+    )
+    main.app.state.llm_service = service
+    main.session_store = InMemorySessionStore(ttl_seconds=3600, max_sessions=args.sessions * 2)
+    if args.no_pre_score:
+        main.pre_scorer = None
+
+    rng = random.Random(args.seed)
+    latencies = defaultdict(list)
+    interview_times = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def candidate(number):
+        async with semaphore:
+            interview_times.append(await run_interview(client, number, latencies, args.defer, rng, args.duplicates))
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(candidate(number) for number in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    requests = len(latencies["start"]) + sum(len(latencies[route]) for route in ROUTES[1:]) * args.duplicates
+    model = service.model
+    print(f"{args.sessions} interviews, concurrency {args.concurrency}, "
+          f"fake latency {args.latency}s (sigma {args.sigma}), defer={args.defer}")
+    print(f"  elapsed {elapsed:.2f}s  {requests / elapsed:.1f} req/s  {args.sessions / elapsed:.2f} interviews/s")
+    print(f"  {'route':<16}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route in ROUTES:
+        values = latencies[route]
+        if values:
+            print(f"  {route:<16}{len(values):>7}{statistics.median(values) * 1000:>10.1f}"
+                  f"{percentile(values, 95) * 1000:>10.1f}{percentile(values, 99) * 1000:>10.1f}")
+    print(f"  interview wall time p50={statistics.median(interview_times):.2f}s "
+          f"p99={percentile(interview_times, 99):.2f}s")
+    saved = sum(metrics.llm_calls_saved.value(reason=reason) for reason in ("empty", "too_short", "off_topic"))
+    print(f"  model calls={model.calls} simulated errors={model.errors} simulated 429s={model.rate_limited} "
+          f"saved by pre-scorer={saved:.0f}")
+    if args.duplicates > 1:
+        corrupted = sum(1 for session in main.session_store.iter_sessions() if len(session.responses) != 10)
+        print(f"  duplicates: {args.duplicates} copies per answer, shared in flight={main.submissions.shared}, "
+              f"mismatched responses={len(latencies['mismatched'])}, sessions with extra answers={corrupted}")
+    if service.hedge is not None:
+        outcomes = ("primary", "budget_exhausted", "primary_won", "hedge_won", "fallback")
+        print("  hedging: " + " ".join(f"{outcome}={metrics.llm_hedges.value(outcome=outcome):.0f}" for outcome in outcomes)
+              + f"  hedge model calls={service.hedge.model.calls}")
+    print(f"  peak traced memory {peak_traced / 2**20:.1f} MiB, "
+          f"max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200, help="Interviews to run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Interviews in flight at once")
+    parser.add_argument("--latency", type=float, default=1.0, help="Median fake model latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.0, help="Lognormal sigma for latency; 0 is fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of model calls that fail with 503")
+    parser.add_argument("--server-rpm", type=int, default=None, help="Simulated API quota; excess calls get 429")
+    parser.add_argument("--client-rpm", type=float, default=None, help="Client-side token bucket rate; default unlimited")
+    parser.add_argument("--answer-chars", type=int, default=1500, help="Length of each fake reference answer")
+    parser.add_argument("--defer", action="store_true", help="Submit open-ended answers with defer_evaluation")
+    parser.add_argument("--cache", action="store_true", help="Keep the evaluation cache enabled")
+    parser.add_argument("--hedge-latency", type=float, default=None,
+                        help="Add a secondary fake model with this median latency for hedged requests")
+    parser.add_argument("--duplicates", type=int, default=1, help="Copies of each answer submitted at once")
+    parser.add_argument("--no-pre-score", action="store_true", help="Send every open-ended answer to the model")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
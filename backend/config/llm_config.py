@@ -13,14 +13,25 @@ class LLMConfig:
     
     # API Configuration
     API_KEY = os.getenv("GEMINI_API_KEY", "")
-    MODEL = "gemini-pro"
+    MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    
+    # Backends as "<kind>:<model>" (kinds: gemini, local). The first is the primary; the
+    # second, if any, receives hedged requests when the primary is slower than its p95
+    BACKENDS = [
+        spec for spec in os.getenv("LLM_BACKENDS", f"gemini:{MODEL},gemini:gemini-1.5-flash-8b").split(",")
+        if spec.strip()
+    ]
     
     # API Endpoints
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
     
     # Rate Limiting
     MAX_REQUESTS_PER_MINUTE = 60  # Gemini free tier limit
+    RATE_LIMIT_BURST = 10  # Requests allowed back-to-back before smoothing kicks in
+    RATE_LIMIT_MAX_WAIT = 120  # seconds a call may queue for a token before falling back
     MAX_TOKENS_PER_REQUEST = 32768  # Gemini context window
+    STARTUP_PROBE = os.getenv("LLM_STARTUP_PROBE", "false").lower() == "true"  # One live call at boot to gate readiness
+    MAX_CONCURRENT_EVALUATIONS = int(os.getenv("LLM_MAX_CONCURRENT_EVALUATIONS", "8"))  # Executor threads for blocking SDK calls
     
     # Temperature settings for different use cases
     TEMPERATURE_EVALUATION = 0.3  # Lower for consistent evaluation
@@ -28,10 +39,38 @@ class LLMConfig:
     
     # Retry Configuration
     MAX_RETRIES = 3
-    RETRY_DELAY = 1  # seconds
+    RETRY_DELAY = 1  # seconds, base for jittered exponential backoff
+    MAX_RETRY_DELAY = 20  # seconds
+    
+    # Circuit Breaker
+    CIRCUIT_BREAKER_THRESHOLD = 5  # Consecutive failures before calls are suspended
+    CIRCUIT_BREAKER_RESET = 30  # seconds before a trial call is let through
+    
+    # Hedged Requests
+    HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))  # Max hedges per primary request, sustained
+    HEDGE_BUDGET_BURST = 10  # Unused hedges that can be saved up
+    HEDGE_PERCENTILE = 95  # Hedge once the primary is slower than this percentile of its recent calls
+    HEDGE_LATENCY_WINDOW = 200  # Recent successful calls per backend used for that percentile
+    HEDGE_MIN_SAMPLES = 20  # Below this many samples HEDGE_DEFAULT_DELAY is used instead
+    HEDGE_DEFAULT_DELAY = 8.0  # seconds
+    HEDGE_MIN_DELAY = 0.5  # seconds; never hedge sooner than this
     
     # Response Configuration
     MAX_OUTPUT_TOKENS = 2048
+    MAX_REASKS = int(os.getenv("LLM_MAX_REASKS", "1"))  # Extra calls for an evaluation that is invalid even after local repair
+    
+    # Prompt Budget: longer answers keep their start and end, with a marker for the cut
+    # (MAX_BATCH_SIZE answers at this cap stay well inside MAX_TOKENS_PER_REQUEST)
+    MAX_ANSWER_TOKENS = int(os.getenv("LLM_MAX_ANSWER_TOKENS", "1000"))
+    
+    # Batch Evaluation
+    MAX_BATCH_SIZE = 5  # Answers packed into one prompt
+    
+    # Evaluation Cache
+    EVALUATION_CACHE_SIZE = int(os.getenv("EVALUATION_CACHE_SIZE", "5000"))  # Entries kept in memory
+    EVALUATION_CACHE_TTL = int(os.getenv("EVALUATION_CACHE_TTL", "86400"))  # seconds
+    EVALUATION_CACHE_PATH = os.getenv("EVALUATION_CACHE_PATH", "")  # SQLite file for persistence, empty disables
+    EVALUATION_CACHE_MAX_ROWS = int(os.getenv("EVALUATION_CACHE_MAX_ROWS", "100000"))  # Rows kept in the SQLite file, 0 is unbounded
     
     @classmethod
     def validate(cls):
@@ -48,6 +87,24 @@ class LLMConfig:
 class InterviewConfig:
     """Configuration for Excel Interview System"""
     
+    # Question Bank
+    QUESTION_BANK_DIR = os.getenv(
+        "QUESTION_BANK_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "questions")
+    )
+    # Model-written reference answers for questions without an authored reference_answer, filled on first use
+    REFERENCE_ANSWERS_PATH = os.getenv(
+        "REFERENCE_ANSWERS_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "reference_answers.json")
+    )
+    REFERENCE_ANSWER_RETRY_AFTER = float(os.getenv("REFERENCE_ANSWER_RETRY_AFTER", "300"))  # Seconds a question goes without one after its generation fails
+    # Stratified selection, filled in order; each stratum may filter on
+    # question_type, category and difficulty
+    QUESTION_MIX = [
+        {"count": 5, "question_type": "mcq"},
+        {"count": 5, "question_type": "general"}
+    ]
+    
     # Interview Structure
     TOTAL_QUESTIONS = 5
     WARM_UP_QUESTIONS = 1
@@ -55,8 +112,46 @@ class InterviewConfig:
     SCENARIO_QUESTIONS = 1
     
     # Time Limits (in seconds)
-    MAX_ANSWER_TIME = 300  # 5 minutes per question
-    TOTAL_INTERVIEW_TIME = 1800  # 30 minutes total
+    MAX_ANSWER_TIME = int(os.getenv("MAX_ANSWER_TIME", "300"))  # 5 minutes per question
+    TOTAL_INTERVIEW_TIME = int(os.getenv("TOTAL_INTERVIEW_TIME", "1800"))  # 30 minutes total
+    ENFORCE_TIME_LIMITS = os.getenv("ENFORCE_TIME_LIMITS", "false").lower() == "true"  # Off until the frontend shows a timer and handles timed-out questions
+    TIME_LIMIT_GRACE = float(os.getenv("TIME_LIMIT_GRACE", "5"))  # Allowance for network and client delay
+    ABANDON_AFTER_TIMEOUTS = int(os.getenv("ABANDON_AFTER_TIMEOUTS", "2"))  # Questions timed out in a row before the session is dropped, 0 never drops
+    DEADLINE_SWEEP_INTERVAL = float(os.getenv("DEADLINE_SWEEP_INTERVAL", "1.0"))  # Seconds between checks for expired deadlines
+    
+    # Deferred Evaluation ("queue": evaluate in the background, "batch": one LLM call when the interview ends)
+    DEFERRED_EVALUATION_MODE = os.getenv("DEFERRED_EVALUATION_MODE", "queue")
+    
+    # Local Pre-Scoring: empty, very short and off-topic answers are scored without an LLM call
+    PRE_SCORING_ENABLED = os.getenv("PRE_SCORING_ENABLED", "true").lower() == "true"
+    CONCEPT_LEXICON_PATH = os.getenv(
+        "CONCEPT_LEXICON_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "concept_lexicon.json")
+    )
+    PRE_SCORE_MIN_WORDS = int(os.getenv("PRE_SCORE_MIN_WORDS", "5"))  # Shorter answers are scored locally
+    PRE_SCORE_MIN_SIMILARITY = float(os.getenv("PRE_SCORE_MIN_SIMILARITY", "0.05"))  # TF-IDF cosine below this, with no concept hit, is off-topic
+    PRE_SCORE_MAX_LOCAL_SCORE = 3  # Ceiling for a locally scored short answer, scaled by concept coverage
+    
+    # Session Storage
+    SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "")  # e.g. redis://localhost:6379/0, empty keeps sessions in-process
+    SESSION_TTL = int(os.getenv("SESSION_TTL", "7200"))  # Idle seconds before a session is evicted
+    MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "10000"))  # Cap on sessions held by the in-process store
+    SESSION_JOURNAL_PATH = os.getenv("SESSION_JOURNAL_PATH", "")  # Event journal for the in-process store, replayed at startup; empty disables
+    SESSION_JOURNAL_FLUSH_INTERVAL = float(os.getenv("SESSION_JOURNAL_FLUSH_INTERVAL", "0.05"))  # seconds of events gathered per fsync
+    SESSION_JOURNAL_COMPACT_EVERY = int(os.getenv("SESSION_JOURNAL_COMPACT_EVERY", "20000"))  # Events between snapshots
+    COMPLETED_SESSIONS_PATH = os.getenv("COMPLETED_SESSIONS_PATH", "")  # Archive of completed interviews for exports; empty reads only sessions still in the store
+    
+    # Admin Endpoints (report export, cohort analytics)
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")  # Required in X-API-Key for /api/export and /api/analytics when set
+    
+    # Response Payloads
+    RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"  # gzip, or brotli when installed, for clients that accept it
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes; smaller responses are sent as-is
+    REPORT_DETAILS_PAGE_SIZE = 5  # Default page of /report/details; slim reports leave the per-question detail to it
+    REPORT_DETAILS_MAX_PAGE_SIZE = 50
+    
+    # Observability
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"  # Add a Server-Timing header (llm, parse, app) to responses
     
     # Scoring Weights
     SCORING_WEIGHTS = {
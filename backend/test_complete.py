@@ -1,4 +1,6 @@
-from app.llm_service import llm_service
+from app.llm_service import GeminiService
+
+llm_service = GeminiService()
 
 print("Testing LLM Service...")
 
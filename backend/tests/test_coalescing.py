@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.coalescing import SingleFlight
+
+
+def test_concurrent_calls_with_one_key_share_one_run():
+    async def scenario():
+        flight = SingleFlight()
+        runs = []
+        release = asyncio.Event()
+
+        async def call():
+            runs.append(1)
+            await release.wait()
+            return {"answer": 42}
+
+        tasks = [asyncio.create_task(flight.run("key", call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert "key" in flight and len(flight) == 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return flight, runs, results
+
+    flight, runs, results = asyncio.run(scenario())
+    assert len(runs) == 1
+    assert flight.shared == 4
+    assert all(result is results[0] for result in results)
+    # Nothing is kept once the call settles
+    assert len(flight) == 0
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+        runs = []
+
+        async def call(key):
+            runs.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        results = await asyncio.gather(*(flight.run(key, lambda key=key: call(key)) for key in "abc"))
+        return runs, results
+
+    runs, results = asyncio.run(scenario())
+    assert sorted(runs) == ["a", "b", "c"]
+    assert results == ["a", "b", "c"]
+
+
+def test_followers_get_the_owners_exception():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0)
+            raise ValueError("model down")
+
+        return await asyncio.gather(*(flight.run("key", call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_followers_start_over_when_the_owner_is_cancelled():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+        owner_started = asyncio.Event()
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 1:
+                owner_started.set()
+                await asyncio.sleep(3600)
+            return "second run"
+
+        owner = asyncio.create_task(flight.run("key", call))
+        await owner_started.wait()
+        follower = asyncio.create_task(flight.run("key", call))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await follower, len(calls)
+
+    assert asyncio.run(scenario()) == ("second run", 2)
+
+
+def test_a_cancelled_follower_does_not_cancel_the_owner():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        owner = asyncio.create_task(flight.run("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.run("key", call))
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+        return await owner
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,47 @@
+from app import deadlines as deadlines_module
+from app.deadlines import DeadlineScheduler
+
+
+def test_pop_due_returns_expired_keys_earliest_first():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("late", 30)
+    scheduler.schedule("early", 10)
+    scheduler.schedule("middle", 20)
+
+    assert scheduler.pop_due(5) == []
+    assert scheduler.pop_due(20) == ["early", "middle"]
+    assert "late" in scheduler and "early" not in scheduler
+    assert len(scheduler) == 1
+
+
+def test_rescheduling_replaces_the_deadline():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("a", 10)
+    scheduler.schedule("a", 50)
+    assert scheduler.pop_due(20) == []
+    assert scheduler.pop_due(50) == ["a"]
+    scheduler.schedule("b", 60)
+    scheduler.schedule("b", 40)
+    assert scheduler.pop_due(45) == ["b"]
+    assert scheduler.pop_due(100) == []
+
+
+def test_cancelled_keys_never_come_due():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("a", 10)
+    scheduler.schedule("b", 10)
+    scheduler.cancel("a")
+    scheduler.cancel("missing")
+    assert scheduler.pop_due(10) == ["b"]
+    assert len(scheduler) == 0
+
+
+def test_stale_entries_are_compacted_away(monkeypatch):
+    monkeypatch.setattr(deadlines_module, "_COMPACT_MIN", 8)
+    scheduler = DeadlineScheduler()
+    for round_number in range(100):
+        scheduler.schedule("a", 1000 + round_number)
+        scheduler.schedule("b", 2000 - round_number)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 8
+    assert scheduler.pop_due(1099) == ["a"]
+    assert scheduler.pop_due(1901) == ["b"]
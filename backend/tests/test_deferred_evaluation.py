@@ -0,0 +1,71 @@
+import asyncio
+
+import fakeredis
+
+import app.main as main
+from app.session_model import ResponseRecord, SessionRecord
+from app.session_store import RedisSessionStore
+from benchmarks.fake_llm import make_fake_service
+
+
+def test_an_answer_queued_on_another_worker_and_batch_scored_here_counts_once(monkeypatch):
+    client = fakeredis.FakeRedis()
+    this_worker = RedisSessionStore(client, ttl_seconds=60)
+    other_worker = RedisSessionStore(client, ttl_seconds=60)
+    general_id = main.question_bank.ids(question_type="general")[0]
+    session = SessionRecord("race", "candidate", [general_id])
+    session.responses.append(ResponseRecord("An answer still queued on the other worker", 1.0))
+    session.current_question_index = 1
+    this_worker.save(session)
+
+    service = make_fake_service(latency=0, score=8)
+    batch = service.evaluate_answers_batch_async
+
+    async def batch_while_the_other_worker_stores(items):
+        evaluations = await batch(items)
+        # The other worker's queued evaluation lands while this batch is in flight
+        monkeypatch.setattr(main, "session_store", other_worker)
+        main.store_deferred_evaluation("race", 0, {"score": 8, "feedback": "From the queue"})
+        monkeypatch.setattr(main, "session_store", this_worker)
+        return evaluations
+
+    monkeypatch.setattr(service, "evaluate_answers_batch_async", batch_while_the_other_worker_stores)
+    monkeypatch.setattr(main, "session_store", this_worker)
+    monkeypatch.setattr(main, "session_journal", None)
+    monkeypatch.setattr(main, "completed_archive", None)
+    main.app.state.llm_service = service
+    try:
+        completed = asyncio.run(main.complete_interview(this_worker.get("race")))
+    finally:
+        service.close()
+        main.app.state.llm_service = None
+
+    stored = this_worker.get("race")
+    assert stored.aggregate["general_count"] == 1
+    assert stored.aggregate["general_sum"] == 8
+    assert stored.responses[0].evaluation["feedback"] == "From the queue"
+    assert stored.end_time is not None and completed.end_time == stored.end_time
+
+
+def test_a_queued_evaluation_arriving_after_the_batch_is_ignored(monkeypatch):
+    client = fakeredis.FakeRedis()
+    general_id = main.question_bank.ids(question_type="general")[0]
+    session = SessionRecord("late", "candidate", [general_id])
+    session.responses.append(ResponseRecord("An answer the batch scores first", 1.0))
+    session.current_question_index = 1
+    monkeypatch.setattr(main, "session_store", RedisSessionStore(client, ttl_seconds=60))
+    monkeypatch.setattr(main, "session_journal", None)
+    monkeypatch.setattr(main, "completed_archive", None)
+    main.session_store.save(session)
+    main.app.state.llm_service = make_fake_service(latency=0, score=8)
+    try:
+        asyncio.run(main.complete_interview(main.session_store.get("late")))
+    finally:
+        main.app.state.llm_service.close()
+        main.app.state.llm_service = None
+
+    # The other worker's queued evaluation finishes last
+    main.store_deferred_evaluation("late", 0, {"score": 2, "feedback": "From the queue"})
+    stored = main.session_store.get("late")
+    assert stored.aggregate["general_count"] == 1
+    assert stored.aggregate["general_sum"] == 8
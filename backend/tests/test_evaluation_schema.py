@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from app.evaluation_schema import InvalidModelOutput, parse_batch_evaluations, parse_evaluation, repair_json
+
+VALID = {"score": 7, "feedback": "Good use of INDEX/MATCH.", "suggestions": ["Mention XLOOKUP"],
+         "strengths": ["Correct syntax"], "missing_concepts": []}
+
+
+def test_valid_output_needs_no_repair():
+    evaluation, repaired = parse_evaluation(json.dumps(VALID))
+    assert evaluation == VALID
+    assert repaired is False
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Prose and a code fence around the object
+    ('Here is the evaluation:\n```json\n{"score": 7, "feedback": "ok"}\n```\nHope this helps!',
+     {"score": 7, "feedback": "ok"}),
+    ('Sure. {"score": 7, "feedback": "ok"} Let me know.', {"score": 7, "feedback": "ok"}),
+    # Trailing commas
+    ('{"score": 7, "feedback": "ok", "suggestions": ["a", "b",],}',
+     {"score": 7, "feedback": "ok", "suggestions": ["a", "b"]}),
+    # Cut off inside a string, an array, after a key and after a colon
+    ('{"score": 7, "feedback": "Clear but in', {"score": 7, "feedback": "Clear but in"}),
+    ('{"score": 7, "feedback": "ok", "suggestions": ["Use tables", "Name ran',
+     {"score": 7, "feedback": "ok", "suggestions": ["Use tables", "Name ran"]}),
+    ('{"score": 7, "feedback": "ok", "strengths": [', {"score": 7, "feedback": "ok", "strengths": []}),
+    ('{"score": 7, "feedback": "ok", "strengths"', {"score": 7, "feedback": "ok"}),
+    ('{"score": 7, "feedback": "ok", "strengths":', {"score": 7, "feedback": "ok"}),
+    # Raw newline inside a string, and an escape cut in half
+    ('{"score": 7, "feedback": "line one\nline two"}', {"score": 7, "feedback": "line one\nline two"}),
+    ('{"score": 7, "feedback": "ends with \\', {"score": 7, "feedback": "ends with "}),
+])
+def test_repair_json(text, expected):
+    assert json.loads(repair_json(text)) == expected
+
+
+def test_repaired_output_is_flagged():
+    evaluation, repaired = parse_evaluation('```json\n{"score": 7.0, "feedback": "ok",}\n```')
+    assert evaluation["score"] == 7 and isinstance(evaluation["score"], int)
+    assert repaired is True
+
+
+@pytest.mark.parametrize("text", [
+    '{"score": 11, "feedback": "ok"}',
+    '{"score": 7, "feedback": ""}',
+    '{"feedback": "no score"}',
+    "I cannot evaluate this answer.",
+])
+def test_invalid_output_raises(text):
+    with pytest.raises(InvalidModelOutput):
+        parse_evaluation(text)
+
+
+def test_batch_validates_as_a_whole():
+    text = json.dumps([dict(VALID, index=0), dict(VALID, index=2, score=3)])
+    evaluations, repaired = parse_batch_evaluations(text)
+    assert sorted(evaluations) == [0, 2]
+    assert evaluations[2]["score"] == 3 and "index" not in evaluations[2]
+    assert repaired is False
+
+
+def test_batch_keeps_intact_items_of_a_partly_invalid_array():
+    text = json.dumps([dict(VALID, index=0), {"index": 1, "score": 42, "feedback": "out of range"},
+                       dict(VALID, index=2)])
+    evaluations, repaired = parse_batch_evaluations(text)
+    assert sorted(evaluations) == [0, 2]
+    assert repaired is True
+
+
+def test_batch_keeps_complete_items_of_a_truncated_array():
+    complete = json.dumps(dict(VALID, index=0))
+    text = f'```json\n[{complete}, {{"index": 1, "score": 5, "feedback": "cut of'
+    evaluations, repaired = parse_batch_evaluations(text)
+    assert evaluations[0] == VALID
+    # Repair closes the cut-off item, which is valid as far as it goes
+    assert evaluations[1] == {"score": 5, "feedback": "cut of", "suggestions": [], "strengths": [],
+                              "missing_concepts": []}
+    assert repaired is True
+
+
+def test_batch_of_nothing_usable_is_empty():
+    assert parse_batch_evaluations("The model declined.") == ({}, True)
@@ -0,0 +1,94 @@
+import asyncio
+import builtins
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app import export
+from app.archive import CompletedSessionArchive
+from app.scoring import ScoreHistogram
+from app.session_model import SessionRecord
+from benchmarks.fake_llm import make_fake_service
+
+
+def make_completed(session_id: str, end_time: float = 1000.0) -> SessionRecord:
+    session = SessionRecord(session_id, "candidate", ["q1"], start_time=end_time - 60)
+    session.current_question_index = 1
+    session.end_time = end_time
+    return session
+
+
+def test_archive_keeps_completed_sessions_in_order(tmp_path):
+    archive = CompletedSessionArchive(str(tmp_path / "completed.jsonl"))
+    for number in range(3):
+        archive.append(make_completed(f"s{number}"))
+    archive.close()
+
+    reopened = CompletedSessionArchive(str(tmp_path / "completed.jsonl"))
+    assert [session.session_id for session in reopened.iter_sessions()] == ["s0", "s1", "s2"]
+    reopened.close()
+
+
+def test_archive_reads_a_session_archived_twice_as_last_written(tmp_path):
+    archive = CompletedSessionArchive(str(tmp_path / "completed.jsonl"))
+    archive.append(make_completed("s1", end_time=1000.0))
+    archive.append(make_completed("s2"))
+    archive.append(make_completed("s1", end_time=2000.0))
+
+    sessions = list(archive.iter_sessions())
+    assert [session.session_id for session in sessions] == ["s2", "s1"]
+    assert sessions[1].end_time == 2000.0
+    archive.close()
+
+
+def test_archive_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "completed.jsonl"
+    archive = CompletedSessionArchive(str(path))
+    archive.append(make_completed("s1"))
+    archive.close()
+    with open(path, "a") as f:
+        f.write('{"session_id":"s2","user_na')
+
+    assert [session.session_id for session in CompletedSessionArchive(str(path)).iter_sessions()] == ["s1"]
+
+
+def test_parquet_unavailable_when_pyarrow_fails_to_import(monkeypatch):
+    real_import = builtins.__import__
+
+    def broken_import(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError("pyarrow requires a newer NumPy")
+        return real_import(name, *args, **kwargs)
+
+    export.parquet_available.cache_clear()
+    monkeypatch.setattr(builtins, "__import__", broken_import)
+    try:
+        assert export.parquet_available() is False
+    finally:
+        export.parquet_available.cache_clear()
+
+
+def test_percentiles_and_cohort_statistics_start_from_the_archive(tmp_path, monkeypatch):
+    archive = CompletedSessionArchive(str(tmp_path / "completed.jsonl"))
+    question_id = main.question_bank.ids()[0]
+    for number in range(4):
+        session = SessionRecord(f"s{number}", "candidate", [question_id], start_time=900.0)
+        session.end_time = 1000.0
+        archive.append(session)
+    monkeypatch.setattr(main, "completed_archive", archive)
+    monkeypatch.setattr(main, "score_histogram", ScoreHistogram())
+    monkeypatch.setattr(main, "cohort_log", None)
+    main.app.state.llm_service = make_fake_service(latency=0)
+    try:
+        with TestClient(main.app):
+            # Seeded in the background
+            deadline = time.monotonic() + 5
+            while main.score_histogram.total < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert main.score_histogram.total == 4
+        assert asyncio.run(main.get_cohort_log()).session_count == 4
+        assert [session.session_id for session in main.completed_sessions()] == ["s0", "s1", "s2", "s3"]
+    finally:
+        main.app.state.llm_service.close()
+        main.app.state.llm_service = None
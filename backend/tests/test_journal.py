@@ -0,0 +1,97 @@
+import asyncio
+import os
+
+from app.journal import SessionJournal
+from app.session_model import ResponseRecord, SessionRecord
+
+
+def test_an_expired_session_is_not_restored(tmp_path):
+    journal = SessionJournal(str(tmp_path / "sessions.journal"), flush_interval=0)
+    journal.start()
+    for session_id in ("kept", "expired"):
+        journal.session_started(SessionRecord(session_id, "candidate", ["q1", "q2"]))
+    journal.session_expired("expired")
+    journal.close()
+
+    restored = SessionJournal(str(tmp_path / "sessions.journal")).replay()
+    assert list(restored) == ["kept"]
+
+
+def journal_with_two_answers(path):
+    journal = SessionJournal(path, flush_interval=0)
+    journal.start()
+    session = SessionRecord("s1", "candidate", ["q1", "q2", "q3"])
+    journal.session_started(session)
+    for number in range(2):
+        session.responses.append(ResponseRecord(f"answer {number}", 1000.0 + number))
+        session.current_question_index += 1
+        journal.answer_recorded(session, number)
+    journal.close()
+
+
+def test_replay_cuts_off_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "sessions.journal")
+    journal_with_two_answers(path)
+    with open(path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    # The crash came halfway through writing the second answer
+    with open(path, "wb") as f:
+        f.write(b"".join(lines[:-1]) + lines[-1][:len(lines[-1]) // 2])
+
+    journal = SessionJournal(path)
+    session = journal.replay()["s1"]
+    assert [response.answer for response in session.responses] == ["answer 0"]
+    assert session.current_question_index == 1
+    assert os.path.getsize(path) == sum(len(line) for line in lines[:-1])
+
+    # New events follow the last complete one, and replay again cleanly
+    journal.start()
+    session.responses.append(ResponseRecord("answer 1 again", 1002.0))
+    session.current_question_index = 2
+    journal.answer_recorded(session, 1)
+    journal.close()
+    replayed = SessionJournal(path).replay()["s1"]
+    assert [response.answer for response in replayed.responses] == ["answer 0", "answer 1 again"]
+
+
+def test_replay_after_compaction_skips_events_in_the_snapshot(tmp_path):
+    path = str(tmp_path / "sessions.journal")
+    journal = SessionJournal(path, flush_interval=0)
+    journal.start()
+    session = SessionRecord("s1", "candidate", ["q1", "q2"])
+    journal.session_started(session)
+    session.responses.append(ResponseRecord("first", 1000.0))
+    session.current_question_index = 1
+    journal.answer_recorded(session, 0)
+    journal.compact([session])
+    session.responses.append(ResponseRecord("second", 1001.0))
+    session.current_question_index = 2
+    journal.answer_recorded(session, 1)
+    journal.close()
+
+    replayed = SessionJournal(path).replay()["s1"]
+    assert [response.answer for response in replayed.responses] == ["first", "second"]
+
+
+def test_compaction_runs_after_the_handler_that_triggered_it(tmp_path):
+    sessions = {}
+    journal = SessionJournal(str(tmp_path / "sessions.journal"), flush_interval=0, compact_every=2,
+                             snapshot_source=lambda: list(sessions.values()))
+    journal.start()
+
+    async def handler():
+        for session_id in ("s1", "s2", "s3"):
+            sessions[session_id] = SessionRecord(session_id, "candidate", ["q1"])
+            journal.session_started(sessions[session_id])
+        # Nothing was copied while the handler ran, and only one compaction is queued
+        assert journal.events_since_snapshot == 3
+
+    async def scenario():
+        await handler()
+        await asyncio.sleep(0)
+        assert journal.events_since_snapshot == 0
+
+    asyncio.run(scenario())
+    journal.close()
+    assert journal.snapshots == 1
+    assert sorted(SessionJournal(str(tmp_path / "sessions.journal")).replay()) == ["s1", "s2", "s3"]
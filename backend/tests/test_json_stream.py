@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from app.json_stream import IncrementalJSONFieldExtractor
+
+OUTPUT = ('```json\n{"score": 8, "feedback": "Uses \\"SUMIFS\\" {correctly}, with [ranges]",'
+          ' "suggestions": ["Lock ranges with $", "Try {dynamic} arrays"],'
+          ' "detail": {"nested": [1, {"deep": "}"}]}, "passed": true, "weight": 0.5}\n```')
+
+
+def feed_in_chunks(text, size):
+    extractor = IncrementalJSONFieldExtractor()
+    fields = []
+    for start in range(0, len(text), size):
+        fields.extend(extractor.feed(text[start:start + size]))
+    return fields
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(OUTPUT)])
+def test_fields_come_out_whole_whatever_the_chunk_boundaries(size):
+    expected = json.loads(OUTPUT.split("```json\n")[1].split("\n```")[0])
+    assert feed_in_chunks(OUTPUT, size) == list(expected.items())
+
+
+def test_each_field_is_emitted_as_soon_as_it_completes():
+    extractor = IncrementalJSONFieldExtractor()
+    assert extractor.feed('{"score": 8') == []
+    # A scalar ends at the next delimiter
+    assert extractor.feed(", ") == [("score", 8)]
+    assert extractor.feed('"feedback": "Good') == []
+    assert extractor.feed(' work"') == [("feedback", "Good work")]
+    assert extractor.feed(', "suggestions": ["a"') == []
+    assert extractor.feed("]}") == [("suggestions", ["a"])]
+
+
+def test_text_after_the_object_is_ignored():
+    extractor = IncrementalJSONFieldExtractor()
+    assert extractor.feed('{"score": 1} {"score": 2}') == [("score", 1)]
+    assert extractor.feed(', "feedback": "late"}') == []
+
+
+def test_a_truncated_object_yields_only_complete_fields():
+    assert feed_in_chunks('{"score": 4, "feedback": "cut o', 5) == [("score", 4)]
+
+
+def test_only_the_value_being_read_is_kept():
+    extractor = IncrementalJSONFieldExtractor()
+    extractor.feed('{"score": 8, "feedback": "Uses')
+    extractor.feed(" SUMIFS")
+    assert "".join(extractor._pieces) == '"Uses SUMIFS'
+    assert extractor.feed('", "passed": true}') == [("feedback", "Uses SUMIFS"), ("passed", True)]
+    assert extractor._pieces == []
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.evaluation_cache import EvaluationCache
+from benchmarks.fake_llm import make_fake_service
+from config.llm_config import LLMConfig
+
+QUESTION = "What does VLOOKUP do?"
+ANSWER = "It looks a value up in the first column of a range and returns a value from another column."
+
+
+@pytest.fixture
+def hedged_service(monkeypatch):
+    monkeypatch.setattr(LLMConfig, "MAX_RETRIES", 0)
+    services = []
+
+    def make(primary: dict, hedge: dict):
+        service = make_fake_service(cache=EvaluationCache(max_entries=100, ttl_seconds=60),
+                                    hedge=dict(hedge, score=3), **dict(primary, score=8))
+        service._hedge_delay = lambda: 0.01
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.close()
+
+
+def cached_by(service, backend):
+    return service.cache.get(service._cache_key(QUESTION, ANSWER, "q1", backend))
+
+
+def test_a_hedge_answer_is_cached_under_the_hedge_model(hedged_service):
+    service = hedged_service(primary={"latency": 0.3}, hedge={"latency": 0})
+    evaluation = service.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1")
+
+    assert evaluation["score"] == 3
+    assert cached_by(service, service.primary) is None
+    assert cached_by(service, service.hedge) == evaluation
+    # A repeat is still served from the cache
+    assert service.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1") == evaluation
+    assert service.hedge.model.calls == 1
+
+
+def test_the_secondary_answers_when_the_primary_fails_with_no_hedge_budget(hedged_service):
+    service = hedged_service(primary={"latency": 0.05, "error_rate": 1.0}, hedge={"latency": 0})
+    service.hedge_budget._tokens = 0
+    service.hedge_budget.ratio = 0
+
+    evaluation = service.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1")
+    assert evaluation["score"] == 3
+    assert cached_by(service, service.hedge) == evaluation
+
+
+def test_an_evaluation_counts_as_one_cache_lookup(hedged_service):
+    service = hedged_service(primary={"latency": 0}, hedge={"latency": 0})
+    service.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1")
+    service.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1")
+    assert (service.cache.hits, service.cache.misses) == (1, 1)
+
+
+def test_async_lookups_read_the_sqlite_tier_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    writer = make_fake_service(cache=EvaluationCache(max_entries=100, ttl_seconds=60, persist_path=path), latency=0)
+    evaluation = writer.evaluate_answer(QUESTION, ANSWER, ["accuracy"], question_id="q1")
+    writer.close()
+
+    # A fresh process: the memory tier is empty, the file is not
+    service = make_fake_service(cache=EvaluationCache(max_entries=100, ttl_seconds=60, persist_path=path), latency=0)
+    loop_thread = threading.get_ident()
+    load = service.cache._load
+    threads = []
+    monkeypatch.setattr(service.cache, "_load", lambda key: threads.append(threading.get_ident()) or load(key))
+
+    assert asyncio.run(service.evaluate_answer_async(QUESTION, ANSWER, ["accuracy"], question_id="q1")) == evaluation
+    assert threads and loop_thread not in threads
+    assert service.primary.model.calls == 0
+    assert (service.cache.hits, service.cache.misses) == (1, 0)
+    service.close()
+
+
+def test_the_sqlite_tier_drops_expired_rows_and_keeps_the_newest_under_its_cap(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EvaluationCache(max_entries=100, ttl_seconds=60, persist_path=path, max_rows=3, prune_every=2)
+    # The second and fourth writes prune; the oldest row goes over the cap
+    for number in range(4):
+        monkeypatch.setattr("app.evaluation_cache.time.time", lambda: 1000.0 + number)
+        cache.set(f"k{number}", {"score": number})
+    rows = [key for key, in cache._db.execute("SELECT key FROM evaluations ORDER BY stored_at")]
+    assert rows == ["k1", "k2", "k3"]
+
+    monkeypatch.setattr("app.evaluation_cache.time.time", lambda: 1062.5)
+    reopened = EvaluationCache(max_entries=100, ttl_seconds=60, persist_path=path, max_rows=3)
+    assert [key for key, in reopened._db.execute("SELECT key FROM evaluations")] == ["k3"]
@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from app import reference_answers
+from app.reference_answers import ReferenceAnswerStore
+
+QUESTION = {"id": "q1", "question": "What does VLOOKUP do?", "evaluation_criteria": ["accuracy"]}
+
+
+def test_a_failed_generation_is_not_retried_until_the_cool_down_passes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(reference_answers.time, "monotonic", lambda: clock[0])
+    store = ReferenceAnswerStore(None, "v1", retry_after=60)
+    calls = []
+
+    async def failing():
+        calls.append("failing")
+        raise RuntimeError("model unavailable")
+
+    async def working():
+        calls.append("working")
+        return "It looks a value up."
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.fill(QUESTION, failing))
+    assert asyncio.run(store.fill(QUESTION, working)) == ""
+
+    clock[0] += 61
+    assert asyncio.run(store.fill(QUESTION, working)) == "It looks a value up."
+    assert calls == ["failing", "working"]
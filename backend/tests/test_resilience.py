@@ -0,0 +1,123 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.resilience import (
+    CircuitBreaker, CircuitOpenError, HedgeBudget, RateLimitTimeout, TokenBucket, call_with_retry, hedged_call
+)
+
+
+class Transient(Exception):
+    pass
+
+
+def retry(call, breaker, limiter=None, **kwargs):
+    return call_with_retry(
+        call,
+        limiter=limiter or TokenBucket(rate_per_minute=1e6, capacity=1000),
+        breaker=breaker,
+        retryable=(Transient,),
+        max_retries=0,
+        base_delay=0,
+        max_delay=0,
+        **kwargs
+    )
+
+
+def failing():
+    raise Transient("down")
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(Transient):
+        retry(failing, breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        retry(lambda: "ok", breaker)
+    time.sleep(0.06)
+    return breaker
+
+
+def test_trial_success_closes_the_breaker():
+    breaker = open_breaker()
+    assert retry(lambda: "ok", breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_trial_failure_reopens_the_breaker():
+    breaker = open_breaker()
+    with pytest.raises(Transient):
+        retry(failing, breaker)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        retry(lambda: "ok", breaker)
+
+
+def test_rate_limit_timeout_does_not_claim_the_trial():
+    breaker = open_breaker()
+    exhausted = TokenBucket(rate_per_minute=1, capacity=1)
+    exhausted.acquire()
+    with pytest.raises(RateLimitTimeout):
+        retry(lambda: "ok", breaker, limiter=exhausted, limiter_timeout=0.01)
+    assert breaker.state == "open"
+    assert retry(lambda: "ok", breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_calls_rejected_by_an_open_breaker_take_no_token():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    with pytest.raises(Transient):
+        retry(failing, breaker)
+    limiter = TokenBucket(rate_per_minute=1, capacity=1)
+    for _ in range(3):
+        with pytest.raises(CircuitOpenError):
+            retry(lambda: "ok", breaker, limiter=limiter, limiter_timeout=0.01)
+    limiter.acquire(timeout=0)
+
+
+def test_non_retryable_trial_error_releases_the_trial():
+    breaker = open_breaker()
+
+    def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        retry(broken, breaker)
+    assert breaker.state == "open"
+    assert retry(lambda: "ok", breaker) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_non_retryable_errors_do_not_count_towards_opening():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        retry(broken, breaker)
+    assert breaker.state == "closed"
+
+
+def test_hedge_runs_as_fallback_when_the_budget_is_spent_and_the_primary_fails():
+    def slow_failure():
+        time.sleep(0.05)
+        raise Transient("primary down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result, outcome = hedged_call(slow_failure, lambda: "secondary", delay=0.01,
+                                      budget=HedgeBudget(ratio=0, capacity=0), executor=executor)
+    assert (result, outcome) == ("secondary", "fallback")
+
+
+def test_a_slow_primary_is_awaited_when_the_budget_is_spent():
+    def slow():
+        time.sleep(0.05)
+        return "primary"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result, outcome = hedged_call(slow, lambda: "secondary", delay=0.01,
+                                      budget=HedgeBudget(ratio=0, capacity=0), executor=executor)
+    assert (result, outcome) == ("primary", "budget_exhausted")
@@ -0,0 +1,128 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.session_model import ResponseRecord, SessionRecord
+from app.session_store import InMemorySessionStore, RedisSessionStore
+
+
+def make_session(session_id: str = "s1") -> SessionRecord:
+    return SessionRecord(session_id, "candidate", ["q1", "q2", "q3"])
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_store(request):
+    def make(ttl_seconds: int = 60, max_sessions: int = 100):
+        if request.param == "memory":
+            return InMemorySessionStore(ttl_seconds=ttl_seconds, max_sessions=max_sessions)
+        return RedisSessionStore(fakeredis.FakeRedis(), ttl_seconds=ttl_seconds)
+    return make
+
+
+def test_get_returns_what_was_saved(make_store):
+    store = make_store()
+    session = make_session()
+    session.responses.append(ResponseRecord("answer", 1.0))
+    session.current_question_index = 1
+    store.save(session)
+
+    loaded = store.get("s1")
+    assert loaded.to_dict() == session.to_dict()
+    assert store.get("missing") is None
+    assert len(store) == 1
+
+
+def test_delete(make_store):
+    store = make_store()
+    store.save(make_session())
+    store.delete("s1")
+    assert store.get("s1") is None
+    assert len(store) == 0
+
+
+def test_sessions_expire_after_the_ttl(make_store):
+    store = make_store(ttl_seconds=1)
+    store.save(make_session())
+    assert store.get("s1") is not None
+    time.sleep(1.1)
+    assert store.get("s1") is None
+    assert list(store.iter_sessions()) == []
+
+
+def test_iter_sessions(make_store):
+    store = make_store(max_sessions=1000)
+    for number in range(250):
+        store.save(make_session(f"s{number}"))
+    assert sorted(session.session_id for session in store.iter_sessions()) == sorted(f"s{n}" for n in range(250))
+
+
+def test_in_memory_store_evicts_the_least_recently_used():
+    # Redis leaves the cap to the server's maxmemory-policy
+    store = InMemorySessionStore(ttl_seconds=60, max_sessions=2)
+    store.save(make_session("a"))
+    store.save(make_session("b"))
+    store.get("a")
+    store.save(make_session("c"))
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+
+def test_in_memory_ttl_slides_on_get():
+    store = InMemorySessionStore(ttl_seconds=1, max_sessions=10)
+    store.save(make_session())
+    time.sleep(0.6)
+    assert store.get("s1") is not None
+    time.sleep(0.6)
+    assert store.get("s1") is not None
+
+
+def test_update_saves_unless_the_change_declines(make_store):
+    store = make_store()
+    store.save(make_session())
+
+    def advance(session):
+        session.current_question_index += 1
+
+    assert store.update("s1", advance).current_question_index == 1
+    assert store.update("s1", lambda session: False).current_question_index == 1
+    assert store.get("s1").current_question_index == 1
+    assert store.update("missing", advance) is None
+
+
+def test_redis_update_reruns_the_change_when_another_worker_saves_meanwhile():
+    client = fakeredis.FakeRedis()
+    store = RedisSessionStore(client, ttl_seconds=60)
+    other_worker = RedisSessionStore(client, ttl_seconds=60)
+    store.save(make_session())
+    calls = []
+
+    def store_evaluation(session):
+        calls.append(len(session.responses))
+        if len(calls) == 1:
+            # Another worker records an answer between our read and our write
+            answered = other_worker.get("s1")
+            answered.responses.append(ResponseRecord("answer", 1.0))
+            answered.current_question_index = 1
+            other_worker.save(answered)
+        session.end_time = 2.0
+
+    session = store.update("s1", store_evaluation)
+    assert calls == [0, 1]
+    stored = store.get("s1")
+    assert stored.current_question_index == 1 and stored.end_time == 2.0
+    assert session.to_dict() == stored.to_dict()
+    assert client.ttl("interview:session:s1") > 0
+
+
+def test_memory_store_reports_sessions_it_evicts():
+    evicted = []
+    store = InMemorySessionStore(ttl_seconds=60, max_sessions=2, on_evict=lambda session: evicted.append(session.session_id))
+    for session_id in ("s1", "s2", "s3"):
+        store.save(make_session(session_id))
+    store.delete("s2")
+    assert evicted == ["s1"]
+
+    store.ttl_seconds = 0
+    store.get("s3")
+    assert evicted == ["s1", "s3"]
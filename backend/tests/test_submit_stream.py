@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from benchmarks import fake_llm
+from benchmarks.bench_prompt import ANSWER
+from benchmarks.fake_llm import make_fake_service
+
+
+def read_events(client, session_id, answer):
+    events = []
+    with client.stream("POST", "/api/interview/submit-answer/stream",
+                       json={"session_id": session_id, "answer": answer}) as response:
+        event = None
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Every JSON response comes back with an out-of-range score, so validation always overrules the stream
+    monkeypatch.setattr(fake_llm, "MALFORMATIONS", {"out_of_range": fake_llm.MALFORMATIONS["out_of_range"]})
+    # ANSWER is off-topic for some general questions, which the pre-scorer would score without the model
+    monkeypatch.setattr(main, "pre_scorer", None)
+    main.app.state.llm_service = make_fake_service(latency=0, malformed_rate=1.0, seed=1)
+    yield TestClient(main.app)
+    main.app.state.llm_service.close()
+    main.app.state.llm_service = None
+
+
+def test_the_validated_evaluation_supersedes_the_streamed_fields(client):
+    session_id = client.post("/api/interview/start", json={"user_name": "test"}).json()["session_id"]
+    session = main.session_store.get(session_id)
+    for question_id in session.question_ids:
+        if main.question_bank.get(question_id)["question_type"] == "general":
+            break
+        read_events(client, session_id, "A")
+
+    events = read_events(client, session_id, ANSWER)
+    kinds = [kind for kind, _ in events]
+    streamed_score = next(data["value"] for kind, data in events if kind == "field" and data["name"] == "score")
+    evaluation = next(data for kind, data in events if kind == "evaluation")
+
+    assert kinds.index("evaluation") > kinds.index("field")
+    assert kinds[-1] == "result"
+    assert streamed_score > 10
+    assert evaluation["score"] <= 10
@@ -0,0 +1,24 @@
+import asyncio
+
+import app.main as main
+from app.session_model import SessionRecord
+
+
+def test_a_session_with_an_answer_in_flight_is_not_expired():
+    async def scenario():
+        session = SessionRecord("in-flight", "candidate", list(main.question_bank.ids())[:2])
+        main.session_store.save(session)
+        answering = asyncio.get_running_loop().create_future()
+        main.metrics.active_sessions.inc()
+        in_flight = asyncio.create_task(main.submissions.run(("in-flight", 1), lambda: answering))
+        await asyncio.sleep(0)
+
+        await main.expire_session("in-flight", 1)
+        assert main.session_store.get("in-flight") is not None
+
+        answering.set_result({})
+        await in_flight
+        await main.expire_session("in-flight", 1)
+        assert main.session_store.get("in-flight") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from benchmarks.fake_llm import make_fake_service
+
+
+@pytest.fixture
+def client():
+    main.app.state.llm_service = make_fake_service(latency=0)
+    yield TestClient(main.app)
+    main.app.state.llm_service.close()
+    main.app.state.llm_service = None
+
+
+def start(client) -> str:
+    return client.post("/api/interview/start", json={"user_name": "test"}).json()["session_id"]
+
+
+@pytest.mark.parametrize("message, detail", [
+    ("[1]", "Expected"),
+    ('"answer"', "Expected"),
+    ('{"type": "answer", "answer": "A", "question_number": "1"}', "question_number"),
+    ('{"type": "answer", "answer": "A", "question_number": 1.5}', "question_number"),
+    ('{"type": "answer", "answer": "A", "question_number": true}', "question_number"),
+    ("not json", "JSON"),
+])
+def test_malformed_messages_get_an_error_and_keep_the_connection(client, message, detail):
+    session_id = start(client)
+    with client.websocket_connect(f"/ws/interview/{session_id}") as socket:
+        assert socket.receive_json()["type"] == "session"
+        assert socket.receive_json()["type"] == "question"
+        socket.send_text(message)
+        reply = socket.receive_json()
+        assert reply["type"] == "error" and reply["status"] == 400 and detail in reply["detail"]
+        socket.send_json({"type": "answer", "answer": "A", "question_number": 1})
+        assert socket.receive_json()["type"] in ("evaluation", "question")
+
+
+def test_a_repeated_answer_does_not_resend_its_evaluation(client):
+    session_id = start(client)
+    with client.websocket_connect(f"/ws/interview/{session_id}") as socket:
+        socket.receive_json()
+        socket.receive_json()
+        # Too short for the model, so it is scored while the answer is recorded
+        socket.send_json({"type": "answer", "answer": "A", "question_number": 1})
+        assert socket.receive_json() == socket_evaluation(session_id, 0)
+        assert socket.receive_json()["question_number"] == 2
+        socket.send_json({"type": "answer", "answer": "A", "question_number": 1})
+        assert socket.receive_json()["type"] == "question"
+
+
+def socket_evaluation(session_id: str, index: int) -> dict:
+    return main.evaluation_message(main.session_store.get(session_id), index)
@@ -85,6 +85,7 @@ const InterviewComponent: React.FC = () => {
     const response = await axios.post(`${API_URL}api/interview/submit-answer`, {  // ← Changed this line
       session_id: state.sessionId,
       answer: state.answer,
+      question_number: state.questionNumber,
     });
 
     if (response.data.status === 'completed') {